@@ -8,6 +8,7 @@ from config.condition import BUY_DAY_AGO
 from config.environment_config import env_config, get_tr_id, is_mock
 from datetime import datetime, timedelta, timezone
 from database.db_manager_upper import DatabaseManager
+from utils.rate_limiter import kis_rate_limiter
 import time
 from threading import Lock
 from zoneinfo import ZoneInfo
@@ -139,6 +140,8 @@ class KISApi:
             tr_id = get_tr_id(api_name)
         
         token = self._ensure_token(is_mock)
+        # 모든 REST 호출은 요청 직전에 헤더를 설정하므로 여기서 앱키별 초당 호출 한도를 적용
+        kis_rate_limiter(is_mock).acquire()
         self.headers["authorization"] = f"Bearer {token}"
         self.headers["appkey"] = M_APP_KEY if is_mock else R_APP_KEY
         self.headers["appsecret"] = M_APP_SECRET if is_mock else R_APP_SECRET
@@ -430,8 +433,8 @@ class KISApi:
 
         for attempt in range(1, 4):
             try:
-                with KISApi._global_api_lock:
-                    response = requests.post(url=url, data=json.dumps(data), headers=self.headers, timeout=10)
+                # 초당 호출 한도는 _set_headers의 공유 토큰 버킷이 지키므로 주문끼리 직렬화하지 않음
+                response = requests.post(url=url, data=json.dumps(data), headers=self.headers, timeout=10)
                 response.raise_for_status()
                 return response.json()
             except RequestException as e:
@@ -0,0 +1,188 @@
+"""
+KIS 실시간 체결통보(H0STCNI0 / 모의 H0STCNI9) 처리 모듈
+
+체결통보는 구독 응답으로 받은 key/iv로 AES-256-CBC 암호화되어 수신됩니다.
+복호화한 체결 이벤트를 ExecutionNoticeHub에 발행하면, 주문/세션 코드(다른 스레드)가
+잔고·체결 조회 폴링 대신 체결 이벤트를 기다릴 수 있습니다.
+"""
+
+import base64
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import unpad
+
+
+# 체결통보 필드 인덱스 (KIS 실시간 체결통보 응답 순서)
+FIELD_ORDER_NO = 2           # 주문번호
+FIELD_ORIGINAL_ORDER_NO = 3  # 원주문번호
+FIELD_SIDE = 4               # 매도매수구분 (01: 매도, 02: 매수)
+FIELD_TICKER = 8             # 종목코드
+FIELD_FILLED_QTY = 9         # 체결수량
+FIELD_FILLED_PRICE = 10      # 체결단가
+FIELD_TIME = 11              # 체결시간
+FIELD_REJECTED = 12          # 거부여부
+FIELD_FILL_YN = 13           # 체결여부 (1: 접수/정정/취소/거부, 2: 체결)
+FIELD_ORDER_QTY = 16         # 주문수량
+
+
+def decrypt_notice(cipher_text, key, iv):
+    """체결통보 암호문을 복호화합니다."""
+    cipher = AES.new(key.encode('utf-8'), AES.MODE_CBC, iv.encode('utf-8'))
+    return unpad(cipher.decrypt(base64.b64decode(cipher_text)), AES.block_size).decode('utf-8')
+
+
+def normalize_order_no(order_no):
+    """REST(ODNO)와 웹소켓 주문번호의 0 패딩 차이를 없앰"""
+    return str(order_no or '').strip().lstrip('0')
+
+
+def _to_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class ExecutionNotice:
+    """체결통보 1건"""
+    order_no: str
+    original_order_no: str
+    ticker: str
+    side: str
+    filled_qty: int
+    filled_price: int
+    order_qty: int
+    is_fill: bool
+    is_rejected: bool
+    time: str
+
+
+def parse_execution_notice(plain_text):
+    """복호화된 체결통보 문자열을 ExecutionNotice로 변환"""
+    fields = plain_text.split('^')
+    return ExecutionNotice(
+        order_no=normalize_order_no(fields[FIELD_ORDER_NO]),
+        original_order_no=normalize_order_no(fields[FIELD_ORIGINAL_ORDER_NO]),
+        ticker=fields[FIELD_TICKER],
+        side='sell' if fields[FIELD_SIDE] == '01' else 'buy',
+        filled_qty=_to_int(fields[FIELD_FILLED_QTY]),
+        filled_price=_to_int(fields[FIELD_FILLED_PRICE]),
+        order_qty=_to_int(fields[FIELD_ORDER_QTY]),
+        is_fill=fields[FIELD_FILL_YN] == '2',
+        is_rejected=fields[FIELD_REJECTED] == 'Y',
+        time=fields[FIELD_TIME],
+    )
+
+
+@dataclass
+class FillSummary:
+    """원주문(정정 주문 포함) 기준 누적 체결 정보"""
+    filled_qty: int = 0
+    filled_amount: int = 0
+    rejected: bool = False
+    # 원주문 접수 통보의 주문수량 (주문 시 수량이 조정되는 경우 대비)
+    order_qty: int = 0
+
+    @property
+    def avg_price(self):
+        return int(self.filled_amount / self.filled_qty) if self.filled_qty else 0
+
+
+class ExecutionNoticeHub:
+    """
+    체결통보 이벤트 허브 (스레드 안전)
+
+    웹소켓 모니터링 루프에서 publish하고, 스케줄러 스레드의 주문 코드가 wait_for_fill로 대기합니다.
+    정정 주문의 체결은 원주문번호 기준으로 합산됩니다.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # 원주문번호 -> FillSummary
+        self._fills: Dict[str, FillSummary] = {}
+        # 정정 주문번호 -> 원주문번호
+        self._roots: Dict[str, str] = {}
+        self._subscribers: List[Callable[[ExecutionNotice], None]] = []
+        self.is_streaming = False
+
+    def set_streaming(self, streaming):
+        """체결통보 구독 상태 설정. 스트림이 끊기면 대기 중인 호출을 깨워 폴링으로 전환시킴"""
+        with self._condition:
+            self.is_streaming = streaming
+            self._condition.notify_all()
+
+    def subscribe(self, callback):
+        """체결통보 수신 시 호출될 콜백 등록 (모니터링 루프에서 호출되므로 블로킹 금지)"""
+        self._subscribers.append(callback)
+
+    def register_revision(self, original_order_no, revised_order_no):
+        """정정 주문번호를 원주문에 연결 (REST 응답으로 알게 된 경우)"""
+        with self._condition:
+            self._roots[normalize_order_no(revised_order_no)] = self._root(original_order_no)
+
+    def _root(self, order_no):
+        order_no = normalize_order_no(order_no)
+        return self._roots.get(order_no, order_no)
+
+    def publish(self, notice):
+        with self._condition:
+            if notice.original_order_no and notice.original_order_no != notice.order_no:
+                self._roots[notice.order_no] = self._root(notice.original_order_no)
+            root = self._root(notice.order_no)
+            summary = self._fills.setdefault(root, FillSummary())
+            if notice.is_rejected:
+                summary.rejected = True
+            elif not notice.is_fill and root == notice.order_no and notice.order_qty > 0:
+                summary.order_qty = notice.order_qty
+            elif notice.is_fill and notice.filled_qty > 0:
+                summary.filled_qty += notice.filled_qty
+                summary.filled_amount += notice.filled_qty * notice.filled_price
+            self._condition.notify_all()
+
+        for callback in list(self._subscribers):
+            try:
+                callback(notice)
+            except Exception as e:
+                print(f"체결통보 콜백 오류: {e}")
+
+    def get_fills(self, order_no) -> Optional[FillSummary]:
+        with self._condition:
+            summary = self._fills.get(self._root(order_no))
+            return self._copy(summary) if summary else None
+
+    @staticmethod
+    def _copy(summary):
+        return FillSummary(summary.filled_qty, summary.filled_amount, summary.rejected, summary.order_qty)
+
+    def wait_for_fill(self, order_no, quantity, timeout) -> Optional[FillSummary]:
+        """
+        주문 수량만큼 체결되거나 거부될 때까지 대기합니다.
+
+        Returns:
+            FillSummary: 타임아웃 시점까지의 누적 체결 (부분 체결 가능)
+            None: 체결통보 스트림이 비활성 상태 (호출 측에서 REST 폴링으로 확인해야 함)
+        """
+        root = self._root(order_no)
+
+        def _done():
+            if not self.is_streaming:
+                return True
+            summary = self._fills.get(root)
+            return summary is not None and (
+                summary.rejected or summary.filled_qty >= (summary.order_qty or quantity)
+            )
+
+        with self._condition:
+            if not self.is_streaming:
+                return None
+            self._condition.wait_for(_done, timeout=timeout)
+            if not self.is_streaming:
+                return None
+            return self._copy(self._fills.get(root) or FillSummary())
+
+
+# 전역 체결통보 허브 (TradingUpper와 KISWebSocket이 공유)
+execution_hub = ExecutionNoticeHub()
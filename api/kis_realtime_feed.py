@@ -0,0 +1,117 @@
+"""
+KIS 실시간 시세 피드 모듈
+
+종목별로 체결가(H0STCNT0), 호가(H0STASP0) 또는 둘 다 구독할 수 있도록 TR별 필드 맵을 정의하고,
+수신 프레임에서 매도 판단에 필요한 값(현재가/매수·매도 1호가/거래량)만 꺼내 Quote로 변환합니다.
+10단계 호가 전체를 파싱하지 않고 필요한 필드만 읽습니다.
+"""
+
+from dataclasses import dataclass
+from config.condition import REALTIME_FEED_TYPE, REALTIME_FEED_TYPE_STRONG_MOMENTUM, STRONG_MOMENTUM
+
+
+TR_TRADE = "H0STCNT0"      # 실시간 체결가
+TR_ORDERBOOK = "H0STASP0"  # 실시간 호가
+TR_SNAPSHOT = "REST"       # 재연결 후 REST 현재가 스냅샷 (웹소켓 TR 아님)
+
+# 피드 종류 -> 구독할 TR 목록
+FEED_TYPES = {
+    "trade": (TR_TRADE,),
+    "orderbook": (TR_ORDERBOOK,),
+    "both": (TR_TRADE, TR_ORDERBOOK),
+}
+
+# TR별 필드 인덱스 (레코드 내 위치, None이면 해당 TR에 없는 값)
+FIELD_MAPS = {
+    TR_TRADE: {
+        "time": 1,          # STCK_CNTG_HOUR
+        "last_price": 2,    # STCK_PRPR 현재가
+        "ask": 10,          # ASKP1 매도1호가
+        "bid": 11,          # BIDP1 매수1호가
+        "volume": 12,       # CNTG_VOL 체결거래량
+        "acc_volume": 13,   # ACML_VOL 누적거래량
+    },
+    TR_ORDERBOOK: {
+        "time": 1,          # BSOP_HOUR
+        "last_price": 13,   # 호가에는 체결가가 없으므로 매수1호가(즉시 매도 가능 가격) 사용
+        "ask": 3,           # ASKP1
+        "bid": 13,          # BIDP1
+        "volume": None,
+        "acc_volume": 53,   # ACML_VOL
+    },
+}
+
+
+@dataclass
+class Quote:
+    """실시간 시세 1건 (매도 판단용)"""
+    tr_id: str
+    ticker: str
+    time: str
+    last_price: int
+    bid: int
+    ask: int
+    volume: int
+    acc_volume: int
+    # 수신 시각 (perf_counter_ns, 수신→판단 지연 측정용)
+    received_ns: int = 0
+
+
+def feed_type_for(trade_condition):
+    """세션의 매매 조건에 맞는 피드 종류 반환"""
+    if trade_condition == STRONG_MOMENTUM:
+        return REALTIME_FEED_TYPE_STRONG_MOMENTUM
+    return REALTIME_FEED_TYPE
+
+
+def tr_ids_for(feed_type):
+    """피드 종류에 해당하는 TR 목록. 알 수 없는 값이면 호가로 처리"""
+    return FEED_TYPES.get(feed_type, FEED_TYPES["orderbook"])
+
+
+def _field_int(fields, index):
+    if index is None or index >= len(fields):
+        return 0
+    try:
+        return int(fields[index])
+    except ValueError:
+        return 0
+
+
+def parse_frame(data_str):
+    """
+    실시간 데이터 프레임("0|TR_ID|건수|데이터")을 Quote 목록으로 변환합니다.
+    한 프레임에 여러 건이 묶여 오면 건수만큼 나눠서 처리합니다.
+
+    Returns:
+        list: [Quote, ...] (지원하지 않는 TR이거나 형식이 맞지 않으면 빈 리스트)
+    """
+    parts = data_str.split('|', 3)
+    if len(parts) < 4:
+        return []
+    tr_id = parts[1]
+    field_map = FIELD_MAPS.get(tr_id)
+    if field_map is None:
+        return []
+
+    fields = parts[3].split('^')
+    try:
+        count = max(1, int(parts[2]))
+    except ValueError:
+        count = 1
+    width = len(fields) // count
+
+    quotes = []
+    for offset in range(0, width * count, width):
+        record = fields[offset:offset + width]
+        quotes.append(Quote(
+            tr_id=tr_id,
+            ticker=record[0],
+            time=record[field_map["time"]],
+            last_price=_field_int(record, field_map["last_price"]),
+            bid=_field_int(record, field_map["bid"]),
+            ask=_field_int(record, field_map["ask"]),
+            volume=_field_int(record, field_map["volume"]),
+            acc_volume=_field_int(record, field_map["acc_volume"]),
+        ))
+    return quotes
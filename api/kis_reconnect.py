@@ -0,0 +1,99 @@
+"""
+웹소켓 재연결 관리 모듈
+
+- ReconnectBackoff: 첫 재시도는 즉시, 이후에는 지터가 있는 지수 백오프로 재연결 간격 계산
+- GapTracker: 연결이 끊긴 동안 종목별로 시세를 받지 못한 시간(공백) 기록
+"""
+
+import random
+import time
+from dataclasses import dataclass
+
+
+class ReconnectBackoff:
+    """재연결 대기 시간 계산기 (샤드별 1개)"""
+
+    def __init__(self, base_delay=0.5, max_delay=30.0, jitter=0.5):
+        """
+        Args:
+            base_delay (float): 두 번째 재시도 기본 대기(초). 이후 2배씩 증가
+            max_delay (float): 최대 대기(초)
+            jitter (float): 대기 시간 랜덤 편차 비율 (0.5면 ±50%)
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.attempts = 0
+
+    def next_delay(self):
+        """다음 재연결 시도 전 대기 시간(초). 첫 시도는 0"""
+        self.attempts += 1
+        if self.attempts == 1:
+            return 0.0
+        delay = min(self.max_delay, self.base_delay * (2 ** (self.attempts - 2)))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def reset(self):
+        """재연결 후 첫 프레임을 받아 연결이 안정된 뒤 호출"""
+        self.attempts = 0
+
+
+@dataclass
+class GapStats:
+    """종목별 시세 공백 통계"""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
+
+
+class GapTracker:
+    """
+    종목별 시세 공백 기록기
+
+    연결이 끊기면 begin()으로 공백 시작 시각을 찍고, 재연결 후 새 시세(REST 스냅샷 또는 실시간 프레임)가
+    전달되면 end()로 공백 시간을 집계합니다.
+    """
+
+    def __init__(self):
+        # 종목코드 -> 공백 시작 시각(monotonic)
+        self._open = {}
+        # 종목코드 -> GapStats
+        self.stats = {}
+
+    def begin(self, tickers):
+        now = time.monotonic()
+        for ticker in tickers:
+            self._open.setdefault(ticker, now)
+
+    def is_open(self, ticker):
+        return ticker in self._open
+
+    def end(self, ticker):
+        """공백 종료. 공백 시간(초)을 반환하며 진행 중인 공백이 없으면 None"""
+        started = self._open.pop(ticker, None)
+        if started is None:
+            return None
+        duration = time.monotonic() - started
+        stats = self.stats.setdefault(ticker, GapStats())
+        stats.count += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+        stats.last = duration
+        return duration
+
+    def discard(self, ticker):
+        """구독 해제된 종목의 진행 중 공백 제거"""
+        self._open.pop(ticker, None)
+
+    def snapshot(self):
+        """종목별 공백 통계 (진행 중인 공백은 현재까지 시간으로 표시)"""
+        now = time.monotonic()
+        result = {
+            ticker: {"count": s.count, "total": round(s.total, 3), "max": round(s.max, 3), "last": round(s.last, 3)}
+            for ticker, s in self.stats.items()
+        }
+        for ticker, started in self._open.items():
+            result.setdefault(ticker, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+            result[ticker]["ongoing"] = round(now - started, 3)
+        return result
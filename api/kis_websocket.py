@@ -6,26 +6,62 @@ import asyncio
 import websockets
 from requests.exceptions import RequestException
 from websockets.exceptions import ConnectionClosed
-from config.config import R_APP_KEY, R_APP_SECRET, M_APP_KEY, M_APP_SECRET
+from config.config import R_APP_KEY, R_APP_SECRET, M_APP_KEY, M_APP_SECRET, WS_EXTRA_CREDENTIALS, HTS_ID
+from config.environment_config import get_tr_id, is_mock
 from config.condition import (
-    SELLING_POINT_UPPER,
-    RISK_MGMT_UPPER,
-    RISK_MGMT_STRONG_MOMENTUM,
-    KRX_TRADING_START,
-    KRX_TRADING_END,
-    TRAILING_STOP_PERCENTAGE
+    WS_MAX_SUBSCRIPTIONS_PER_CONNECTION,
+    WS_MAX_CONNECTIONS,
+    WS_RECONNECT_BASE_DELAY,
+    WS_RECONNECT_MAX_DELAY,
+    TICK_RECORDER_ENABLED,
+    TICK_RECORD_DIR,
+    TICK_RECORDER_FSYNC_INTERVAL,
+    LOOP_WATCHDOG_ENABLED,
+    LOOP_WATCHDOG_INTERVAL,
+    LOOP_STALL_THRESHOLD,
+    LOOP_METRICS_LOG_INTERVAL,
+    ORDER_EXECUTION_WORKERS,
+    TRAILING_STATE_FLUSH_INTERVAL
 )
 from utils.trading_logger import TradingLogger
 from utils.slack_logger import SlackLogger
 from datetime import datetime, timedelta, time
+from time import perf_counter_ns
 from database.db_manager_upper import DatabaseManager
 from api.kis_api import KISApi
-
+from api.kis_websocket_pool import KISWebSocketPool, WebSocketShard
+from api.kis_execution_notice import execution_hub, decrypt_notice, parse_execution_notice
+from api.kis_realtime_feed import feed_type_for, tr_ids_for, parse_frame, Quote, TR_SNAPSHOT
+from api.kis_reconnect import ReconnectBackoff, GapTracker
+from utils.tick_recorder import TickRecorder
+from utils.clock import SystemClock
+from utils.loop_watchdog import LoopWatchdog
+from utils.latency_tracer import Trace, latency_tracer
+from utils.market_clock import MarketClock, PHASE_NAMES
+from utils.order_executor import OrderExecutor
+from trading.sell_triggers import SellTriggers, tick_band
+from database.trailing_state_store import TrailingStateStore
+from database.session_store import session_store as shared_session_store
+
+
+WS_URL = "ws://ops.koreainvestment.com:31000/tryitout/H0STASP0"
+# 실전 계좌 체결통보(H0STCNI0)는 실전 도메인(21000)에 실전 approval key로 접속해야 수신됨
+WS_REAL_URL = "ws://ops.koreainvestment.com:21000/tryitout/H0STCNI0"
 
 
 class KISWebSocket:
-    def __init__(self, callback=None):
-        self.db_manager = DatabaseManager()
+    def __init__(self, callback=None, db_manager=None, kis_api=None, clock=None, session_store=None):
+        """
+        Args:
+            callback: 매도 주문 콜백 sell_order(session_id, ticker, price, trace)
+            db_manager: 승인키/트레일링스탑 DB (리플레이 시 대체 객체 주입)
+            kis_api: REST API 클라이언트 (리플레이 시 대체 객체 주입)
+            clock: 현재 시각/장 시간 대기에 사용하는 시계 (기본: 시스템 시계)
+            session_store: 거래 세션 저장소 get/save/update/delete (기본: TradingUpper와 공유하는 메모리 저장소)
+        """
+        self.db_manager = db_manager or DatabaseManager()
+        self.session_store = session_store or shared_session_store
+        self.clock = clock or SystemClock()
         self.real_approval = None
         self.mock_approval = None
         self.real_approval_expires_at = None
@@ -34,53 +70,104 @@ class KISWebSocket:
         self.upper_limit_stocks = {}
         # sell_order 콜백 (필수)
         self._sell_order = callback
-        self.websocket = None
         self.subscribed_tickers = set()
+        # 종목별 구독 중인 실시간 TR 목록 (key: 종목코드, value: (tr_id, ...))
+        self.ticker_feeds = {}
         self.ticker_queues = {}
-        # 조건 체크 락 (key: 종목코드, value: bool)
-        self.condition_check_lock = {}
+        # 수신 프레임 라우팅 테이블 - 구독 중이고 큐가 있는 종목만
+        # route_ids: 종목코드(bytes 프레임용 bytes 키 / 텍스트 프레임용 str 키) -> 정수 id, route_queues[id]: 종목 큐
+        self.route_ids = {}
+        self.route_queues = []
         # 현재 루프 저장 (생성 시점 루프)
         try:
             self._monitor_loop = asyncio.get_running_loop()
         except RuntimeError:
             self._monitor_loop = asyncio.get_event_loop()
         self.message_queue = asyncio.Queue()
-        self.is_connected = False
         self.approval_key = None
-        self.connect_headers = {
-            "approval_key": self.approval_key,
-            "custtype": "P",
-            "tr_type": "1",
-            "content-type": "utf-8",
-        }
+        # 추가 앱키별 approval 캐시 (key: approval_type, value: (approval_key, expires_at))
+        self.extra_approvals = {}
+        # 웹소켓 커넥션 풀 - 연결당 구독 한도를 넘으면 여러 연결로 분산
+        self.pool = KISWebSocketPool(
+            WS_URL,
+            self._approval_providers(),
+            WS_MAX_SUBSCRIPTIONS_PER_CONNECTION,
+            WS_MAX_CONNECTIONS,
+        )
+        # 실시간 체결통보 (구독 응답의 key/iv로 복호화)
+        self.notice_tr_id = get_tr_id("execution_notice")
+        # 체결통보 수신 연결: 모의투자는 기본 연결(모의 도메인)을 함께 쓰고, 실전은 실전 도메인에 별도 연결
+        self.notice_shard = None if is_mock() else WebSocketShard(
+            "notice", WS_REAL_URL, lambda: self._ensure_approval(is_mock=False)
+        )
+        self.notice_subscribed = False
+        self.notice_key = None
+        self.notice_iv = None
         self.active_tasks = {}
         self.slack_logger = SlackLogger()
-        self.receiver_task = None
+        # 샤드별 수신 태스크 (key: 샤드 번호, value: 태스크)
+        self.receiver_tasks = {}
+        # 재연결 시 종목별 시세 공백 기록 및 공백 후 REST 스냅샷 태스크
+        self.gap_tracker = GapTracker()
+        self.gap_refresh_tasks = set()
+        # 수신 프레임 기록기 (TICK_RECORDER_ENABLED일 때만)
+        self.tick_recorder = (
+            TickRecorder(TICK_RECORD_DIR, TICK_RECORDER_FSYNC_INTERVAL) if TICK_RECORDER_ENABLED else None
+        )
         # self.locks = {}
-        self.selling_in_progress = set()
         self.LOCK_TIMEOUT = 10
-        self.recv_lock = asyncio.Lock()
-        self.kis_api = KISApi()
+        self.kis_api = kis_api or KISApi()
         self.api_lock = asyncio.Lock()
         # 매수 중인 종목 추적 (key: 종목코드, value: 매수 중 상태)
         self.buying_in_progress = {}
         self.buy_status_lock = asyncio.Lock()
         self.logger = TradingLogger()
+        if self.pool.max_connections < self.pool.requested_connections:
+            self.logger.warning(
+                f"웹소켓 연결 수를 앱키 수에 맞춰 제한: {self.pool.max_connections}/{self.pool.requested_connections}개 "
+                f"(최대 구독 {self.pool.capacity}건, 연결을 늘리려면 WS_EXTRA_APP_KEYS 설정)"
+            )
+        # 영업일 기준 장 상태 서비스 - 모든 종목 모니터가 하나의 장 시작 이벤트를 공유
+        self.market_clock = MarketClock(self.clock, self.logger)
+        self.market_clock_task = None
+        # 이벤트 루프 지연/정지 감시기 (real_time_monitoring에서 시작)
+        self.watchdog = (
+            LoopWatchdog(self.logger, LOOP_WATCHDOG_INTERVAL, LOOP_STALL_THRESHOLD, LOOP_METRICS_LOG_INTERVAL)
+            if LOOP_WATCHDOG_ENABLED else None
+        )
         self.pending_sell = {}
-        # 전역 매도 세마포어 - 동시 매도 제한 (값이 1이면 한 번에 하나의 매도만 처리)
-        self.global_sell_semaphore = asyncio.Semaphore(1)
-        # 티커별 매도 락 (key: 종목코드, value: 락 객체)
-        self.ticker_sell_locks = {}
-        # 티커별 매도 락 (key: 종목코드, value: 락 객체)
-        self.ticker_sell_locks = {}
+        # 구독 조정(reconcile) 직렬화 락
+        self.subscription_lock = asyncio.Lock()
+        # 세션은 남아 있지만 모니터링을 끝낸 종목 (다시 모니터링을 시작할 때까지 구독 대상에서 제외)
+        self.excluded_tickers = set()
+        # 세션별 매도 트리거 가격 (key: 종목코드, value: SellTriggers)
+        self.sell_triggers = {}
+        # 트레일링스탑 고점 저장소 (재시작 시 복원) 및 주기적 일괄 저장 태스크
+        self.trailing_store = TrailingStateStore(flush_interval=TRAILING_STATE_FLUSH_INTERVAL, logger=self.logger)
+        self.trailing_flush_task = None
+        # 매도 주문 전용 실행 풀 - 서로 다른 종목은 동시에, 같은 종목은 한 번에 하나만 주문
+        self.order_executor = OrderExecutor(ORDER_EXECUTION_WORKERS, self.logger)
+
+    @property
+    def websocket(self):
+        """기본(첫 번째) 샤드의 웹소켓"""
+        primary = self.pool.primary
+        return primary.websocket if primary else None
+
+    @property
+    def is_connected(self):
+        return self.pool.is_connected
 
     ######################################################################################
     ##################################    매도 로직   #####################################
     ######################################################################################
 
-    async def sell_condition(self, recv_value, session_id, ticker, name, quantity, avg_price, target_date, trade_condition):
+    async def sell_condition(self, quote, session_id, ticker, name, quantity, avg_price, target_date, trade_condition):
         """
         매도 조건을 판단하고, 조건이 충족되면 매도 처리를 진행합니다.
+
+        Args:
+            quote (Quote): 실시간 시세 (체결가 또는 호가 피드)
         """
         # ------------------------------------------------------------------
         # 새 로직: 매도 조건만 판단하여 결과를 반환 (_monitor_ticker에서 매도 실행)
@@ -90,73 +177,52 @@ class KISWebSocket:
                 self.logger.error(f"{ticker} avg_price=0, 매도 조건 판단 건너뜀")
                 return False
                 
-            # 1) 수신 데이터 유효성 체크
-            if len(recv_value) == 1 and "SUBSCRIBE SUCCESS" in recv_value[0]:
+            # 1) 수신 데이터 유효성 체크 (호가 잔량이 없으면 가격이 0)
+            current_price = quote.last_price
+            if current_price <= 0:
                 return False
 
-            current_price = int(recv_value[15])
-            tick_interval = self.get_tick(current_price)
-            target_price = max(current_price - tick_interval * 2, tick_interval)
-
-            now = datetime.now()
-            current_date = now.date()
-            current_time = now.time()
-
-            # 2) 거래시간이 아니면 조건 미충족
-            if current_time < KRX_TRADING_START or current_time > KRX_TRADING_END:
+            # 2) 거래시간이 아니면 조건 미충족 (장 상태는 market_clock이 전환 시점에만 갱신)
+            market = self.market_clock
+            if not market.is_open:
                 return False
 
-            # 3) 매도 사유 판단
-            sell_reason = {"매도가": target_price}
-            sell_reason_text = None
-
-            # (1) 보유기간 만료
-            sell_time_threshold = time(15, 10)  # 15:10 이후
-            if current_date > target_date and current_time >= sell_time_threshold:
-                sell_reason_text = "기간만료"
-                sell_reason["매도목표일"] = (
-                    target_date.strftime("%Y-%m-%d") if hasattr(target_date, "strftime") else str(target_date)
+            triggers = self.sell_triggers.get(ticker)
+            if triggers is None or triggers.session_id != session_id:
+                triggers = self.sell_triggers[ticker] = SellTriggers(
+                    session_id, avg_price, target_date, trade_condition
+                )
+            elif triggers.avg_price != avg_price:
+                # 추가 매수 등으로 평균단가가 바뀌면 트리거 재계산 (고점은 유지)
+                triggers = self.sell_triggers[ticker] = SellTriggers(
+                    session_id, avg_price, target_date, trade_condition, triggers.high_price
                 )
 
-            # (2) 리스크 관리(손절)
-            if sell_reason_text is None:
-                if trade_condition == "strong_momentum":
-                    risk_threshold = RISK_MGMT_STRONG_MOMENTUM
-                    reason = "주가 하락: 강력 모멘텀 리스크 관리"
-                else:
-                    risk_threshold = RISK_MGMT_UPPER
-                    reason = "주가 하락: 리스크 관리차 매도"
-
-                if target_price < (avg_price * risk_threshold):
-                    sell_reason_text = reason
-                    sell_reason["매도조건가"] = int(avg_price * risk_threshold)
-
-            # (3) 트레일링스탑(익절 보호)
-            if sell_reason_text is None:
-                current_profit_ratio = target_price / avg_price
-                if not hasattr(self, "ticker_high_ratio"):
-                    self.ticker_high_ratio = {}
-                if ticker not in self.ticker_high_ratio or current_profit_ratio > self.ticker_high_ratio[ticker]:
-                    self.ticker_high_ratio[ticker] = current_profit_ratio
-
-                high_ratio = self.ticker_high_ratio[ticker]
-                selling_threshold = SELLING_POINT_UPPER  # 예: 1.08 (8%)
-                trailing_threshold = 1 - TRAILING_STOP_PERCENTAGE  # 예: 0.96 (4%)
-
-                if selling_threshold < high_ratio < (selling_threshold + TRAILING_STOP_PERCENTAGE):
-                    if current_profit_ratio < selling_threshold:
-                        sell_reason_text = "트레일링스탑: 수익률 8% 미만으로 하락"
-                elif high_ratio >= (selling_threshold + TRAILING_STOP_PERCENTAGE):
-                    if current_profit_ratio <= (high_ratio * trailing_threshold):
-                        sell_reason_text = "트레일링스탑: 고점 대비 4% 하락"
+            # 3) 매도 사유 판단
+            # (1) 보유기간 만료
+            if market.in_expiry_window and market.today > target_date:
+                target_price = triggers.target_price(current_price)
+                sell_reason = {
+                    "매도가": target_price,
+                    "매도목표일": (
+                        target_date.strftime("%Y-%m-%d") if hasattr(target_date, "strftime") else str(target_date)
+                    ),
+                    "매도사유": "기간만료",
+                }
+            else:
+                # (2) 리스크 관리(손절), (3) 트레일링스탑(익절 보호) - 미리 계산한 트리거 가격과 비교
+                high_price = triggers.high_price
+                target_price, sell_reason = triggers.check(current_price)
+                if triggers.high_price != high_price:
+                    # 새 고점은 저장 대상으로 표시만 하고 DB 저장은 주기적으로 일괄 처리
+                    self.trailing_store.mark(ticker, triggers, self.clock.now())
 
             # 4) 매도 조건 최종 판단
-            if sell_reason_text is None:
+            if sell_reason is None:
                 return False  # 조건 미충족
 
-            sell_reason["매도사유"] = sell_reason_text
-
-            session_exists = self.db_manager.get_session_by_id(session_id) is not None
+            # 세션 저장소는 메모리 조회라 루프에서 바로 확인
+            session_exists = self.session_store.get(session_id) is not None
 
             return {
                 "sell_decision": True,
@@ -166,248 +232,17 @@ class KISWebSocket:
             }
 
         except Exception as e:
-            self.slack_logger.send_log(
+            # Slack 전송(동기 HTTP)은 루프를 막지 않도록 스레드에서 실행
+            await asyncio.to_thread(
+                self.slack_logger.send_log,
                 level="ERROR",
                 message=f"{ticker} 매도 조건 판단 중 예외 발생",
                 context={"종목코드": ticker, "에러": str(e)},
             )
             return False
-    # ------------------------------------------------------------------
-    # 기존 매도 실행 로직은 더 이상 사용되지 않음 (legacy) -------
-    # ------------------------------------------------------------------
-
-    async def sell_condition_legacy_disabled(self, *args, **kwargs):
-        """(Legacy) Disabled after sell refactor. Always returns False."""
-        return False
-
-    # -------- 이하 legacy 코드(사용되지 않음) --------
-    async def sell_condition_legacy(self, recv_value, session_id, ticker, name, quantity, avg_price, target_date, trade_condition):
-        """
-        매도 조건을 판단하고, 조건이 충족되면 매도 처리를 진행합니다.
-        """
-        if ticker in self.selling_in_progress:
-            # 이미 다른 비동기 작업에서 매도 처리가 진행 중인 경우, 현재 작업은 중복이므로 무시합니다.
-            return False
-            
-        # 세마포어 획득 시도 (비강제: 이미 다른 매도가 진행 중이면 바로 반환)
-        if self.global_sell_semaphore.locked():
-            self.logger.info(f"다른 종목 매도 중 - {ticker} 매도 연기", {"ticker": ticker})
-            return False
-            
-        # 현재 종목을 매도 중인 종목으로 표시
-        self.selling_in_progress.add(ticker)
-
-        try:
-            # 세마포어 획득 - 다른 종목의 매도 처리가 끝날 때까지 대기
-            await self.global_sell_semaphore.acquire()
-            
-            # 세마포어 획득 후 매도 처리 시작
-            # self.logger.info(f"{ticker} 매도 처리 시작", {"ticker": ticker})
-            
-            if len(recv_value) == 1 and "SUBSCRIBE SUCCESS" in recv_value[0]:
-                return False
-
-            current_price = int(recv_value[15])
-            tick_interval = self.get_tick(current_price)
-            target_price = max(current_price - tick_interval * 2, tick_interval)
-
-            now = datetime.now()
-            current_date = now.date()
-            current_time = now.time()
-
-            # 매도 시간 범위 설정 (한국거래소 기준)
-            if current_time < KRX_TRADING_START or current_time > KRX_TRADING_END:
-                if current_time.minute % 10 == 0 and current_time.second < 10:
-                    print("장 시간이 아닙니다. 현재 시간:", current_time)
-                return False
-
-            # 매도 사유 판단 및 기록 (조건식 기반)
-            sell_reason = {"매도가": target_price}
-            sell_reason_text = None
-
-            # 조건1: 보유기간 만료로 매도
-            sell_time_threshold = time(15, 10)  # 오후 3시 10분 이후 매도
-            try:
-                if current_date > target_date and current_time >= sell_time_threshold:
-                    sell_reason_text = "기간만료"
-                    sell_reason["매도목표일"] = target_date.strftime("%Y-%m-%d") if hasattr(target_date, "strftime") else str(target_date)
-            except TypeError as e:
-                print(f"[오류] 날짜 비교 실패: {e}, 타겟데이트: {type(target_date)}, 값: {target_date}")
-
-            # 조건2: 주가 상승으로 익절
-            # if sell_reason_text is None and target_price > (avg_price * SELLING_POINT_UPPER):
-            #     sell_reason_text = "주가 상승: 목표가 도달"
-            #     sell_reason["매도조건가"] = int(avg_price * SELLING_POINT_UPPER)  # 정수로 변환
-
-            # 조건3: 리스크 관리차 매도
-            if sell_reason_text is None:
-                # trade_condition에 따라 다른 손절 라인 적용
-                if trade_condition == "strong_momentum":
-                    risk_threshold = RISK_MGMT_STRONG_MOMENTUM
-                    reason = "주가 하락: 강력 모멘텀 리스크 관리"
-                else:
-                    risk_threshold = RISK_MGMT_UPPER
-                    reason = "주가 하락: 리스크 관리차 매도"
-
-                if target_price < (avg_price * risk_threshold):
-                    sell_reason_text = reason
-                    sell_reason["매도조건가"] = int(avg_price * risk_threshold)
-        
-            # 조건2: 주가 상승으로 익절
-            # 트레일링스탑 로직 구현
-            if sell_reason_text is None:
-                # 현재 수익률 계산
-                current_profit_ratio = target_price / avg_price
-                
-                # 종목별 최고 수익률 추적 (딕셔너리에 저장하여 관리)
-                if not hasattr(self, 'ticker_high_ratio'):
-                    self.ticker_high_ratio = {}
-                
-                # 최고 수익률 업데이트
-                if ticker not in self.ticker_high_ratio or current_profit_ratio > self.ticker_high_ratio[ticker]:
-                    self.ticker_high_ratio[ticker] = current_profit_ratio
-                
-                high_ratio = self.ticker_high_ratio[ticker]
-                selling_threshold = SELLING_POINT_UPPER  # 기준 수익률 (8%)
-                trailing_threshold = 1 - (TRAILING_STOP_PERCENTAGE)  # 예: 4%면 0.96
-                
-                # 케이스 1: 수익률이 8% 이하일 때는 트레일링스탑 미적용 (기존 로직대로 작동)
-                if current_profit_ratio <= selling_threshold:
-                    pass
-                    
-                # 케이스 2: 수익률이 8~12% 사이일 때, 8% 미만으로 떨어지면 매도
-                elif selling_threshold < high_ratio < (selling_threshold + TRAILING_STOP_PERCENTAGE):
-                    if current_profit_ratio < selling_threshold:
-                        sell_reason_text = "트레일링스탑: 수익률 8% 미만으로 하락"
-                        sell_reason["최고수익률"] = round((high_ratio - 1) * 100, 2)
-                        sell_reason["현재수익률"] = round((current_profit_ratio - 1) * 100, 2)
-                        sell_reason["하락비율"] = round(((high_ratio - current_profit_ratio) / high_ratio) * 100, 2)
-                
-                # 케이스 3: 수익률이 12%를 초과한 경우, 고점 대비 4% 하락 시 매도
-                elif high_ratio >= (selling_threshold + TRAILING_STOP_PERCENTAGE):
-                    if current_profit_ratio <= (high_ratio * trailing_threshold):
-                        sell_reason_text = f"트레일링스탑: 고점 대비 {(TRAILING_STOP_PERCENTAGE*100)-100}% 하락"
-                        sell_reason["최고수익률"] = round((high_ratio - 1) * 100, 2)
-                        sell_reason["현재수익률"] = round((current_profit_ratio - 1) * 100, 2)
-                        sell_reason["하락비율"] = round(((high_ratio - current_profit_ratio) / high_ratio) * 100, 2)
-                
-                # 매도 사유가 없으면 종료
-                if sell_reason_text is None:
-                    return False
-
-            # 최종 매도 사유 저장
-            sell_reason["매도사유"] = sell_reason_text
-
-            # 매도 실행 시작 시간 기록
-            start_time = datetime.now()
-            log_context = {
-                "종목코드": ticker,
-                "매도이유": sell_reason,
-                "시작시간": start_time.strftime("%H:%M:%S.%f")[:-3]
-            }
-
-            # 세션 확인
-            session = self.db_manager.get_session_by_id(session_id)
-            if not session:
-                # 세션이 없으면 모니터링 중단 처리
-                try:
-                    await self._stop_monitoring_internal(ticker)
-                except asyncio.CancelledError:
-                    # 정상적인 취소 흐름
-                    pass
-                except Exception as e:
-                    self.logger.error(f"{ticker} - 세션 없음 - 모니터링 중단 중 오류: {str(e)}")
-                return True  # True 반환하여 모니터링 루프가 종료되도록 함
-
-            # 매도 실행
-            try:
-                loop = asyncio.get_event_loop()
-                sell_results = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        None,
-                        self._sell_order,
-                        session_id, ticker, target_price
-                    ),
-                        timeout=30.0  # 30초 타임아웃
-                    )
-            except asyncio.TimeoutError:
-                self.logger.error(f"{ticker} 매도 주문 타임아웃 (30초)")
-                return False
-
-            # 매도 결과 처리
-            sell_duration_ms = (datetime.now() - start_time).total_seconds() * 1000
-
-            if not sell_results or not isinstance(sell_results, dict):
-                sell_results = {}
-
-            # sell_order의 결과(dict)가 None이 아니고, 'rt_cd'가 '0'인지 확인
-            is_sell_completed = (
-                sell_results is not None and
-                sell_results.get('rt_cd') == '0'
-            )
-
-            self.slack_logger.send_log(
-                level="INFO",
-                message=f"{ticker} 매도 처리 완료",
-                context={
-                    **log_context,
-                    "매도소요ms": f"{sell_duration_ms:.1f}ms",
-                    "매도결과": "성공" if is_sell_completed else "실패"
-                }
-            )
-
-            if is_sell_completed:
-                # 작업 취소 예외를 처리하여 안전하게 모니터링을 중단합니다.
-                try:
-                    await self._stop_monitoring_internal(ticker)
-                except asyncio.CancelledError:
-                    # 스스로를 취소하는 과정에서 발생하는 예외이므로 정상적인 흐름입니다.
-                    pass
-
-            return is_sell_completed
-
-        except Exception as e:
-            self.slack_logger.send_log(
-                level="ERROR",
-                message=f"{ticker} 매도 처리 중 예외 발생",
-                context={
-                    "종목코드": ticker,
-                    "에러": str(e)
-                }
-            )
-            return False
-
-        finally:
-            # 전역 세마포어 해제 (다른 매도 작업이 진행될 수 있도록)
-            if self.global_sell_semaphore.locked():
-                self.global_sell_semaphore.release()
-                # self.logger.info(f"{ticker} 매도 작업 완료 - 다음 매도 가능", {"ticker": ticker})
-                
-            # 개별 종목 매도 진행 중 상태 해제
-            if ticker in self.selling_in_progress:
-                self.selling_in_progress.remove(ticker)
-                
-            # 티커별 락 해제 - _monitor_ticker에서 획득한 락을 여기서 해제해야 함
-            if ticker in self.ticker_sell_locks and self.ticker_sell_locks[ticker].locked():
-                self.ticker_sell_locks[ticker].release()
-                # self.logger.info(f"{ticker} 티커 락 해제 완료", {"ticker": ticker})
-
 
     def get_tick(self, price: int) -> int:
-        if price < 1000:
-            return 1
-        elif price < 5000:
-            return 5
-        elif price < 10000:
-            return 10
-        elif price < 50000:
-            return 50
-        elif price < 100000:
-            return 100
-        elif price < 500000:
-            return 500
-        else:
-            return 1000
+        return tick_band(price)[2]
 
     ######################################################################################
     ##############################    인증 관련 메서드   #####################################
@@ -527,6 +362,26 @@ class KISWebSocket:
                 ) = await self._get_approval(R_APP_KEY, R_APP_SECRET, "real")
             return self.real_approval
 
+    async def _ensure_extra_approval(self, app_key, app_secret, approval_type):
+        """커넥션 풀 추가 연결용 앱키의 웹소켓 인증키를 확인하고, 필요하면 새로 발급합니다."""
+        approval, expires_at = self.extra_approvals.get(approval_type, (None, None))
+        if not approval or expires_at is None or datetime.now() >= expires_at:
+            result = await self._get_approval(app_key, app_secret, approval_type)
+            approval, expires_at = result if result else (None, None)
+            self.extra_approvals[approval_type] = (approval, expires_at)
+        return approval
+
+    def _approval_providers(self):
+        """커넥션 풀 샤드가 순서대로 사용할 approval key 공급 함수 목록"""
+        providers = [lambda: self._ensure_approval(is_mock=True)]
+        # 추가 앱키 approval 캐시는 실행 환경(모의/실전)별로 구분
+        domain = "mock" if is_mock() else "real"
+        for i, (app_key, app_secret) in enumerate(WS_EXTRA_CREDENTIALS, start=1):
+            providers.append(
+                lambda k=app_key, s=app_secret, t=f"{domain}_ws{i}": self._ensure_extra_approval(k, s, t)
+            )
+        return providers
+
     ######################################################################################
     ##############################    웹소켓 연결   #######################################
     ######################################################################################
@@ -538,17 +393,37 @@ class KISWebSocket:
             if not self.is_connected:
                 await self.connect_websocket()
 
+            # 실시간 체결통보 구독 (주문/세션 코드의 체결 폴링 대체)
+            if not self.notice_subscribed:
+                await self.subscribe_execution_notice()
+
             # background_tasks를 클래스 속성으로 변경
             self.background_tasks = set()
 
+            # 이벤트 루프 지연/큐 적체 감시 시작
+            if self.watchdog is not None and not self.watchdog.is_running:
+                self.watchdog.start(lambda: {t: q.qsize() for t, q in self.ticker_queues.items()})
+
+            # 장 상태 전환 루프 시작
+            self._ensure_market_clock()
+
+            # 저장된 트레일링스탑 고점 복원 (전체 세션 1회 조회) 및 주기적 저장 시작
+            await self._restore_trailing_states(sessions_info)
+            if self.trailing_flush_task is None or self.trailing_flush_task.done():
+                self.trailing_flush_task = asyncio.create_task(self.trailing_store.run())
+
+            # 세션 목록 기준으로 구독을 한 번에 맞춤 (필요한 등록/해제 요청만 일괄 전송)
+            self.excluded_tickers.difference_update(session[1] for session in sessions_info)
+            await self.reconcile(feed_types={session[1]: feed_type_for(session[7]) for session in sessions_info})
+
             # 세션별 모니터링 시작
             for session in sessions_info:
                 session_id, ticker, name, quantity, avg_price, start_date, target_date, trade_condition = session
                 await self.start_monitoring_ticker(session_id, ticker, name, quantity, avg_price, start_date, target_date, trade_condition)
 
-            # 단일 웹소켓 수신 처리 시작 (중복 생성 방지)
-            if self.receiver_task is None or self.receiver_task.done():
-                self.receiver_task = asyncio.create_task(self._message_receiver())
+            # 샤드별 웹소켓 수신 처리 시작 (중복 생성 방지)
+            for shard in self.pool.shards:
+                self._ensure_receiver(shard)
 
             # 모든 태스크가 완료될 때까지 대기
             while self.background_tasks:
@@ -568,6 +443,24 @@ class KISWebSocket:
             print(f": {e}")
             return False
 
+    async def _restore_trailing_states(self, sessions_info):
+        """저장된 트레일링스탑 상태를 한 번에 조회해 세션별 매도 트리거를 고점과 함께 복원"""
+        try:
+            states = await asyncio.to_thread(self.trailing_store.load, [session[0] for session in sessions_info])
+        except Exception as e:
+            self.logger.error(f"트레일링스탑 상태 복원 실패 (현재가부터 다시 추적): {e}")
+            return
+
+        for session_id, ticker, name, quantity, avg_price, start_date, target_date, trade_condition in sessions_info:
+            state = states.get(session_id)
+            if state is None or not avg_price:
+                continue
+            self.sell_triggers[ticker] = SellTriggers(
+                session_id, avg_price, target_date, trade_condition, state.get("high_price") or 0
+            )
+        if states:
+            self.logger.info(f"트레일링스탑 상태 {len(states)}건 복원", {"sessions": list(states)})
+
     async def stop_monitoring(self, ticker):
         """특정 종목의 모니터링만 중단 (루프 일치 보장)"""
         try:
@@ -643,6 +536,7 @@ class KISWebSocket:
             # 3. 큐 정리
             if ticker in self.ticker_queues:
                 del self.ticker_queues[ticker]
+                self._refresh_routes()
             
             # 4. 매수 중 플래그 정리
             async with self.buy_status_lock:
@@ -677,179 +571,324 @@ class KISWebSocket:
     #         del self.active_tasks[ticker]
     #         print(f"{ticker} 모니터링 중단")
 
-    async def _message_receiver(self):
-        """웹소켓 메시지 수신 전담 코루틴"""
+    def _ensure_receiver(self, shard):
+        """샤드의 수신 태스크가 없거나 종료되었으면 새로 시작"""
+        task = self.receiver_tasks.get(shard.index)
+        if task is None or task.done():
+            self.receiver_tasks[shard.index] = asyncio.create_task(self._message_receiver(shard))
+
+    async def _resubscribe_shard(self, shard):
+        """
+        재연결된 샤드에 배정된 종목(및 체결통보)을 한 번에 다시 등록
+        등록 요청을 응답 대기 없이 연달아 전송(파이프라인)하여 종목 수만큼 왕복하지 않음
+        """
+        requests = []
+        if self.notice_subscribed and shard is self.notice_connection:
+            requests.append((self.notice_tr_id, HTS_ID))
+        for ticker in list(shard.tickers):
+            for tr_id in self.ticker_feeds.get(ticker, tr_ids_for(None)):
+                requests.append((tr_id, ticker))
+        if not requests:
+            return
+
+        self.logger.debug(f"[WS#{shard.index}] 재구독 {len(requests)}건 일괄 전송", {"tickers": list(shard.tickers)})
+        results = await asyncio.gather(
+            *(shard.send_request(tr_id, tr_key, "1") for tr_id, tr_key in requests),
+            return_exceptions=True,
+        )
+        for (tr_id, tr_key), result in zip(requests, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"[WS#{shard.index}] 재구독 실패 {tr_id} {tr_key}: {result}")
+
+    async def _rebalance_shard(self, shard):
+        """재연결에 실패한 샤드의 구독을 다른 샤드로 옮겨 다시 등록"""
+        moved = []
+        for ticker, target in self.pool.rebalance(shard):
+            if not await target.connect():
+                continue
+            try:
+                await self._send_feed_requests(target, ticker, "1")
+                self._ensure_receiver(target)
+                moved.append(ticker)
+                self.logger.debug(f"[WS] {ticker} 구독을 WS#{shard.index} → WS#{target.index}로 재배치")
+            except Exception as e:
+                self.logger.warning(f"[WS] {ticker} 재배치 구독 실패: {e}")
+        self._schedule_gap_refresh(moved)
+
+    def _schedule_gap_refresh(self, tickers):
+        """시세 공백이 있던 종목의 REST 스냅샷 조회를 수신 루프와 별도로 실행"""
+        tickers = [t for t in tickers if self.gap_tracker.is_open(t)]
+        if not tickers:
+            return
+        task = asyncio.create_task(self._refresh_after_gap(tickers))
+        self.gap_refresh_tasks.add(task)
+        task.add_done_callback(self.gap_refresh_tasks.discard)
+
+    async def _refresh_after_gap(self, tickers):
+        """공백 이후 REST 현재가를 종목 큐에 넣어 매도 조건을 바로 재평가"""
+        for ticker in tickers:
+            # 그사이 실시간 프레임이 도착했거나 구독 해제된 종목은 건너뜀
+            if not self.gap_tracker.is_open(ticker) or ticker not in self.subscribed_tickers:
+                continue
+            try:
+                async with self.api_lock:
+                    price, _ = await asyncio.to_thread(self.kis_api.get_current_price, ticker)
+            except Exception as e:
+                self.logger.warning(f"[WS] {ticker} 공백 후 현재가 조회 실패: {e}")
+                continue
+            if not price or not self.gap_tracker.is_open(ticker):
+                continue
+
+            gap = self.gap_tracker.end(ticker)
+            queue = self.ticker_queues.get(ticker)
+            if queue is not None:
+                await queue.put(Quote(
+                    tr_id=TR_SNAPSHOT,
+                    ticker=ticker,
+                    time=self.clock.now().strftime("%H%M%S"),
+                    last_price=price,
+                    bid=price,
+                    ask=price,
+                    volume=0,
+                    acc_volume=0,
+                ))
+            self.logger.info(
+                "시세 공백 후 REST 현재가 반영",
+                {"종목코드": ticker, "공백(초)": round(gap, 3), "현재가": price},
+            )
+
+    def gap_metrics(self):
+        """종목별 시세 공백 통계 (횟수/누적/최대/최근, 진행 중 공백)"""
+        return self.gap_tracker.snapshot()
+
+    def latency_metrics(self):
+        """틱 → 주문 단계별 지연 분포 (ms)"""
+        return latency_tracer.snapshot()
+
+    def order_metrics(self):
+        """매도 주문 실행 풀 지표 (대기/실행 시간, 진행 중 주문 수)"""
+        return self.order_executor.snapshot()
+
+    async def _message_receiver(self, shard):
+        """샤드 하나의 웹소켓 메시지 수신 전담 코루틴. 모든 샤드는 _dispatch_frame으로 합쳐짐"""
+        # 첫 재연결은 즉시, 이후 지터가 있는 지수 백오프
+        backoff = ReconnectBackoff(WS_RECONNECT_BASE_DELAY, WS_RECONNECT_MAX_DELAY)
         while True:
             try:
-                # --- 웹소켓 연결 상태 및 속성 체크 ---
-                if self.websocket is None or not self.is_connected:
-                    print("[WS] self.websocket is None 또는 연결 안 됨. 재연결 시도...")
+                # --- 웹소켓 연결 상태 체크 ---
+                if not shard.is_open:
+                    # 이 연결의 종목은 재구독 후 새 시세를 받을 때까지 공백
+                    self.gap_tracker.begin(shard.tickers)
+                    # 체결통보 수신 연결이 끊기면 주문 코드가 폴링으로 전환하도록 알림
+                    if shard is self.notice_connection:
+                        execution_hub.set_streaming(False)
+                    # 배정된 종목이 없는 추가 샤드는 재연결하지 않고 종료
+                    if not shard.tickers and shard is not self.pool.primary and shard is not self.notice_shard:
+                        shard.mark_disconnected()
+                        return
+                    delay = backoff.next_delay()
+                    if delay > 0:
+                        self.logger.debug(f"[WS#{shard.index}] {backoff.attempts}번째 재연결 시도 전 {delay:.1f}초 대기")
+                        await asyncio.sleep(delay)
                     try:
-                        await self.connect_websocket()
+                        connected = await shard.connect()
                     except Exception as e:
-                        print(f"[WS] connect_websocket 예외: {e}")
-                        await asyncio.sleep(5)
+                        self.logger.warning(f"[WS#{shard.index}] connect 예외: {e}")
+                        connected = False
+                    if not connected:
+                        self.logger.debug(f"[WS#{shard.index}] 재연결 실패, 다른 연결로 재배치 후 재시도")
+                        if shard is not self.notice_shard:
+                            await self._rebalance_shard(shard)
                         continue
-                    if self.websocket is None or not self.is_connected:
-                        print("[WS] 재연결 실패, 5초 후 재시도")
-                        await asyncio.sleep(5)
-                        continue
-                    # 재연결 후 종목 재구독
-                    if self.subscribed_tickers:
-                        to_resub = list(self.subscribed_tickers)
-                        print(f"[WS] 재구독 시도: {to_resub}")
-                        for ticker in to_resub:
-                            try:
-                                await self.subscribe_ticker(ticker)
-                            except Exception as sub_e:
-                                print(f"[WS] 재구독 실패 {ticker}: {sub_e}")
-
-                # 닫힌 소켓 체크
-                if self.websocket is None or getattr(self.websocket, "closed", True):
-                    print("[WS] 웹소켓이 None이거나 닫혀 있음. 재연결 필요")
-                    self.is_connected = False
-                    self.websocket = None
-                    await asyncio.sleep(2)
-                    continue
+                    # 재연결 후 종목 일괄 재구독 및 공백 종목 REST 스냅샷
+                    await self._resubscribe_shard(shard)
+                    self._schedule_gap_refresh(list(shard.tickers))
 
                 # --- recv() 호출 및 예외 처리 ---
                 try:
-                    async with self.recv_lock:
-                        data = await self.websocket.recv()
+                    data = await shard.websocket.recv()
                 except (KeyboardInterrupt, asyncio.CancelledError):
                     print(
                         "[WS] 수신 루프가 사용자 요청(ctrl+c) 또는 태스크 취소로 종료됩니다."
                     )
                     break
+                except ConnectionClosed:
+                    self.logger.debug(f"[WS#{shard.index}] 웹소켓 연결이 끊어졌습니다. 재연결을 시도합니다.")
+                    shard.mark_disconnected()
+                    continue
                 except AttributeError as e:
-                    print(f"[WS] AttributeError: {e}. self.websocket={self.websocket}")
-                    self.is_connected = False
-                    self.websocket = None
-                    await asyncio.sleep(2)
+                    self.logger.warning(f"[WS#{shard.index}] AttributeError: {e}. websocket={shard.websocket}")
+                    shard.mark_disconnected()
                     continue
                 except OSError as e:
                     if getattr(e, "errno", None) == 11001:
-                        print(f"[WS] DNS 에러(getaddrinfo failed): {e}")
+                        self.logger.warning(f"[WS#{shard.index}] DNS 에러(getaddrinfo failed): {e}")
                     else:
-                        print(f"[WS] OSError: {e}")
-                    self.is_connected = False
-                    self.websocket = None
-                    await asyncio.sleep(5)
+                        self.logger.warning(f"[WS#{shard.index}] OSError: {e}")
+                    shard.mark_disconnected()
                     continue
                 except Exception as e:
-                    print(f"[WS] recv 예외: {e}")
-                    self.is_connected = False
-                    self.websocket = None
-                    await asyncio.sleep(2)
+                    self.logger.warning(f"[WS#{shard.index}] recv 예외: {e}")
+                    shard.mark_disconnected()
                     continue
-                # print(f"수신된 원본 데이터: {data}")  # 디버깅용
-
-                # 웹소켓 연결상태 체크
-                data_str = data.decode('utf-8') if isinstance(data, bytes) else data
-                
-                if '"tr_id":"PINGPONG"' in data_str:
-                    try:
-                        await self.websocket.send(data)  # 서버 요구에 따라 그대로 반송
-                    except Exception as e:
-                        print(f"PINGPONG 응답 실패: {e}")
-                    continue
-
-                # 구독 성공 메시지 체크
-                if "SUBSCRIBE SUCCESS" in data_str:
-                    # JSON 파싱 시도
-                    data_dict = json.loads(data_str)
-                    ticker = data_dict["header"]["tr_key"]
-                    continue
-
-                # # 실시간 호가 데이터일 경우
-                data = data.encode('utf-8') if isinstance(data, str) else data
-                recvvalue = data.split(b"^")
 
-                # 실시간 호가 데이터일 경우
-                # recvvalue = data.split("^")
-
-                
-                if len(recvvalue) > 1:  # 실제 호가 데이터인 경우
-                    try:
-                        # ticker = recvvalue[0].split("|")[-1]
-                        ticker = recvvalue[0].split(b"|")[-1]
-                        ticker_str = ticker.decode('utf-8') if isinstance(ticker, bytes) else ticker
-                        
-                        if ticker_str in self.subscribed_tickers:
-                            # print(ticker, type(ticker))
-                            # print(ticker_str, type(ticker_str))
-                            await self.ticker_queues[ticker_str].put((recvvalue))
-                        
-                        # if ticker in self.subscribed_tickers:
-                        #     await self.ticker_queues[ticker].put((recvvalue))
-                        else:
-                            print(f"종목코드 {ticker}는 구독 목록에 없음 (구독목록: {self.subscribed_tickers})")
-                    except Exception as extract_e:
-                        print(f"종목코드 추출 또는 큐 저장 중 오류: {extract_e}")
+                # 연결 직후 바로 끊기는 경우 즉시 재연결이 반복되지 않도록, 프레임을 받은 뒤에만 백오프 초기화
+                if backoff.attempts:
+                    backoff.reset()
+                if self.tick_recorder is not None:
+                    self.tick_recorder.record(data)
+                await self._dispatch_frame(shard, data)
 
             except (KeyboardInterrupt, asyncio.CancelledError):
                 print(
                     "[WS] 수신 루프가 사용자 요청(ctrl+c) 또는 태스크 취소로 종료됩니다."
                 )
                 break
-            except ConnectionClosed:
-                print("웹소켓 연결이 끊어졌습니다. 재연결을 시도합니다.")
-                self.is_connected = False
-                self.websocket = None
-                await asyncio.sleep(1)
-                continue
 
-    async def connect_websocket(self):
-        """웹소켓 연결 설정"""
-        if self.websocket and not self.websocket.closed:
-            print("웹소켓이 이미 연결되어 있어 connect_websocket 메서드 종료")
+    def _refresh_routes(self):
+        """
+        구독/큐 변경 시 라우팅 테이블 재구성 (수신 경로에서는 조회만 함)
+
+        종목코드를 작은 정수 id로 바꿔 두고, 수신 프레임은 종목코드 부분만 잘라 id로 큐를 찾습니다.
+        bytes 프레임은 디코딩 없이 bytes 키로 조회하므로 구독하지 않은 종목은 디코딩/파싱하지 않습니다.
+        """
+        tickers = [ticker for ticker in self.ticker_queues if ticker in self.subscribed_tickers]
+        route_ids = {}
+        for route_id, ticker in enumerate(tickers):
+            route_ids[ticker.encode()] = route_id
+            route_ids[ticker] = route_id
+        self.route_queues = [self.ticker_queues[ticker] for ticker in tickers]
+        self.route_ids = route_ids
+
+    async def _dispatch_frame(self, shard, data):
+        """수신 프레임 처리: 첫 글자로 실시간 데이터/체결통보/제어(JSON) 프레임을 구분해 종목별 큐로 전달"""
+        if not data:
+            return
+        is_bytes = isinstance(data, (bytes, bytearray))
+        head = data[0:1]
+
+        # 실시간 시세 데이터(체결가/호가): "0|TR_ID|건수|종목코드^..."
+        if head == b'0' or head == '0':
+            received_ns = perf_counter_ns()
+            route_ids = self.route_ids
+            route_queues = self.route_queues
+            # 단건 프레임은 종목코드만 잘라 먼저 조회해 구독하지 않은 종목은 디코딩/파싱하지 않음
+            sep, caret, single = (b'|', b'^', b'001') if is_bytes else ('|', '^', '001')
+            tr_end = data.find(sep, 2)
+            count_end = data.find(sep, tr_end + 1)
+            if data[tr_end + 1:count_end] == single:
+                if data[count_end + 1:data.find(caret, count_end + 1)] not in route_ids:
+                    return
+            if is_bytes:
+                data = data.decode('utf-8')
+            try:
+                for quote in parse_frame(data):
+                    route_id = route_ids.get(quote.ticker)
+                    if route_id is None:
+                        continue
+                    quote.received_ns = received_ns
+                    # 재연결 후 첫 실시간 시세면 공백 종료
+                    if self.gap_tracker.is_open(quote.ticker):
+                        self.gap_tracker.end(quote.ticker)
+                    route_queues[route_id].put_nowait(quote)
+            except Exception as extract_e:
+                self.logger.warning(f"시세 파싱 또는 큐 저장 중 오류: {extract_e}")
             return
 
-        try:
-            # 기존 웹소켓 정리
-            if self.websocket:
+        if is_bytes:
+            data = data.decode('utf-8')
+            head = data[0]
+
+        # 암호화된 실시간 데이터(체결통보)
+        if head == '1':
+            self._handle_execution_notice(data)
+            return
+
+        # 제어 프레임(JSON): 연결상태 체크(PINGPONG) 또는 구독 응답
+        if head == '{':
+            if '"tr_id":"PINGPONG"' in data:
                 try:
-                    await self.websocket.close()
-                    print("기존 웹소켓 연결 종료")
+                    await shard.websocket.send(data)  # 서버 요구에 따라 그대로 반송
                 except Exception as e:
-                    print(f"기존 웹소켓 종료 중 오류: {str(e)}")
-                self.websocket = None
+                    print(f"PINGPONG 응답 실패: {e}")
+                return
+            if "SUBSCRIBE SUCCESS" in data:
+                self._handle_subscribe_response(data, shard)
 
-            url = "ws://ops.koreainvestment.com:31000/tryitout/H0STASP0"
-            print(f"웹소켓 URL: {url}")
-            
-            self.connect_headers = {
-                "approval_key": await self._ensure_approval(is_mock=True),
-                "custtype": "P",
-                "tr_type": "1",
-                "content-type": "utf-8",
-            }
+    @property
+    def notice_connection(self):
+        """체결통보를 수신하는 연결 (실전: 실전 도메인 전용 연결, 모의: 기본 연결)"""
+        return self.notice_shard if self.notice_shard is not None else self.pool.primary
 
-            # 타임아웃 설정하여 연결 시도
-            print("웹소켓 연결 시도 중...")
-            self.websocket = await asyncio.wait_for(
-                websockets.connect(url, extra_headers=self.connect_headers),
-                timeout=10.0,
-            )
-            self.is_connected = True
-            print(f"웹소켓 연결 성공! (ID: {id(self.websocket)})")
-            print("이벤트 루프 저장 및 웹소켓 연결 성공")
-
-        except asyncio.TimeoutError:
-            print("웹소켓 연결 타임아웃")
-            self.is_connected = False
-            self.websocket = None
+    def _handle_subscribe_response(self, data_str, shard=None):
+        """구독 응답 처리. 체결통보 구독 응답이면 복호화 key/iv 저장"""
+        try:
+            data_dict = json.loads(data_str)
+            if data_dict["header"]["tr_id"] != self.notice_tr_id:
+                return
+            output = data_dict["body"]["output"]
+            self.notice_key = output["key"]
+            self.notice_iv = output["iv"]
+            # 계좌 환경과 같은 도메인의 체결통보 연결에서 온 응답일 때만 스트리밍으로 간주
+            if shard is self.notice_connection:
+                execution_hub.set_streaming(True)
+            self.logger.info("실시간 체결통보 구독 완료", {"tr_id": self.notice_tr_id, "연결": getattr(shard, "index", None)})
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.error(f"구독 응답 파싱 실패: {e}")
+
+    def _handle_execution_notice(self, data_str):
+        """체결통보 복호화 후 체결 이벤트 발행"""
+        parts = data_str.split('|', 3)
+        if len(parts) < 4 or parts[1] != self.notice_tr_id:
+            return
+        if not self.notice_key or not self.notice_iv:
+            self.logger.warning("체결통보 복호화 키 없음 - 수신 데이터 무시")
+            return
+        try:
+            notice = parse_execution_notice(decrypt_notice(parts[3], self.notice_key, self.notice_iv))
+        except Exception as e:
+            self.logger.error(f"체결통보 복호화/파싱 실패: {e}")
+            return
+        # 체결통보가 실제로 도착했으면 스트리밍 중
+        if not execution_hub.is_streaming:
+            execution_hub.set_streaming(True)
+        execution_hub.publish(notice)
+
+    async def subscribe_execution_notice(self):
+        """실시간 체결통보(H0STCNI0/H0STCNI9) 구독. 실전은 실전 도메인 연결, 모의는 기본 연결에 등록"""
+        if not HTS_ID:
+            self.logger.warning("HTS_ID 미설정 - 실시간 체결통보 구독 생략 (체결 폴링 사용)")
             return False
-            
+        if self.notice_shard is not None:
+            if not await self.notice_shard.connect():
+                self.logger.warning("실전 체결통보 연결 실패 - 체결 폴링 사용")
+                return False
+        elif not await self.ensure_websocket_connected():
+            return False
+        shard = self.notice_connection
+        try:
+            await shard.send_request(self.notice_tr_id, HTS_ID, "1")
+            self.notice_subscribed = True
+            self._ensure_receiver(shard)
+            return True
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e)
-            print(f"웹소켓 연결 실패: {error_type} - {error_msg}")
-            self.is_connected = False
-            self.websocket = None
+            self.logger.error(f"실시간 체결통보 구독 실패: {e}")
             return False
-        
-        return True
+
+    async def connect_websocket(self):
+        """웹소켓 연결 설정 (커넥션 풀의 기본 연결)"""
+        if self.pool.primary is not None and self.pool.primary.is_open:
+            print("웹소켓이 이미 연결되어 있어 connect_websocket 메서드 종료")
+            return
+
+        print(f"웹소켓 URL: {WS_URL}")
+        print("웹소켓 연결 시도 중...")
+        try:
+            connected = await self.pool.connect()
+        except Exception as e:
+            print(f"웹소켓 연결 실패: {type(e).__name__} - {e}")
+            return False
+        return connected
 
     async def close(self):
         """웹소켓 연결 종료 (루프 일치 보장)"""
@@ -865,8 +904,6 @@ class KISWebSocket:
         await self._close_internal()
 
     async def _close_internal(self):
-        self.is_connected = False
-
         # 모든 활성 태스크 취소
         for ticker, task in list(self.active_tasks.items()):
             if not task.done():
@@ -877,127 +914,212 @@ class KISWebSocket:
                     pass
         self.active_tasks.clear()
 
-        # 메시지 수신 태스크 취소
-        if self.receiver_task and not self.receiver_task.done():
-            self.receiver_task.cancel()
+        # 샤드별 메시지 수신 태스크 취소
+        for task in list(self.receiver_tasks.values()):
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.receiver_tasks.clear()
+
+        # 이벤트 루프 감시 중단
+        if self.watchdog is not None:
+            self.watchdog.stop()
+
+        # 장 상태 전환 루프 중단
+        if self.market_clock_task is not None:
+            self.market_clock_task.cancel()
+            self.market_clock_task = None
+
+        # 남은 트레일링스탑 상태 저장 (취소 시 마지막 일괄 저장 수행)
+        if self.trailing_flush_task is not None:
+            self.trailing_flush_task.cancel()
             try:
-                await self.receiver_task
+                await self.trailing_flush_task
             except asyncio.CancelledError:
                 pass
-        self.receiver_task = None
+            self.trailing_flush_task = None
 
-        # 웹소켓 연결 종료
-        if self.websocket and not self.websocket.closed:
-            try:
-                await self.websocket.close()
-                await asyncio.sleep(0.1)  # 연결 종료 대기
-            except Exception as e:
-                print(f"웹소켓 종료 중 오류: {e}")
+        # 매도 주문 실행 지표 기록 (풀은 재시작에 대비해 유지)
+        if self.order_executor.submitted:
+            self.logger.info("매도 주문 실행 지표", self.order_executor.snapshot())
+            self.logger.info("틱→주문 지연 지표", latency_tracer.snapshot())
+
+        # 공백 후 REST 스냅샷 태스크 취소
+        for task in list(self.gap_refresh_tasks):
+            task.cancel()
+        self.gap_refresh_tasks.clear()
+
+        # 모든 웹소켓 연결 종료
+        try:
+            await self.pool.close()
+            if self.notice_shard is not None:
+                await self.notice_shard.close()
+            await asyncio.sleep(0.1)  # 연결 종료 대기
+        except Exception as e:
+            print(f"웹소켓 종료 중 오류: {e}")
+
+        # 기록 중인 프레임을 파일에 반영
+        if self.tick_recorder is not None:
+            await asyncio.to_thread(self.tick_recorder.flush)
 
         # 리소스 정리
-        self.websocket = None
+        self.notice_subscribed = False
+        execution_hub.set_streaming(False)
         self.subscribed_tickers.clear()
+        self.ticker_feeds.clear()
         self.ticker_queues.clear()
+        self._refresh_routes()
         print("WebSocket 연결이 완전히 종료되었습니다.")
 
     ######################################################################################
     ##############################    구독 관리   #######################################
     ######################################################################################
 
-    async def subscribe_ticker(self, ticker):
-        """종목 구독"""
-        # 종목 구독 전에 웹소켓 연결 상태 확인
-        if not await self.ensure_websocket_connected():
-            self.slack_logger.send_log(
-                level="ERROR",
-                message="웹소켓 연결 없이 구독 시도 실패",
-                context={"종목코드": ticker}
-            )
-            return False
-            
-        if ticker in self.subscribed_tickers:
-            print(f"이미 구독 중인 종목입니다: {ticker}")
-            return
-        self.connect_headers["tr_type"] = "1"
-        request_data = {
-            "header": self.connect_headers,
-            "body": {
-                "input": {
-                    "tr_id": "H0STASP0",  # 실시간 호가 TR ID
-                    "tr_key": ticker,
-                }
-            },
-        }
+    async def _send_feed_requests(self, shard, ticker, tr_type):
+        """종목에 설정된 피드 TR 전체를 등록(1)/해제(2)"""
+        for tr_id in self.ticker_feeds.get(ticker, tr_ids_for(None)):
+            await shard.send_request(tr_id, ticker, tr_type)
 
-        # 웹소켓 연결 상태 확인 및 재연결 시도
-        if self.websocket is None or self.websocket.closed:
-            await self.ensure_websocket_connected()
-            
-            # 재연결 후에도 웹소켓이 None이면 에러 처리
-            if self.websocket is None:
-                self.slack_logger.send_log(
-                    level="ERROR",
-                    message=f"웹소켓 연결 실패: {ticker} 구독 불가",
-                    context={"ticker": ticker}
-                )
-                return
+    async def reconcile(self, desired=None, feed_types=None):
+        """
+        원하는 구독 종목 집합과 현재 구독을 비교해 필요한 등록/해제만 한 번에 전송 (루프 일치 보장)
 
+        같은 집합으로 다시 호출하면 아무 요청도 보내지 않으므로 세션 목록이 바뀔 때마다 호출해도 됩니다.
+        desired를 생략하면 세션 저장소의 진행 중 세션 종목(excluded_tickers 제외)을 구독 대상으로 사용합니다.
+
+        Args:
+            desired (set[str]): 구독해야 할 종목코드 집합 (None이면 세션 저장소 기준)
+            feed_types (dict): 종목코드별 피드 종류 (없으면 세션 매매 조건, 기존 피드 또는 REALTIME_FEED_TYPE)
+
+        Returns:
+            dict: {"added": [...], "removed": [...], "failed": [...]}
+        """
         try:
-            await self.websocket.send(json.dumps(request_data))
-            self.subscribed_tickers.add(ticker)
-            # print(f"종목 구독 성공: {ticker}")
-        except Exception as e:
-            error_msg = f"종목 구독 실패: {ticker}, 에러: {str(e)}"
-            print(error_msg)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = self._monitor_loop
+        if loop != self._monitor_loop:
+            fut = asyncio.run_coroutine_threadsafe(
+                self._reconcile_internal(desired, feed_types), self._monitor_loop
+            )
+            return await asyncio.wrap_future(fut)
+        return await self._reconcile_internal(desired, feed_types)
+
+    def _session_subscriptions(self):
+        """세션 저장소 기준 구독 대상 (종목코드 -> 피드 종류)"""
+        return {
+            session.get('ticker'): feed_type_for(session.get('trade_condition'))
+            for session in self.session_store.all()
+            if session.get('ticker') and session.get('ticker') not in self.excluded_tickers
+        }
+
+    async def _reconcile_internal(self, desired=None, feed_types=None):
+        result = {"added": [], "removed": [], "failed": []}
+        # 구독 목표와 현재 구독 비교도 락 안에서 수행해, 동시에 들어온 조정이 서로의 변경을 덮어쓰지 않도록 함
+        async with self.subscription_lock:
+            feed_types = feed_types or {}
+            if desired is None:
+                session_feeds = self._session_subscriptions()
+                desired = set(session_feeds)
+                feed_types = {**session_feeds, **feed_types}
+            desired = set(desired)
+            wanted_feeds = {
+                ticker: tr_ids_for(feed_types[ticker]) if ticker in feed_types
+                else self.ticker_feeds.get(ticker) or tr_ids_for(None)
+                for ticker in desired
+            }
+            # 피드 종류가 바뀐 종목은 해제 후 다시 등록
+            changed = {
+                ticker for ticker in desired & self.subscribed_tickers
+                if self.ticker_feeds.get(ticker) != wanted_feeds[ticker]
+            }
+            to_remove = (self.subscribed_tickers - desired) | changed
+            to_add = (desired - self.subscribed_tickers) | changed
+            if not to_remove and not to_add:
+                return result
+
+            # 샤드별 요청 목록: (tr_id, 종목코드, tr_type, 종목코드)
+            batches = {}
+
+            # 1) 해제 먼저 처리해 등록 한도 확보
+            for ticker in to_remove:
+                self.subscribed_tickers.discard(ticker)
+                self.gap_tracker.discard(ticker)
+                shard = self.pool.release(ticker)
+                feeds = self.ticker_feeds.pop(ticker, None) or tr_ids_for(None)
+                result["removed"].append(ticker)
+                if shard is None or not shard.is_open:
+                    continue
+                for tr_id in feeds:
+                    batches.setdefault(shard, []).append((tr_id, ticker, "2"))
+
+            # 2) 등록할 종목을 샤드에 배정 (연결이 필요하면 여기서 연결)
+            for ticker in to_add:
+                tr_ids = wanted_feeds[ticker]
+                shard = await self.pool.assign(ticker, len(tr_ids))
+                if shard is None:
+                    result["failed"].append(ticker)
+                    continue
+                self.ticker_feeds[ticker] = tr_ids
+                self.subscribed_tickers.add(ticker)
+                result["added"].append(ticker)
+                for tr_id in tr_ids:
+                    batches.setdefault(shard, []).append((tr_id, ticker, "1"))
+
+            # 3) 모든 샤드의 요청을 응답 대기 없이 연달아 전송 (파이프라인)
+            shards = list(batches)
+            results = await asyncio.gather(
+                *(self._send_batch(shard, batches[shard]) for shard in shards),
+                return_exceptions=True,
+            )
+            self._refresh_routes()
+            for shard, sent in zip(shards, results):
+                if isinstance(sent, Exception):
+                    # 배정은 유지하고 연결만 끊음 → 수신 루프가 재연결 후 배정된 종목을 다시 등록
+                    self.logger.warning(f"[WS#{shard.index}] 구독 일괄 전송 실패: {sent}")
+                    shard.mark_disconnected()
+                self._ensure_receiver(shard)
+
+        if result["failed"]:
             self.slack_logger.send_log(
                 level="ERROR",
-                message=error_msg,
-                context={"ticker": ticker, "error": str(e)}
+                message="웹소켓 연결 없음 또는 구독 한도 초과로 구독 실패",
+                context={"종목코드": result["failed"], "최대구독수": self.pool.capacity}
             )
-            
-            # 에러 발생 시 웹소켓 정리
-            if self.websocket:
-                await self._close_internal()
-                self.websocket = None
+        self.logger.info(
+            f"구독 조정: 등록 {len(result['added'])}건, 해제 {len(result['removed'])}건",
+            result,
+        )
+        return result
 
-    async def unsubscribe_ticker(self, ticker):
-        """종목 구독 취소"""
-        if ticker not in self.subscribed_tickers:
-            print(f"구독하지 않은 종목입니다: {ticker}")
-            return
+    async def _send_batch(self, shard, requests):
+        """한 샤드에 등록/해제 요청을 연달아 전송"""
+        for tr_id, tr_key, tr_type in requests:
+            await shard.send_request(tr_id, tr_key, tr_type)
 
-        # 웹소켓 연결 상태 확인
-        if self.websocket is None or not self.is_connected or self.websocket.closed:
-            print(f"웹소켓이 연결되어 있지 않아 구독을 취소할 수 없습니다: {ticker}")
-            self.subscribed_tickers.discard(ticker)  # 구독 목록에서 제거
-            return
+    async def subscribe_ticker(self, ticker, feed_type=None):
+        """
+        종목 구독 (세션 저장소 기준 구독 조정으로 처리)
 
-        self.connect_headers["tr_type"] = "2"
-        request_data = {
-            "header": self.connect_headers,
-            "body": {
-                "input": {
-                    "tr_id": "H0STASP0",  # 실시간 호가 TR ID
-                    "tr_key": ticker,
-                }
-            },
-        }
+        Args:
+            ticker (str): 종목코드
+            feed_type (str): trade/orderbook/both. None이면 세션 매매 조건 또는 REALTIME_FEED_TYPE 설정값
+        """
+        self.excluded_tickers.discard(ticker)
+        result = await self.reconcile(feed_types={ticker: feed_type} if feed_type else None)
+        return ticker in self.subscribed_tickers and ticker not in result["failed"]
 
-        try:
-            await self.websocket.send(json.dumps(request_data))
-            self.subscribed_tickers.discard(ticker)  # remove 대신 discard 사용
-            print(f"종목 구독 취소 성공: {ticker}")
-        except websockets.exceptions.ConnectionClosed:
-            print(f"웹소켓 연결이 닫혀 있어 구독 취소에 실패했습니다: {ticker}")
-            self.is_connected = False
-            self.websocket = None
-        except Exception as e:
-            print(f"종목 구독 취소 중 오류 발생 ({ticker}): {e}")
-            # 오류 발생 시에도 구독 목록에서 제거
-            self.subscribed_tickers.discard(ticker)
+    async def unsubscribe_ticker(self, ticker):
+        """종목 구독 취소 (모니터링을 다시 시작할 때까지 구독 대상에서 제외하고 구독 조정으로 해제)"""
+        self.excluded_tickers.add(ticker)
+        result = await self.reconcile()
+        if ticker in result["removed"]:
+            self.logger.debug(f"종목 구독 취소 성공: {ticker}")
 
     async def start_monitoring_ticker(self, session_id, ticker, name, quantity, avg_price, start_date, target_date, trade_condition):
-        print(f"[DEBUG] start_monitoring_ticker 호출됨: {ticker}")  # 추가된 로그
         # 이미 실행 중인 모니터링 태스크가 있는지 확인
         if ticker in self.active_tasks:
             # 이미 실행 중인 태스크가 있으면 취소
@@ -1010,12 +1132,14 @@ class KISWebSocket:
                     pass
             del self.active_tasks[ticker]
 
-        # 새 종목 구독
-        await self.subscribe_ticker(ticker)
+        # 새 종목 구독 (매매 조건별 피드 종류, real_time_monitoring에서 일괄 등록된 종목은 요청 없음)
+        if ticker not in self.subscribed_tickers or ticker in self.excluded_tickers:
+            await self.subscribe_ticker(ticker, feed_type_for(trade_condition))
 
         # 이벤트 루프별 큐 정합성 보장: 항상 현재 루프에 바인딩된 새 큐 생성
         # 기존 큐가 다른 루프에 바인딩되어 있을 경우 "다른 event loop" 오류가 발생하므로 새로 생성한다.
         self.ticker_queues[ticker] = asyncio.Queue()
+        self._refresh_routes()
 
         # 새 종목에 대한 모니터링 태스크 생성
         task = asyncio.create_task(
@@ -1049,6 +1173,7 @@ class KISWebSocket:
             or getattr(self.ticker_queues[ticker], "_loop", None) is not asyncio.get_running_loop()
         ):
             self.ticker_queues[ticker] = asyncio.Queue()
+            self._refresh_routes()
 
         # 모니터링 시작
 
@@ -1089,11 +1214,12 @@ class KISWebSocket:
                 break
                 
             try:
-                # 큐에서 실시간 데이터 수신 (30초 타임아웃)
-                recvvalue = await asyncio.wait_for(
+                # 큐에서 실시간 시세 수신 (30초 타임아웃)
+                quote = await asyncio.wait_for(
                     self.ticker_queues[ticker].get(), 
                     timeout=30.0
                 )
+                dequeued_ns = perf_counter_ns()
                 # 데이터 수신 시 큐 작업 완료 표시
                 self.ticker_queues[ticker].task_done()
                 
@@ -1106,115 +1232,110 @@ class KISWebSocket:
                         self.ticker_queues[ticker].task_done()
                         continue
                 
-                # 동일 종목 동시실행 방지
-                # 티커별 매도 락 확인
-                if ticker in self.ticker_sell_locks and self.ticker_sell_locks[ticker].locked():
-                    self.logger.error(f"{ticker} 티커별 매도 락 확인 모니터링 중단")
-                    self.ticker_queues[ticker].task_done()
+                # 동일 종목 동시실행 방지: 이 종목의 매도 주문이 실행 중이면 판단 생략
+                if self.order_executor.is_busy(ticker):
                     continue
-                # 티커에 락이 없으면 생성
-                if ticker not in self.ticker_sell_locks:
-                    self.ticker_sell_locks[ticker] = asyncio.Lock()
 
                 # --- 매도 조건 확인 및 필요 시 매도 실행 ---
-                await self.ticker_sell_locks[ticker].acquire()
                 try:
-                    # 조건 체크 락이 설정되어 있지 않은 경우에만 매도 조건 확인
-                    if not self.condition_check_lock.get(ticker, False):
-                        # 1) 매도 조건만 판단 (실제 매도 실행 X)
-                        sell_signal = await self.sell_condition(
-                            recvvalue,
-                            session_id,
+                    # 1) 매도 조건만 판단 (실제 매도 실행 X)
+                    sell_signal = await self.sell_condition(
+                        quote,
+                        session_id,
+                        ticker,
+                        name,
+                        quantity,
+                        avr_price,
+                        target_date,
+                        trade_condition,
+                    )
+                    evaluated_ns = perf_counter_ns()
+                    if self.watchdog is not None and quote.received_ns:
+                        self.watchdog.record_latency(ticker, (evaluated_ns - quote.received_ns) / 1e9)
+
+                    # 2) 매도 신호가 있고, 세션이 아직 존재하면 매도 실행
+                    if sell_signal and sell_signal.get("sell_decision"):
+                        target_price = sell_signal.get("target_price")
+                        sell_reason = sell_signal.get("sell_reason", {})
+                        session_exists = sell_signal.get("session_exists", False)
+
+                        # 세션이 이미 종료된 경우 모니터링 중단
+                        if not session_exists:
+                            self.logger.info(f"{ticker} 세션이 종료되어 모니터링 중단")
+                            if ticker in self.subscribed_tickers:
+                                await self.unsubscribe_ticker(ticker)
+                            return True
+
+                        # 틱 → 주문 지연 추적 (매도 신호가 난 프레임만)
+                        trace = Trace(
                             ticker,
-                            name,
-                            quantity,
-                            avr_price,
-                            target_date,
-                            trade_condition,
+                            session_id,
+                            received=quote.received_ns,
+                            dequeued=dequeued_ns,
+                            evaluated=evaluated_ns,
                         )
 
-                        # 2) 매도 신호가 있고, 세션이 아직 존재하면 매도 실행
-                        if sell_signal and sell_signal.get("sell_decision"):
-                            # 조건 체크 락 설정
-                            self.condition_check_lock[ticker] = True
-                            target_price = sell_signal.get("target_price")
-                            sell_reason = sell_signal.get("sell_reason", {})
-                            session_exists = sell_signal.get("session_exists", False)
-
-                            # 세션이 이미 종료된 경우 모니터링 중단
-                            if not session_exists:
-                                self.logger.info(f"{ticker} 세션이 종료되어 모니터링 중단")
-                                if ticker in self.subscribed_tickers:
-                                    await self.unsubscribe_ticker(ticker)
-                                # 락 해제
-                                self.condition_check_lock[ticker] = False
-                                self.ticker_sell_locks[ticker].release()
-                                return True
-                            
-                            # 매도 실행 (비동기 처리 + 타임아웃)
-                            try:
-                                loop = asyncio.get_event_loop()
-                                sell_results = await asyncio.wait_for(
-                                    loop.run_in_executor(
-                                        None,
-                                        self._sell_order,
-                                        session_id,
-                                        ticker,
-                                        target_price,
-                                    ),
-                                    timeout=30.0,
-                                )
-                                
-                                # 매도 결과 처리
-                                if sell_results and sell_results.get("rt_cd") == "0":
-                                    # 매도 성공 시 잔고 재확인 및 세션 동기화
-                                    try:
-                                        # 잔고가 0이 될 때까지 대기 (최대 3초)
-                                        max_retries = 6  # 0.5초 간격으로 6번 시도 (총 3초)
-                                        for _ in range(max_retries):
-                                            # 잔고 확인
-                                            quantity, avr_price, closed = await self.sync_session_with_balance(
-                                                session_id, ticker, 0, 0
+                        # 매도 실행 (주문 전용 풀 + 타임아웃)
+                        try:
+                            sell_results = await self.order_executor.submit(
+                                ticker,
+                                self._sell_order,
+                                session_id,
+                                ticker,
+                                target_price,
+                                trace,
+                                timeout=30.0,
+                            )
+                            trace.mark("completed")
+                            latency_tracer.record(trace)
+                            self.logger.info(
+                                f"{ticker} 틱→주문 지연: {trace.breakdown()}",
+                                {"세션ID": session_id, "매도사유": sell_reason.get("매도사유")},
+                            )
+
+                            # 매도 결과 처리
+                            if sell_results and sell_results.get("rt_cd") == "0":
+                                # 매도 성공 시 잔고 재확인 및 세션 동기화
+                                try:
+                                    # 잔고가 0이 될 때까지 대기 (최대 3초)
+                                    max_retries = 6  # 0.5초 간격으로 6번 시도 (총 3초)
+                                    for _ in range(max_retries):
+                                        # 잔고 확인
+                                        quantity, avr_price, closed = await self.sync_session_with_balance(
+                                            session_id, ticker, 0, 0
+                                        )
+                                        if closed:
+                                            self.logger.info(
+                                                "매도 후 세션 삭제 완료",
+                                                {
+                                                    "context": {
+                                                        "종목코드": ticker,
+                                                        "세션ID": session_id,
+                                                    }
+                                                },
                                             )
-                                            if closed:
-                                                self.logger.info(
-                                                    "매도 후 세션 삭제 완료",
-                                                    {
-                                                        "context": {
-                                                            "종목코드": ticker,
-                                                            "세션ID": session_id,
-                                                        }
-                                                    },
-                                                )
-                                                break
-                                            await asyncio.sleep(0.5)  # 0.5초 대기
-                                    except Exception as e:
-                                        self.logger.error(
-                                            "매도 후 세션 동기화 실패",
-                                            {
-                                                "context": {
-                                                    "종목코드": ticker,
-                                                    "세션ID": session_id,
-                                                    "에러": str(e)
-                                                }
+                                            break
+                                        await asyncio.sleep(0.5)  # 0.5초 대기
+                                except Exception as e:
+                                    self.logger.error(
+                                        "매도 후 세션 동기화 실패",
+                                        {
+                                            "context": {
+                                                "종목코드": ticker,
+                                                "세션ID": session_id,
+                                                "에러": str(e)
                                             }
-                                        )
-                                    if ticker in self.subscribed_tickers:
-                                        await self.unsubscribe_ticker(ticker)
-                                    return True
-                            finally:
-                                # 조건 체크 락 해제 (다음 매도 조건 체크 가능하도록)
-                                self.condition_check_lock[ticker] = False
-                                self.ticker_sell_locks[ticker].release()
-                                return True
-                        else:
-                            # 매도 조건 미충족 시 티커 락만 해제
-                            self.ticker_sell_locks[ticker].release()
-                    else:
-                        # 조건 체크 락이 설정된 경우 티커 락만 해제
-                        self.ticker_sell_locks[ticker].release()
-                        
-                    # 이미 task_done()이 위에서 호출되었으므로 여기서는 호출하지 않음
+                                        }
+                                    )
+                                if ticker in self.subscribed_tickers:
+                                    await self.unsubscribe_ticker(ticker)
+                        except Exception as e:
+                            self.logger.error(
+                                f"{ticker} 매도 주문 실행 실패",
+                                {"context": {"종목코드": ticker, "세션ID": session_id, "에러": repr(e)}},
+                            )
+                        # 매도 시도 후에는 모니터링 종료 (기존 동작 유지)
+                        return True
 
                 except asyncio.TimeoutError:
                     # 타임아웃은 데이터 미수신 상태를 나타내며, 네트워크 재연결 대기
@@ -1230,85 +1351,25 @@ class KISWebSocket:
         return False
 
     def _is_market_open(self):
-        """장 운영 시간 체크"""
-        from config.condition import KRX_TRADING_START, KRX_TRADING_END
-
-        now = datetime.now()
-        market_start = now.replace(
-            hour=KRX_TRADING_START.hour, minute=KRX_TRADING_START.minute, second=0
-        )
-        market_end = now.replace(
-            hour=KRX_TRADING_END.hour, minute=KRX_TRADING_END.minute, second=0
-        )
-
-        # 주말 체크
-        if now.weekday() >= 5:  # 5: 토요일, 6: 일요일
-            return False
+        """장 운영 시간 체크 (영업일 + 장 시간, market_clock 상태)"""
+        return self.market_clock.is_open
 
-        # 장 운영 시간 체크
-        return market_start <= now <= market_end
+    def _ensure_market_clock(self):
+        """장 상태 전환 루프가 없으면 시작 (이벤트 루프당 1개)"""
+        if self.market_clock_task is None or self.market_clock_task.done():
+            self.market_clock_task = asyncio.create_task(self.market_clock.run())
 
     async def _wait_for_market_open(self, ticker):
-        """거래시간까지 대기하는 메서드"""
-        from config.condition import KRX_TRADING_START, KRX_TRADING_END
-        import asyncio
-        
-        while True:
-            now = datetime.now()
-            
-            # 주말이면 월요일까지 대기
-            if now.weekday() >= 5:  # 토요일(5), 일요일(6)
-                next_monday = now + timedelta(days=(7 - now.weekday()))
-                market_start = next_monday.replace(
-                    hour=KRX_TRADING_START.hour, 
-                    minute=KRX_TRADING_START.minute, 
-                    second=0, 
-                    microsecond=0
-                )
-                wait_seconds = (market_start - now).total_seconds()
-                self.logger.info(f"{ticker} 주말이므로 다음 월요일 장 시작({market_start.strftime('%m/%d %H:%M')})까지 대기")
-                await asyncio.sleep(min(wait_seconds, 3600))  # 최대 1시간씩 대기
-                continue
-            
-            # 장 시작 전이면 장 시작까지 대기
-            market_start = now.replace(
-                hour=KRX_TRADING_START.hour, 
-                minute=KRX_TRADING_START.minute, 
-                second=0, 
-                microsecond=0
-            )
-            market_end = now.replace(
-                hour=KRX_TRADING_END.hour, 
-                minute=KRX_TRADING_END.minute, 
-                second=0, 
-                microsecond=0
-            )
-            
-            # 장 시작 전
-            if now < market_start:
-                wait_seconds = (market_start - now).total_seconds()
-                self.logger.info(f"{ticker} 장 시작({market_start.strftime('%H:%M')})까지 {int(wait_seconds/60)}분 대기")
-                await asyncio.sleep(min(wait_seconds, 300))  # 최대 5분씩 대기
-                continue
-            
-            # 장 종료 후면 다음날까지 대기
-            elif now > market_end:
-                tomorrow = now + timedelta(days=1)
-                next_market_start = tomorrow.replace(
-                    hour=KRX_TRADING_START.hour, 
-                    minute=KRX_TRADING_START.minute, 
-                    second=0, 
-                    microsecond=0
-                )
-                wait_seconds = (next_market_start - now).total_seconds()
-                self.logger.info(f"{ticker} 장이 종료되어 다음날 장 시작({next_market_start.strftime('%m/%d %H:%M')})까지 대기")
-                await asyncio.sleep(min(wait_seconds, 3600))  # 최대 1시간씩 대기
-                continue
-            
-            # 거래시간이면 대기 종료
-            else:
-                self.logger.info(f"{ticker} 거래시간 진입, 모니터링 재개")
-                break
+        """거래시간까지 대기하는 메서드 (모든 종목이 market_clock의 장 시작 이벤트 하나를 공유)"""
+        self._ensure_market_clock()
+        market = self.market_clock
+        now = self.clock.now()
+        self.logger.info(
+            f"{ticker} {PHASE_NAMES[market.phase]} - 다음 장 시작까지 대기",
+            {"next_transition": market.next_transition(now).strftime("%m/%d %H:%M")},
+        )
+        await market.wait_open()
+        self.logger.info(f"{ticker} 거래시간 진입, 모니터링 재개")
 
     async def check_balance_async(self, ticker):
         """비동기적으로 종목의 잔고를 확인합니다.
@@ -1385,18 +1446,17 @@ class KISWebSocket:
             return self.buying_in_progress.get(ticker, False)
 
     async def ensure_websocket_connected(self):
-        """웹소켓 연결이 없으면 연결을 시도합니다."""
-        if self.websocket is None or self.websocket.closed:
+        """웹소켓 기본 연결이 없으면 연결을 시도합니다."""
+        if self.pool.primary is None or not self.pool.primary.is_open:
             for attempt in range(3):  # 최대 3번 재시도
                 try:
                     print(f"웹소켓 재연결 시도 #{attempt+1}")
-                    await self.connect_websocket()
-                    if self.websocket and not self.websocket.closed:
+                    if await self.pool.connect():
                         print(f"웹소켓 재연결 성공 (시도 #{attempt+1})")
                         return True
                 except Exception as e:
                     print(f"웹소켓 재연결 시도 #{attempt+1} 실패: {str(e)}")
-                    await asyncio.sleep(1)
+                await asyncio.sleep(1)
             print("최대 재시도 횟수 초과, 웹소켓 연결 실패")
             return False
         return True
@@ -1478,7 +1538,7 @@ class KISWebSocket:
         if actual_qty == 0:
 
             # 세션 삭제
-            await asyncio.to_thread(self.db_manager.delete_session_one_row, session_id)
+            await asyncio.to_thread(self.session_store.delete, session_id)
             self.logger.info(
                 "실잔고 0 → 세션 삭제",
                 {
@@ -1501,25 +1561,17 @@ class KISWebSocket:
         if actual_qty != current_qty or avr_price != current_avr_price:
             def _update_db():
                 try:
-                    session = self.db_manager.get_session_by_id(session_id)
-                    if session:
-                        spent_fund = actual_qty * avr_price
-                        self.db_manager.save_trading_session_upper(
-                            session_id,
-                            session.get("start_date"),
-                            datetime.now(),
-                            ticker,
-                            session.get("name"),
-                            session.get("high_price", 0),
-                            session.get("fund", 0),
-                            spent_fund,
-                            actual_qty,
-                            avr_price,
-                            session.get("count", 0),
-                        )
+                    self.session_store.update(
+                        session_id,
+                        current_date=datetime.now(),
+                        spent_fund=actual_qty * avr_price,
+                        quantity=actual_qty,
+                        avr_price=avr_price,
+                    )
                 except Exception as e:
                     print(f"[SYNC ERROR] DB 업데이트 실패: {e}")
 
+            # 저널 기록(로컬 파일 쓰기)은 루프를 막지 않도록 스레드에서 실행
             await asyncio.to_thread(_update_db)
             self.logger.info(
                 "DB 세션 ↔ 실잔고 동기화",
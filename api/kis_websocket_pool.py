@@ -0,0 +1,220 @@
+"""
+KIS 실시간 웹소켓 커넥션 풀
+
+KIS는 접속(approval key)당 실시간 등록 개수를 제한하므로, 구독을 여러 웹소켓 연결(샤드)에 분산합니다.
+- 구독은 여유가 있는 샤드 중 가장 적게 사용 중인 샤드에 배정
+- 모든 샤드가 가득 차면 WS_MAX_CONNECTIONS까지 새 샤드를 생성 (approval key 하나에 연결 하나, 키 수를 넘지 않음)
+- 재연결에 실패한 샤드의 구독은 다른 샤드로 재배치(rebalance)
+- 수신 프레임은 호출 측(KISWebSocket)이 샤드별 수신 루프에서 하나의 디스패치 경로로 합쳐서 처리
+"""
+
+import json
+import asyncio
+import websockets
+
+
+class WebSocketShard:
+    """웹소켓 연결 1개와 그 연결에 등록된 실시간 구독 목록"""
+
+    def __init__(self, index, url, approval_provider):
+        """
+        Args:
+            index (int): 샤드 번호
+            url (str): 웹소켓 접속 URL
+            approval_provider (callable): approval key를 반환하는 코루틴 함수
+        """
+        self.index = index
+        self.url = url
+        self._approval_provider = approval_provider
+        self.approval_key = None
+        self.websocket = None
+        self.is_connected = False
+        # 이 연결에 등록된 종목코드 -> 실시간 등록 건수 (피드 TR 개수)
+        self.tickers = {}
+
+    @property
+    def load(self):
+        return sum(self.tickers.values())
+
+    @property
+    def is_open(self):
+        return self.is_connected and self.websocket is not None and not self.websocket.closed
+
+    async def connect(self, timeout=10.0):
+        """웹소켓 연결 (이미 연결되어 있으면 그대로 사용)"""
+        if self.is_open:
+            return True
+
+        await self.close()
+        self.approval_key = await self._approval_provider()
+        headers = {
+            "approval_key": self.approval_key,
+            "custtype": "P",
+            "tr_type": "1",
+            "content-type": "utf-8",
+        }
+        try:
+            self.websocket = await asyncio.wait_for(
+                websockets.connect(self.url, extra_headers=headers),
+                timeout=timeout,
+            )
+            self.is_connected = True
+            print(f"[WS#{self.index}] 웹소켓 연결 성공! (ID: {id(self.websocket)})")
+            return True
+        except asyncio.TimeoutError:
+            print(f"[WS#{self.index}] 웹소켓 연결 타임아웃")
+        except Exception as e:
+            print(f"[WS#{self.index}] 웹소켓 연결 실패: {type(e).__name__} - {e}")
+        self.mark_disconnected()
+        return False
+
+    def mark_disconnected(self):
+        self.is_connected = False
+        self.websocket = None
+
+    def build_request(self, tr_id, tr_key, tr_type):
+        """실시간 등록(tr_type=1)/해제(tr_type=2) 요청 메시지 생성"""
+        return json.dumps({
+            "header": {
+                "approval_key": self.approval_key,
+                "custtype": "P",
+                "tr_type": tr_type,
+                "content-type": "utf-8",
+            },
+            "body": {
+                "input": {
+                    "tr_id": tr_id,
+                    "tr_key": tr_key,
+                }
+            },
+        })
+
+    async def send_request(self, tr_id, tr_key, tr_type):
+        """실시간 등록/해제 요청 전송. 연결이 없으면 ConnectionError"""
+        if not self.is_open:
+            raise ConnectionError(f"WS#{self.index} 연결 없음")
+        await self.websocket.send(self.build_request(tr_id, tr_key, tr_type))
+
+    async def close(self):
+        if self.websocket is not None and not self.websocket.closed:
+            try:
+                await self.websocket.close()
+            except Exception as e:
+                print(f"[WS#{self.index}] 웹소켓 종료 중 오류: {e}")
+        self.mark_disconnected()
+
+
+class KISWebSocketPool:
+    """구독을 여러 샤드에 분산하는 웹소켓 커넥션 풀"""
+
+    def __init__(self, url, approval_providers, max_per_connection, max_connections):
+        """
+        Args:
+            url (str): 웹소켓 접속 URL
+            approval_providers (list): approval key 코루틴 함수 목록. 샤드 번호 순으로 하나씩 사용
+            max_per_connection (int): 연결당 최대 구독 수
+            max_connections (int): 최대 연결 수 (서로 다른 approval key 수로 제한됨)
+        """
+        self.url = url
+        self.approval_providers = list(approval_providers)
+        self.max_per_connection = max_per_connection
+        # 등록 한도는 approval key 단위라 같은 키로 연결을 늘려도 한도가 늘지 않고, 중복 접속은 끊길 수 있음
+        self.requested_connections = max(1, max_connections)
+        self.max_connections = min(self.requested_connections, max(1, len(self.approval_providers)))
+        self.shards = []
+        # 종목코드 -> 샤드
+        self.assignments = {}
+
+    @property
+    def primary(self):
+        return self.shards[0] if self.shards else None
+
+    @property
+    def is_connected(self):
+        return any(shard.is_open for shard in self.shards)
+
+    @property
+    def capacity(self):
+        return self.max_per_connection * self.max_connections
+
+    def _new_shard(self):
+        index = len(self.shards)
+        provider = self.approval_providers[index]
+        shard = WebSocketShard(index, self.url, provider)
+        self.shards.append(shard)
+        return shard
+
+    async def connect(self):
+        """기본(첫 번째) 샤드 연결"""
+        shard = self.primary or self._new_shard()
+        return await shard.connect()
+
+    def shard_of(self, ticker):
+        return self.assignments.get(ticker)
+
+    def _pick_shard(self, registrations=1, exclude=None):
+        """여유가 있는 샤드 중 연결되어 있고 가장 적게 사용 중인 샤드를 고름"""
+        candidates = [
+            shard for shard in self.shards
+            if shard is not exclude and shard.load + registrations <= self.max_per_connection
+        ]
+        if not candidates:
+            if len(self.shards) >= self.max_connections:
+                return None
+            return self._new_shard()
+        return min(candidates, key=lambda s: (not s.is_open, s.load))
+
+    async def assign(self, ticker, registrations=1):
+        """
+        종목을 샤드에 배정하고 연결을 보장합니다.
+
+        Args:
+            ticker (str): 종목코드
+            registrations (int): 이 종목이 사용할 실시간 등록 건수 (구독하는 TR 개수)
+
+        Returns:
+            WebSocketShard or None: 배정된 샤드. 한도 초과 또는 연결 실패 시 None
+        """
+        shard = self.assignments.get(ticker)
+        if shard is None:
+            shard = self._pick_shard(registrations)
+            if shard is None:
+                print(f"[WS] 구독 한도 초과: {ticker} (최대 {self.capacity}건)")
+                return None
+        if not await shard.connect():
+            return None
+        shard.tickers[ticker] = registrations
+        self.assignments[ticker] = shard
+        return shard
+
+    def release(self, ticker):
+        """종목 배정 해제"""
+        shard = self.assignments.pop(ticker, None)
+        if shard is not None:
+            shard.tickers.pop(ticker, None)
+        return shard
+
+    def rebalance(self, dead_shard):
+        """
+        재연결에 실패한 샤드의 구독을 여유가 있는 다른 샤드로 옮깁니다.
+        옮길 곳이 없는 종목은 기존 샤드에 남겨두고 다음 재연결 때 다시 시도합니다.
+
+        Returns:
+            list: [(종목코드, 새 샤드), ...]
+        """
+        moved = []
+        for ticker, registrations in list(dead_shard.tickers.items()):
+            target = self._pick_shard(registrations, exclude=dead_shard)
+            if target is None:
+                continue
+            dead_shard.tickers.pop(ticker)
+            target.tickers[ticker] = registrations
+            self.assignments[ticker] = target
+            moved.append((ticker, target))
+        return moved
+
+    async def close(self):
+        for shard in self.shards:
+            await shard.close()
+            shard.tickers.clear()
+        self.assignments.clear()
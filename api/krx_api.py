@@ -3,24 +3,76 @@ import datetime
 import time
 from pykrx import stock
 from utils.date_utils import DateUtils
+from database.ohlcv_store import OhlcvStore
 
 
 
 class KRXApi:
-    def __init__(self):
+    def __init__(self, store: OhlcvStore = None):
         self.date_utils = DateUtils()
-        
-    def get_OHLCV(self, ticker, day_ago, upper_day_ago): 
-        time.sleep(1)
-        # 오늘 날짜
-        today = datetime.datetime.now()
+        # 일봉 로컬 저장소 (저장된 구간은 네트워크 없이 반환)
+        self.store = store or OhlcvStore()
+
+    def get_OHLCV(self, ticker, day_ago, upper_day_ago, base_date=None):
+        # 오늘 날짜 (야간 사전 선별은 다음 영업일을 기준일로 조회)
+        today = base_date or datetime.datetime.now()
         # day_ago일 전 날짜
         day_ago = day_ago + upper_day_ago
 
-        start_date = self.date_utils.get_previous_business_day(today,day_ago).strftime('%Y%m%d')
-        end_date = self.date_utils.get_previous_business_day(today,upper_day_ago).strftime('%Y%m%d')
+        start_date = self.date_utils.get_previous_business_day(today,day_ago)
+        end_date = self.date_utils.get_previous_business_day(today,upper_day_ago)
 
         # 특정 종목의 n일간 OHLCV 데이터 가져오기
-        df = stock.get_market_ohlcv(start_date, end_date, ticker)
+        return self.get_daily_bars(ticker, start_date, end_date)
+
+    def get_daily_bars(self, ticker, start_date, end_date):
+        """
+        종목 일봉 구간 조회 (저장소에 없는 날짜만 pykrx로 받아 저장)
+
+        Args:
+            ticker (str): 종목코드
+            start_date (date): 시작일
+            end_date (date): 종료일
+
+        Returns:
+            DataFrame: 날짜 인덱스, 시가/고가/저가/종가/거래량
+        """
+        today = datetime.date.today()
+        business_days = [
+            day.date() for day in self.date_utils.get_business_days(
+                datetime.datetime.combine(start_date, datetime.time()),
+                datetime.datetime.combine(end_date, datetime.time()),
+            )
+        ]
+        # 오늘 일봉은 장중에 바뀌므로 저장하지 않고 매번 조회 (장 마감 후 일괄 저장분은 그대로 사용)
+        missing = self.store.missing_dates(ticker, business_days)
+        if not missing:
+            return self.store.load(ticker, start_date, end_date)
 
+        time.sleep(1)  # pykrx 연속 조회 간격
+        fetched = stock.get_market_ohlcv(min(missing).strftime('%Y%m%d'), max(missing).strftime('%Y%m%d'), ticker)
+        self.store.save_ticker_bars(ticker, fetched, [day for day in missing if day < today])
+
+        df = self.store.load(ticker, start_date, end_date)
+        if fetched is not None and not fetched.empty:
+            live = fetched[fetched.index.date >= today]
+            if not live.empty:
+                df = pd.concat([df, live[list(df.columns)]])
         return df
+
+    def refresh_market_bars(self, day=None):
+        """
+        장 마감 후 전 종목 당일 일봉 일괄 저장 (한 번의 조회)
+
+        Args:
+            day (date): 거래일 (기본: 오늘)
+
+        Returns:
+            tuple: (저장 종목 수, 수정주가 변경으로 이력을 지운 종목 목록)
+        """
+        day = day or datetime.date.today()
+        df = stock.get_market_ohlcv(day.strftime('%Y%m%d'), market="ALL")
+        if df is None or df.empty:
+            return 0, []
+        adjusted = self.store.save_market_day(day, df)
+        return len(df), adjusted
@@ -31,6 +31,16 @@ COUNT = 6
 
 # Slippage buffer to account for possible price increase between quote and execution
 PRICE_BUFFER = 0.01  # 1% buffer added on top of quoted price when calculating buy quantity
+# 매수 후보 선별 동시 처리 스레드 수 (REST 호출은 KIS_RATE_LIMIT_* 한도를 공유)
+SCREENING_WORKERS = int(os.getenv("SCREENING_WORKERS", 8))
+# 매수 미체결 시 최대 정정 횟수 (정정마다 BUY_WAIT초 안에서 체결 대기)
+MAX_BUY_REVISIONS = 5
+# 매수 후 잔고 대조(세션 확정) 재시도: 첫 조회 대기(초)부터 2배씩 최대 대기(초)까지, 최대 조회 횟수
+SESSION_RECONCILE_MIN_DELAY = float(os.getenv("SESSION_RECONCILE_MIN_DELAY", 2.0))
+SESSION_RECONCILE_MAX_DELAY = float(os.getenv("SESSION_RECONCILE_MAX_DELAY", 60.0))
+SESSION_RECONCILE_MAX_ATTEMPTS = int(os.getenv("SESSION_RECONCILE_MAX_ATTEMPTS", 15))
+# 세션 저장소 DB 반영 주기(초) - 변경은 로컬 저널에 먼저 기록되므로 재시작해도 유실되지 않음
+SESSION_STORE_FLUSH_INTERVAL = float(os.getenv("SESSION_STORE_FLUSH_INTERVAL", 1.0))
 
 
 
@@ -66,6 +76,11 @@ GET_ULS_MINUTE = 0
 # 종목 중 선별하는 시간
 GET_SELECT_HOUR = 9
 GET_SELECT_MINUTE = 1
+# 장 마감 후 전 종목 일봉 일괄 저장 시간 (로컬 OHLCV 저장소)
+OHLCV_REFRESH_HOUR = 16
+OHLCV_REFRESH_MINUTE = 0
+# 종목 마스터 상세 정보(상장일/업종/액면가) 재조회 주기 (일)
+STOCK_MASTER_REFRESH_DAYS = int(os.getenv("STOCK_MASTER_REFRESH_DAYS", 30))
 
 # 매수 시간 1
 ORDER_HOUR_1 = 10
@@ -107,6 +122,46 @@ DAYS_LATER_UPPER = 1 #마지막 매수로부터 +1일
 #selling_point_1 이상일 때 1차 매도 - 일단 이것만 사용
 # RISK_MGMT = 0.99
 
+######################################################
+#################    REST API   #####################
+######################################################
+
+# 앱키별 초당 REST 호출 한도 (KIS 기준 실전 20건, 모의 2건 - 여유를 두고 설정)
+KIS_RATE_LIMIT_REAL = float(os.getenv("KIS_RATE_LIMIT_REAL", 18))
+KIS_RATE_LIMIT_MOCK = float(os.getenv("KIS_RATE_LIMIT_MOCK", 2))
+
+######################################################
+#################    실시간 웹소켓   ###################
+######################################################
+
+# 웹소켓 접속(approval key)당 실시간 등록 가능 개수 (KIS 기준 41건)
+WS_MAX_SUBSCRIPTIONS_PER_CONNECTION = int(os.getenv("WS_MAX_SUBSCRIPTIONS_PER_CONNECTION", 41))
+# 동시에 유지할 최대 웹소켓 연결 수 (구독이 한도를 넘으면 연결을 추가로 생성)
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", 3))
+# 웹소켓 재연결 백오프: 첫 재시도는 즉시, 이후 기본 대기(초)부터 2배씩 최대 대기(초)까지 (±50% 지터)
+WS_RECONNECT_BASE_DELAY = float(os.getenv("WS_RECONNECT_BASE_DELAY", 0.5))
+WS_RECONNECT_MAX_DELAY = float(os.getenv("WS_RECONNECT_MAX_DELAY", 30.0))
+# 실시간 시세 피드 종류: trade(체결가 H0STCNT0), orderbook(호가 H0STASP0), both(둘 다)
+REALTIME_FEED_TYPE = os.getenv("REALTIME_FEED_TYPE", "orderbook")
+# 강력 모멘텀 세션의 피드 종류 (미지정 시 REALTIME_FEED_TYPE)
+REALTIME_FEED_TYPE_STRONG_MOMENTUM = os.getenv("REALTIME_FEED_TYPE_STRONG_MOMENTUM", REALTIME_FEED_TYPE)
+# 이벤트 루프 감시: 하트비트 주기(초), 정지 판단 임계값(초), 지표 요약 로그 주기(초)
+LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() == "true"
+LOOP_WATCHDOG_INTERVAL = float(os.getenv("LOOP_WATCHDOG_INTERVAL", 0.1))
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", 0.5))
+LOOP_METRICS_LOG_INTERVAL = float(os.getenv("LOOP_METRICS_LOG_INTERVAL", 300))
+# 웹소켓 매도 신호의 주문 실행 전용 스레드 수 (서로 다른 종목의 매도를 동시에 처리)
+ORDER_EXECUTION_WORKERS = int(os.getenv("ORDER_EXECUTION_WORKERS", 4))
+# 트레일링스탑 고점 상태 일괄 저장 주기(초) - 재시작 시 이 주기만큼의 고점 갱신만 유실될 수 있음
+TRAILING_STATE_FLUSH_INTERVAL = float(os.getenv("TRAILING_STATE_FLUSH_INTERVAL", 5.0))
+# 모니터링 스레드 이벤트 루프: asyncio(기본) 또는 uvloop (미설치 시 asyncio로 대체)
+EVENT_LOOP_POLICY = os.getenv("EVENT_LOOP_POLICY", "asyncio")
+# 수신 프레임 기록 (리플레이/사후 분석용, 기본 비활성)
+TICK_RECORDER_ENABLED = os.getenv("TICK_RECORDER_ENABLED", "false").lower() == "true"
+TICK_RECORD_DIR = os.getenv("TICK_RECORD_DIR", "ticks")
+# 기록 파일 fsync 주기(초)
+TICK_RECORDER_FSYNC_INTERVAL = float(os.getenv("TICK_RECORDER_FSYNC_INTERVAL", 1.0))
+
 ######################################################
 #################    전략 조건   ######################
 ######################################################
@@ -16,6 +16,9 @@ M_APP_SECRET = os.getenv('M_APP_SECRET')
 R_ACCOUNT_NUMBER = os.getenv('R_ACCOUNT_NUMBER')
 M_ACCOUNT_NUMBER = os.getenv('M_ACCOUNT_NUMBER')
 
+# HTS ID (실시간 체결통보 구독 키)
+HTS_ID = os.getenv('HTS_ID')
+
 # API URLs
 BASE_URL = "https://openapi.koreainvestment.com:9443"
 
@@ -34,6 +37,14 @@ DB_CONFIG = {
 }
 
 
+# 웹소켓 커넥션 풀용 추가 앱키 (형식: "APP_KEY:APP_SECRET,APP_KEY:APP_SECRET")
+# 앱키별로 approval key가 발급되므로, 추가 앱키가 있으면 연결마다 다른 approval key를 사용
+WS_EXTRA_CREDENTIALS = [
+    tuple(pair.split(':', 1))
+    for pair in os.getenv('WS_EXTRA_APP_KEYS', '').split(',')
+    if ':' in pair
+]
+
 # Slack
 SLACK_TOKEN = os.getenv('SLACK_TOKEN')
 
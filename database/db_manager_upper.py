@@ -141,6 +141,43 @@ class DatabaseManager:
             ) ENGINE=InnoDB
         ''')
 
+        # 트레일링스탑 고점/트리거 가격 (재시작 시 복원용, 세션당 1행)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trailing_state (
+                session_id INT PRIMARY KEY,
+                ticker VARCHAR(20),
+                high_price INT,
+                high_ratio DECIMAL(10,6),
+                high_at DATETIME,
+                stop_price INT,
+                trail_floor INT
+            ) ENGINE=InnoDB
+        ''')
+
+        # 야간 사전 선별 결과 (선별일 기준, 전일 마감 후 확정되는 조건을 통과한 종목과 기준 고가)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS prequalified_stocks (
+                `date` DATE,
+                ticker VARCHAR(20),
+                name VARCHAR(100),
+                closing_price DECIMAL(10,2),
+                upper_rate DECIMAL(5,2),
+                last_high INT,
+                trade_condition VARCHAR(50),
+                PRIMARY KEY (`date`, ticker)
+            ) ENGINE=InnoDB
+        ''')
+
+        # 야간 사전 선별 실행 기록 (통과 종목이 0개여도 실행 여부를 구분하기 위함)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS prequalified_runs (
+                `date` DATE PRIMARY KEY,
+                candidates INT,
+                qualified INT,
+                created_at DATETIME
+            ) ENGINE=InnoDB
+        ''')
+
         self.conn.commit()
 
     def save_token(self, token_type, access_token, expires_at):
@@ -331,16 +368,22 @@ class DatabaseManager:
             
             today = datetime.now()
             days_ago = DateUtils.get_previous_business_day(today, day_ago)
-            days_ago_str = days_ago.strftime('%Y-%m-%d')
-            
+            return self.get_upper_stocks_on(days_ago)
+        except mysql.connector.Error as e:
+            logging.error("Error retrieving stocks from days ago: %s", e)
+            raise
+
+    def get_upper_stocks_on(self, upper_date):
+        """지정 날짜의 상승 종목 조회 (selected_upper_stocks는 건드리지 않음)"""
+        try:
             self.cursor.execute('''
                 SELECT ticker, name, upper_rate, closing_price 
                 FROM upper_stocks 
                 WHERE date = %s
-            ''', (days_ago_str,))
+            ''', (upper_date.strftime('%Y-%m-%d'),))
             return self.cursor.fetchall()
         except mysql.connector.Error as e:
-            logging.error("Error retrieving stocks from days ago: %s", e)
+            logging.error("Error retrieving upper stocks on %s: %s", upper_date, e)
             raise
 
     def save_selected_stocks(self, selected_upper_stocks):
@@ -475,6 +518,7 @@ class DatabaseManager:
             self._reset_cursor()
 
             self.cursor.execute('DELETE FROM trading_session_upper WHERE id = %s', (session_id,))
+            self.cursor.execute('DELETE FROM trailing_state WHERE session_id = %s', (session_id,))
             self.conn.commit()
             logging.info("Session row deleted successfully")
         except mysql.connector.Error as e:
@@ -503,6 +547,115 @@ class DatabaseManager:
             logging.error("Error getting session by ID: %s", e)
             raise
 
+    #####################################################################################
+    #                                 Trailing State                                   #
+    #####################################################################################
+
+    def save_trailing_states(self, rows):
+        """
+        트레일링스탑 상태 일괄 저장 (세션별 upsert)
+
+        Args:
+            rows: (session_id, ticker, high_price, high_ratio, high_at, stop_price, trail_floor) 목록
+        """
+        if not rows:
+            return
+        try:
+            self._reset_cursor()
+            self.cursor.executemany('''
+                INSERT INTO trailing_state (
+                    session_id, ticker, high_price, high_ratio, high_at, stop_price, trail_floor
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                high_price = VALUES(high_price),
+                high_ratio = VALUES(high_ratio),
+                high_at = VALUES(high_at),
+                stop_price = VALUES(stop_price),
+                trail_floor = VALUES(trail_floor)
+            ''', rows)
+            self.conn.commit()
+        except mysql.connector.Error as e:
+            logging.error("Error saving trailing state: %s", e)
+            self.conn.rollback()
+            raise
+
+    def load_trailing_states(self, session_ids) -> Dict[int, Dict[str, Any]]:
+        """세션 ID 목록의 트레일링스탑 상태를 한 번에 조회 (key: session_id)"""
+        session_ids = list(session_ids)
+        if not session_ids:
+            return {}
+        try:
+            self._reset_cursor()
+            placeholders = ", ".join(["%s"] * len(session_ids))
+            self.cursor.execute(
+                f'SELECT * FROM trailing_state WHERE session_id IN ({placeholders})',
+                tuple(session_ids),
+            )
+            return {row["session_id"]: row for row in self.cursor.fetchall()}
+        except mysql.connector.Error as e:
+            logging.error("Error loading trailing state: %s", e)
+            raise
+
+    def save_prequalified_stocks(self, target_date, candidates, stocks):
+        """
+        야간 사전 선별 결과 저장 (같은 선별일 결과는 교체)
+
+        Args:
+            target_date (date): 선별일 (다음 영업일)
+            candidates (int): 평가한 후보 수
+            stocks (list[dict]): 통과 종목 (ticker, name, closing_price, upper_rate, last_high, trade_condition)
+        """
+        date_str = target_date.strftime('%Y-%m-%d')
+        try:
+            self._reset_cursor()
+            self.cursor.execute('DELETE FROM prequalified_stocks WHERE date = %s', (date_str,))
+            self.cursor.executemany('''
+                INSERT INTO prequalified_stocks
+                (date, ticker, name, closing_price, upper_rate, last_high, trade_condition)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ''', [
+                (date_str, stock.get('ticker'), stock.get('name'), float(stock.get('closing_price') or 0),
+                 float(stock.get('upper_rate') or 0), int(stock.get('last_high')), stock.get('trade_condition'))
+                for stock in stocks
+            ])
+            self.cursor.execute('''
+                INSERT INTO prequalified_runs (date, candidates, qualified, created_at)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                candidates = VALUES(candidates),
+                qualified = VALUES(qualified),
+                created_at = VALUES(created_at)
+            ''', (date_str, candidates, len(stocks), datetime.now()))
+            self.conn.commit()
+        except mysql.connector.Error as e:
+            logging.error("Error saving prequalified stocks: %s", e)
+            self.conn.rollback()
+            raise
+
+    def load_prequalified_stocks(self, target_date) -> Optional[List[Dict[str, Any]]]:
+        """
+        선별일의 사전 선별 종목 조회
+
+        Returns:
+            list[dict]: 통과 종목 (사전 선별이 실행되지 않았으면 None)
+        """
+        date_str = target_date.strftime('%Y-%m-%d')
+        try:
+            self._reset_cursor()
+            self.cursor.execute('SELECT date FROM prequalified_runs WHERE date = %s', (date_str,))
+            if not self.cursor.fetchall():
+                return None
+            self.cursor.execute('''
+                SELECT ticker, name, upper_rate, closing_price, last_high, trade_condition
+                FROM prequalified_stocks
+                WHERE date = %s
+            ''', (date_str,))
+            return self.cursor.fetchall()
+        except mysql.connector.Error as e:
+            logging.error("Error loading prequalified stocks: %s", e)
+            raise
+
     #####################################################################################
     #                                  Trade History                                   #
     #####################################################################################
@@ -0,0 +1,181 @@
+"""
+일봉 OHLCV 로컬 저장소 모듈
+
+KRXApi.get_OHLCV가 매번 pykrx로 10여 거래일을 다시 긁어오지 않도록 일봉을 로컬 SQLite(config.DB_NAME)에 쌓아 둡니다.
+- daily_ohlcv: (종목, 날짜)별 시가/고가/저가/종가/거래량
+- ohlcv_fetched: 종목별로 조회를 마친 날짜 (거래정지 등으로 일봉이 없는 날도 다시 조회하지 않도록 기록)
+- ohlcv_market_days: 장 마감 후 전 종목 일괄 저장을 마친 날짜 (그날은 모든 종목이 조회 완료로 간주)
+- ohlcv_reset: 수정주가 변경으로 이력을 지운 종목과 기준일 (기준일 이전의 일괄 저장 날짜는 그 종목에 적용 안 함)
+
+종목별 조회는 pykrx 기본값인 수정주가이고 일괄 저장은 당일 한 줄이라 수정/미수정 구분이 없습니다.
+다만 액면분할 등으로 과거 수정주가가 바뀌면 저장된 이력과 당일 등락률이 맞지 않으므로,
+일괄 저장 시 이를 감지해 해당 종목의 이전 이력을 지우고 다음 조회 때 다시 받습니다.
+
+MySQL(DatabaseManager)과 달리 파일 DB라 네트워크 없이 읽히며, 선별 스레드마다 연결을 따로 엽니다.
+"""
+
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from config.config import DB_NAME
+
+
+COLUMNS = ("시가", "고가", "저가", "종가", "거래량")
+# 일괄 저장 시 (전일 저장 종가 × (1 + 등락률)) 과 당일 종가의 허용 오차 비율
+ADJUSTMENT_TOLERANCE = 0.005
+
+
+def _day(value):
+    """date/datetime/Timestamp → 'YYYYMMDD'"""
+    return value.strftime('%Y%m%d')
+
+
+class OhlcvStore:
+    """일봉 OHLCV SQLite 저장소 (스레드별 연결)"""
+
+    def __init__(self, path=DB_NAME):
+        self.path = path
+        self._create_tables()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _create_tables(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS daily_ohlcv (
+                    ticker TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    open INTEGER,
+                    high INTEGER,
+                    low INTEGER,
+                    close INTEGER,
+                    volume INTEGER,
+                    PRIMARY KEY (ticker, date)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ohlcv_fetched (
+                    ticker TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    PRIMARY KEY (ticker, date)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ohlcv_market_days (
+                    date TEXT PRIMARY KEY
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ohlcv_reset (
+                    ticker TEXT PRIMARY KEY,
+                    date TEXT NOT NULL
+                )
+            """)
+
+    def missing_dates(self, ticker, dates):
+        """
+        아직 저장되지 않은 날짜 목록
+
+        Args:
+            ticker (str): 종목코드
+            dates (list[date]): 확인할 영업일
+
+        Returns:
+            list[date]: 종목 조회 기록도, 전 종목 일괄 저장 기록도 없는 날짜
+        """
+        if not dates:
+            return []
+        keys = [_day(d) for d in dates]
+        with closing(self._connect()) as conn:
+            covered = {row[0] for row in conn.execute(
+                "SELECT date FROM ohlcv_fetched WHERE ticker = ? AND date BETWEEN ? AND ? "
+                "UNION SELECT date FROM ohlcv_market_days WHERE date BETWEEN ? AND ? "
+                "AND date >= COALESCE((SELECT date FROM ohlcv_reset WHERE ticker = ?), '')",
+                (ticker, min(keys), max(keys), min(keys), max(keys), ticker),
+            )}
+        return [d for d, key in zip(dates, keys) if key not in covered]
+
+    def save_ticker_bars(self, ticker, df, dates):
+        """
+        종목 1개의 조회 결과 저장
+
+        빈 응답은 스크래핑 실패/호출 제한일 수 있으므로 아무것도 기록하지 않아 다음 조회 때 다시 받습니다.
+        조회 완료 기록은 응답 일봉의 첫 날짜~마지막 날짜 안의 날짜만 남깁니다 (그 사이 일봉이 없는 날은 거래정지 등).
+
+        Args:
+            ticker (str): 종목코드
+            df (DataFrame): pykrx 일봉 (날짜 인덱스)
+            dates (list[date]): 이번에 조회한 날짜
+        """
+        if df is None or df.empty:
+            return
+        first, last = _day(df.index.min()), _day(df.index.max())
+        keys = {key for key in (_day(d) for d in dates) if first <= key <= last}
+        rows = []
+        for when, bar in df.iterrows():
+            key = _day(when)
+            if key in keys:
+                rows.append((ticker, key, *(int(bar[column]) for column in COLUMNS)))
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO daily_ohlcv VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT OR IGNORE INTO ohlcv_fetched VALUES (?, ?)", [(ticker, key) for key in keys])
+
+    def save_market_day(self, day, df):
+        """
+        전 종목 하루치 일봉 일괄 저장
+
+        Args:
+            day (date): 거래일
+            df (DataFrame): pykrx 전 종목 일봉 (티커 인덱스, 등락률 포함)
+
+        Returns:
+            list[str]: 수정주가 변경이 감지되어 이전 이력을 지운 종목
+        """
+        key = _day(day)
+        with closing(self._connect()) as conn, conn:
+            previous = dict(conn.execute(
+                "SELECT o.ticker, o.close FROM daily_ohlcv o "
+                "JOIN (SELECT ticker, MAX(date) AS date FROM daily_ohlcv WHERE date < ? GROUP BY ticker) p "
+                "ON o.ticker = p.ticker AND o.date = p.date",
+                (key,),
+            ))
+
+            rows = []
+            adjusted = []
+            for ticker, bar in df.iterrows():
+                values = tuple(int(bar[column]) for column in COLUMNS)
+                prev_close = previous.get(ticker)
+                close = values[3]
+                if prev_close and close and values[0] and '등락률' in bar:
+                    expected = prev_close * (1 + float(bar['등락률']) / 100)
+                    if abs(expected - close) > close * ADJUSTMENT_TOLERANCE:
+                        adjusted.append(ticker)
+                rows.append((ticker, key, *values))
+
+            for ticker in adjusted:
+                conn.execute("DELETE FROM daily_ohlcv WHERE ticker = ? AND date < ?", (ticker, key))
+                conn.execute("DELETE FROM ohlcv_fetched WHERE ticker = ? AND date < ?", (ticker, key))
+                conn.execute("INSERT OR REPLACE INTO ohlcv_reset VALUES (?, ?)", (ticker, key))
+            conn.executemany("INSERT OR REPLACE INTO daily_ohlcv VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            if rows:
+                conn.execute("INSERT OR IGNORE INTO ohlcv_market_days VALUES (?)", (key,))
+        return adjusted
+
+    def load(self, ticker, start, end):
+        """
+        저장된 일봉 구간 (pykrx get_market_ohlcv와 같은 모양: 날짜 인덱스, 시가/고가/저가/종가/거래량)
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT date, open, high, low, close, volume FROM daily_ohlcv "
+                "WHERE ticker = ? AND date BETWEEN ? AND ? ORDER BY date",
+                (ticker, _day(start), _day(end)),
+            ).fetchall()
+        df = pd.DataFrame([row[1:] for row in rows], columns=list(COLUMNS),
+                          index=pd.to_datetime([row[0] for row in rows], format='%Y%m%d'))
+        df.index.name = '날짜'
+        return df
@@ -0,0 +1,287 @@
+"""
+거래 세션 메모리 저장소 모듈
+
+진행 중인 거래 세션(trading_session_upper)의 기준 사본을 메모리 dict로 들고, TradingUpper와 KISWebSocket이 함께 사용합니다.
+- 조회(get/all)는 DB 접근 없이 메모리에서 복사본 반환 (스레드/이벤트 루프 어디서나 호출 가능)
+- 변경(save/update/delete)은 메모리에 즉시 반영하고 저널 대기열에 넣음 (호출 측은 디스크 I/O를 기다리지 않음)
+- 저장 스레드가 대기열을 로컬 SQLite(config.DB_NAME)의 session_journal에 바로 기록하고, flush_interval마다 저널을 세션별 최신 값으로 합쳐 MySQL(DatabaseManager)에 한 번의 연결로 반영 (write-behind)
+- 저널은 반영에 성공한 뒤에만 지우므로, DB 장애나 재시작 시에도 다음 반영/시작 시 이어서 저장
+
+첫 사용 시 MySQL에서 전체 세션을 읽고, 아직 반영되지 않은 저널을 덧씌웁니다.
+모듈 전역 session_store를 공유하며, 테스트/리플레이는 db_factory와 path를 바꾼 인스턴스를 씁니다.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date, datetime
+from decimal import Decimal
+
+from config.config import DB_NAME
+from config.condition import SESSION_STORE_FLUSH_INTERVAL
+from database.db_manager_upper import DatabaseManager
+
+
+FIELDS = ("id", "start_date", "current_date", "ticker", "name", "high_price", "fund",
+          "spent_fund", "quantity", "avr_price", "count", "trade_condition")
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+def _encode(value):
+    """저널 JSON 직렬화 (날짜/Decimal은 형식을 표시해 되살릴 수 있게 저장)"""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    raise TypeError(f"저널에 저장할 수 없는 값: {value!r}")
+
+
+def _decode(obj):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    if "__decimal__" in obj:
+        return Decimal(obj["__decimal__"])
+    return obj
+
+
+class SessionStore:
+    """거래 세션 메모리 저장소 + 저널 기반 지연 저장 (스레드 안전)"""
+
+    def __init__(self, db_factory=DatabaseManager, path=DB_NAME, flush_interval=SESSION_STORE_FLUSH_INTERVAL, logger=None):
+        """
+        Args:
+            db_factory: DatabaseManager 생성 함수 (로드/반영마다 별도 연결 사용)
+            path (str): 저널 SQLite 파일 경로
+            flush_interval (float): DB 반영 주기(초)
+            logger: TradingLogger (없으면 print)
+        """
+        self.db_factory = db_factory
+        self.path = path
+        self.flush_interval = flush_interval
+        self.logger = logger
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        # 저널에 기록할 변경 (session_id, op, row). 메모리 변경과 같은 락 안에서 넣어 순서를 맞춤
+        self._outbox = queue.Queue()
+        self._closed = threading.Event()
+        self._sessions = {}
+        self._loaded = False
+        self._writer = None
+        self.flushed = 0
+
+    def _log(self, level, message, context=None):
+        if self.logger:
+            getattr(self.logger, level)(message, context)
+        else:
+            print(message, context or "")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _ensure_loaded(self):
+        """첫 사용 시 MySQL 세션 로드 + 미반영 저널 적용 + 저장 스레드 시작"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with closing(self._connect()) as conn, conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS session_journal (
+                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id INTEGER NOT NULL,
+                        op TEXT NOT NULL,
+                        payload TEXT
+                    )
+                """)
+            with self.db_factory() as db:
+                rows = db.load_trading_session_upper() or []
+            self._sessions = {row["id"]: {field: row.get(field) for field in FIELDS} for row in rows}
+            for _, session_id, op, row in self._journal():
+                if op == DELETE:
+                    self._sessions.pop(session_id, None)
+                else:
+                    self._sessions[session_id] = row
+            self._loaded = True
+            self._closed.clear()
+            self._writer = threading.Thread(target=self._run, name="session-store-writer", daemon=True)
+            self._writer.start()
+
+    def _journal(self):
+        """미반영 저널 (seq, session_id, op, row) 목록"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT seq, session_id, op, payload FROM session_journal ORDER BY seq").fetchall()
+        return [(seq, session_id, op, json.loads(payload, object_hook=_decode) if payload else None)
+                for seq, session_id, op, payload in rows]
+
+    def _append(self, session_id, op, row=None):
+        """저널 대기열에 추가 (self._lock 보유 상태에서 호출, 디스크 기록은 저장 스레드가 담당)"""
+        self._outbox.put((session_id, op, row))
+
+    def _write_journal(self, first=None):
+        """
+        대기열의 변경을 한 번의 트랜잭션으로 저널에 기록
+
+        Returns:
+            int: 기록한 변경 수
+        """
+        with self._journal_lock:
+            items = [first] if first is not None else []
+            while True:
+                try:
+                    item = self._outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    items.append(item)
+            if not items:
+                return 0
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT INTO session_journal (session_id, op, payload) VALUES (?, ?, ?)",
+                    [(session_id, op, json.dumps(row, default=_encode, ensure_ascii=False) if row is not None else None)
+                     for session_id, op, row in items])
+            return len(items)
+
+    # ---------- 조회 (메모리) ----------
+    def get(self, session_id):
+        """세션 1건 복사본 (없으면 None)"""
+        self._ensure_loaded()
+        with self._lock:
+            row = self._sessions.get(session_id)
+            return dict(row) if row is not None else None
+
+    def all(self, ticker=None):
+        """세션 목록 복사본 (추가된 순서, ticker 지정 시 해당 종목만)"""
+        self._ensure_loaded()
+        with self._lock:
+            return [dict(row) for row in self._sessions.values() if ticker is None or row.get("ticker") == ticker]
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._sessions)
+
+    # ---------- 변경 (메모리 즉시 + 저널) ----------
+    def save(self, session_id, start_date, current_date, ticker, name, high_price, fund, spent_fund, quantity, avr_price, count, trade_condition=None):
+        """세션 추가/갱신 (DatabaseManager.save_trading_session_upper와 같은 인자)"""
+        if not all([session_id, ticker, name]):
+            raise ValueError("필수 파라미터가 누락되었습니다.")
+        if not isinstance(quantity, int) or quantity < 0:
+            raise ValueError(f"유효하지 않은 수량: {quantity}")
+        row = dict(zip(FIELDS, (session_id, start_date, current_date, ticker, name, high_price, fund,
+                                spent_fund, quantity, avr_price, count, trade_condition)))
+        self._ensure_loaded()
+        with self._lock:
+            self._sessions[session_id] = row
+            self._append(session_id, UPSERT, row)
+        return dict(row)
+
+    def update(self, session_id, **fields):
+        """
+        세션 일부 필드 갱신 (나머지 필드는 유지)
+
+        Returns:
+            dict: 갱신된 세션 복사본 (세션이 없으면 None)
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"알 수 없는 세션 필드: {sorted(unknown)}")
+        self._ensure_loaded()
+        with self._lock:
+            row = self._sessions.get(session_id)
+            if row is None:
+                return None
+            row = {**row, **fields}
+            self._sessions[session_id] = row
+            self._append(session_id, UPSERT, row)
+            return dict(row)
+
+    def delete(self, session_id):
+        """세션 삭제 (DB에서는 trailing_state도 함께 삭제)"""
+        self._ensure_loaded()
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._append(session_id, DELETE)
+
+    # ---------- DB 반영 ----------
+    def flush(self):
+        """
+        저널을 세션별 최신 값으로 합쳐 DB에 반영. 실패 시 저널을 남겨 다음 주기에 다시 시도
+
+        Returns:
+            int: 반영한 세션 수
+        """
+        if not self._loaded:
+            return 0
+        with self._flush_lock:
+            self._write_journal()
+            journal = self._journal()
+            if not journal:
+                return 0
+            latest = {}
+            for _, session_id, op, row in journal:
+                latest.pop(session_id, None)
+                latest[session_id] = (op, row)
+            try:
+                with self.db_factory() as db:
+                    for session_id, (op, row) in latest.items():
+                        if op == DELETE:
+                            db.delete_session_one_row(session_id)
+                        else:
+                            db.save_trading_session_upper(*(row.get(field) for field in FIELDS))
+            except Exception as e:
+                self._log("error", f"세션 저장 실패 (저널 유지 후 재시도): {e}", {"pending": len(latest)})
+                return 0
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM session_journal WHERE seq <= ?", (journal[-1][0],))
+            self.flushed += len(latest)
+            return len(latest)
+
+    @property
+    def pending(self):
+        """DB에 아직 반영되지 않은 저널 수"""
+        if not self._loaded:
+            return 0
+        self._write_journal()
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM session_journal").fetchone()[0]
+
+    def _run(self):
+        """대기열이 차면 바로 저널에 기록하고, flush_interval마다 DB에 반영"""
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._closed.is_set():
+            try:
+                item = self._outbox.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                item = None
+            try:
+                self._write_journal(item)
+                if time.monotonic() >= next_flush:
+                    self.flush()
+                    next_flush = time.monotonic() + self.flush_interval
+            except Exception as e:
+                self._log("error", f"세션 저장 스레드 오류: {e}")
+
+    def close(self):
+        """저장 스레드 중지 후 남은 저널 반영"""
+        self._closed.set()
+        # 대기 중인 저장 스레드를 깨움
+        self._outbox.put(None)
+        if self._writer is not None:
+            self._writer.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+
+# 프로세스 전역 세션 저장소 (TradingUpper/KISWebSocket 공유, 첫 사용 시 로드)
+session_store = SessionStore()
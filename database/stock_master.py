@@ -0,0 +1,166 @@
+"""
+종목 마스터(정적 기준정보) 캐시 모듈
+
+상장일/시장/종목명/업종/액면가처럼 거의 바뀌지 않는 정보를 로컬 SQLite(config.DB_NAME)에 저장하고,
+시작 시 전부 메모리 dict로 읽어 조회를 dict 접근으로 처리합니다.
+- 종목명/시장: pykrx 종목 목록으로 전 종목 일괄 갱신 (warm_listed)
+- 상장일/업종/액면가: KIS 상품기본조회(search-stock-info)로 종목당 한 번 조회 (warm_details / 캐시 미스 시)
+- 갱신 정책: 상세 정보는 STOCK_MASTER_REFRESH_DAYS일이 지나면 다시 조회 (상장일은 바뀌지 않지만 업종/액면가는 바뀔 수 있음)
+"""
+
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date, datetime, timedelta
+
+from config.config import DB_NAME
+from config.condition import STOCK_MASTER_REFRESH_DAYS
+
+
+FIELDS = ("ticker", "name", "market", "listing_date", "sector", "par_value", "updated_at")
+
+# KIS 시장ID코드 → 시장 이름
+MARKET_NAMES = {"STK": "KOSPI", "KSQ": "KOSDAQ", "KNX": "KONEX"}
+
+
+def parse_basic_stock_info(ticker, response):
+    """
+    KIS 상품기본조회 응답 → 종목 마스터 행
+
+    Returns:
+        dict: 종목 마스터 행 (output이 없으면 None)
+    """
+    output = (response or {}).get('output')
+    if not output:
+        return None
+    scts_date = (output.get('scts_mket_lstg_dt') or '').strip()
+    kosdaq_date = (output.get('kosdaq_mket_lstg_dt') or '').strip()
+    try:
+        par_value = int(float(output.get('papr') or 0))
+    except (TypeError, ValueError):
+        par_value = 0
+    return {
+        "ticker": ticker,
+        "name": (output.get('prdt_abrv_name') or '').strip(),
+        "market": MARKET_NAMES.get(output.get('mket_id_cd'), output.get('mket_id_cd') or ''),
+        # 유효한 날짜 선택 (빈 문자열이 아닌 것)
+        "listing_date": scts_date or kosdaq_date,
+        "sector": (output.get('std_idst_clsf_cd_name') or '').strip(),
+        "par_value": par_value,
+        "updated_at": date.today().strftime('%Y%m%d'),
+    }
+
+
+class StockMaster:
+    """종목 마스터 캐시 (메모리 dict + SQLite, 스레드 안전)"""
+
+    def __init__(self, path=DB_NAME, refresh_days=STOCK_MASTER_REFRESH_DAYS):
+        self.path = path
+        self.refresh_days = refresh_days
+        self._lock = threading.Lock()
+        self._create_table()
+        self._rows = self._load_all()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _create_table(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stock_master (
+                    ticker TEXT PRIMARY KEY,
+                    name TEXT,
+                    market TEXT,
+                    listing_date TEXT,
+                    sector TEXT,
+                    par_value INTEGER,
+                    updated_at TEXT
+                )
+            """)
+
+    def _load_all(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT {', '.join(FIELDS)} FROM stock_master").fetchall()
+        return {row[0]: dict(zip(FIELDS, row)) for row in rows}
+
+    def _save(self, rows):
+        if not rows:
+            return
+        with self._lock:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO stock_master ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                    [tuple(row.get(field) for field in FIELDS) for row in rows],
+                )
+            for row in rows:
+                self._rows[row["ticker"]] = dict(row)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get(self, ticker):
+        """저장된 종목 마스터 행 (네트워크 조회 없음, 없으면 None)"""
+        return self._rows.get(ticker)
+
+    def is_fresh(self, row):
+        """상세 정보(상장일 등)가 있고 갱신 주기 이내인지"""
+        if not row or not row.get("updated_at") or row.get("listing_date") is None:
+            return False
+        updated_at = datetime.strptime(row["updated_at"], '%Y%m%d').date()
+        return date.today() - updated_at < timedelta(days=self.refresh_days)
+
+    def lookup(self, ticker, kis_api):
+        """
+        종목 마스터 행 조회 (캐시 미스/만료 시에만 KIS 상품기본조회)
+
+        Args:
+            ticker (str): 종목코드
+            kis_api (KISApi): 캐시 미스 시 사용할 API (스레드별 인스턴스)
+        """
+        row = self._rows.get(ticker)
+        if self.is_fresh(row):
+            return row
+        fetched = parse_basic_stock_info(ticker, kis_api.get_basic_stock_info(ticker))
+        if fetched is None:
+            return row
+        self._save([fetched])
+        return fetched
+
+    def listing_date(self, ticker, kis_api):
+        """상장일(YYYYMMDD, 없으면 '')"""
+        row = self.lookup(ticker, kis_api)
+        return (row or {}).get("listing_date") or ''
+
+    def warm_listed(self, stock_module, markets=("KOSPI", "KOSDAQ")):
+        """
+        pykrx 종목 목록으로 전 종목 종목명/시장 일괄 갱신 (상세 정보는 유지)
+
+        Returns:
+            int: 갱신한 종목 수
+        """
+        rows = []
+        for market in markets:
+            for ticker in stock_module.get_market_ticker_list(market=market):
+                row = dict(self._rows.get(ticker) or {"ticker": ticker})
+                row["name"] = stock_module.get_market_ticker_name(ticker)
+                row["market"] = market
+                rows.append(row)
+        self._save(rows)
+        return len(rows)
+
+    def warm_details(self, tickers, kis_api):
+        """
+        지정 종목 중 상세 정보가 없거나 만료된 종목만 KIS로 조회해 저장
+
+        Returns:
+            list[str]: 새로 조회한 종목
+        """
+        refreshed = []
+        for ticker in dict.fromkeys(tickers):
+            if self.is_fresh(self._rows.get(ticker)):
+                continue
+            fetched = parse_basic_stock_info(ticker, kis_api.get_basic_stock_info(ticker))
+            if fetched is not None:
+                self._save([fetched])
+                refreshed.append(ticker)
+        return refreshed
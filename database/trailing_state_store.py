@@ -0,0 +1,86 @@
+"""
+트레일링스탑 상태 저장소
+
+세션별 고점(매도가 기준)과 트리거 가격을 trailing_state 테이블에 보관해 재시작 후에도 트레일링스탑이 이어지게 합니다.
+- 틱 경로에서는 mark()로 변경된 세션만 메모리에 표시 (DB 접근 없음)
+- flush()가 표시된 세션을 모아 한 번의 executemany로 저장 (run()이 주기적으로 호출)
+- 모니터링 시작 시 load()로 전체 세션 상태를 한 번에 조회
+"""
+
+import asyncio
+from datetime import datetime
+
+from database.db_manager_upper import DatabaseManager
+
+
+class TrailingStateStore:
+    """세션별 트레일링스탑 상태의 지연 일괄 저장소"""
+
+    def __init__(self, db_factory=DatabaseManager, flush_interval=5.0, logger=None):
+        """
+        Args:
+            db_factory: DatabaseManager 생성 함수 (저장/조회마다 별도 연결 사용)
+            flush_interval (float): 일괄 저장 주기(초)
+            logger: TradingLogger
+        """
+        self.db_factory = db_factory
+        self.flush_interval = flush_interval
+        self.logger = logger
+        # session_id -> 저장할 행
+        self._pending = {}
+        self.saved = 0
+
+    def mark(self, ticker, triggers, when=None):
+        """새 고점이 기록된 세션 표시 (틱 경로에서 호출, 같은 세션은 최신 값으로 덮어씀)"""
+        self._pending[triggers.session_id] = (
+            triggers.session_id,
+            ticker,
+            triggers.high_price,
+            round(triggers.high_price / triggers.avg_price, 6),
+            when or datetime.now(),
+            triggers.stop_price,
+            triggers.trail_floor,
+        )
+
+    def discard(self, session_id):
+        self._pending.pop(session_id, None)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def load(self, session_ids):
+        """세션 ID 목록의 저장된 상태 조회 (key: session_id, value: 행 dict)"""
+        with self.db_factory() as db:
+            return db.load_trailing_states(session_ids)
+
+    async def flush(self):
+        """표시된 세션을 한 번에 저장. 실패 시 다음 주기에 다시 시도"""
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        try:
+            await asyncio.to_thread(self._write, list(batch.values()))
+        except Exception as e:
+            # 저장 실패분은 그 사이 더 새로운 값이 없을 때만 되돌림
+            for session_id, row in batch.items():
+                self._pending.setdefault(session_id, row)
+            if self.logger is not None:
+                self.logger.error(f"트레일링스탑 상태 저장 실패: {e}")
+            return 0
+        self.saved += len(batch)
+        return len(batch)
+
+    def _write(self, rows):
+        with self.db_factory() as db:
+            db.save_trailing_states(rows)
+
+    async def run(self):
+        """주기적 일괄 저장 루프 (취소 시 남은 상태 저장 후 종료)"""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
@@ -20,14 +20,16 @@ import asyncio
 import signal, sys
 from datetime import datetime
 from trading.trading_upper import TradingUpper
+from pykrx import stock
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.executors.pool import ThreadPoolExecutor
-from config.condition import GET_ULS_HOUR, GET_ULS_MINUTE, GET_SELECT_HOUR, GET_SELECT_MINUTE, ORDER_HOUR_1, ORDER_HOUR_2, ORDER_MINUTE_1, ORDER_MINUTE_2, ORDER_HOUR_3, ORDER_MINUTE_3
+from config.condition import GET_ULS_HOUR, GET_ULS_MINUTE, GET_SELECT_HOUR, GET_SELECT_MINUTE, OHLCV_REFRESH_HOUR, OHLCV_REFRESH_MINUTE, ORDER_HOUR_1, ORDER_HOUR_2, ORDER_MINUTE_1, ORDER_MINUTE_2, ORDER_HOUR_3, ORDER_MINUTE_3
 from api.kis_websocket import KISWebSocket
 from utils.decorators import business_day_only
 from utils.slack_logger import SlackLogger
 from utils.trading_logger import TradingLogger
+from utils.event_loop import new_event_loop, loop_name
 
 class MainProcess:
     def __init__(self):
@@ -58,6 +60,18 @@ class MainProcess:
                 self.scheduler.shutdown(wait=False)
         except:
             pass
+        try:
+            # 세션 저장소의 남은 변경을 DB에 반영
+            self.trading_upper.session_store.close()
+        except Exception as e:
+            print(f"세션 저장소 종료 실패: {e}")
+        try:
+            # 틱 기록기의 남은 프레임을 기록하고 기록 스레드 종료
+            kis_websocket = self.trading_upper.kis_websocket
+            if kis_websocket is not None and kis_websocket.tick_recorder is not None:
+                kis_websocket.tick_recorder.close()
+        except Exception as e:
+            print(f"틱 기록기 종료 실패: {e}")
 
     def schedule_manager(self):
         """스케줄 작업을 관리하는 메서드"""
@@ -88,6 +102,13 @@ class MainProcess:
                 replace_existing=True
             )
 
+            self.scheduler.add_job(
+                self.refresh_market_bars,
+                CronTrigger(hour=OHLCV_REFRESH_HOUR, minute=OHLCV_REFRESH_MINUTE),
+                id='refresh_ohlcv',
+                replace_existing=True
+            )
+
             self.scheduler.add_job(
                 self.execute_buy_task,
                 CronTrigger(hour=ORDER_HOUR_1, minute=ORDER_MINUTE_1),
@@ -135,6 +156,11 @@ class MainProcess:
             self.trading_upper.fetch_and_save_previous_upper_stocks()
         except Exception as e:
             print('오류가 발생했습니다. error: ', e)
+        try:
+            # 다음 영업일 선별 대상의 정적 조건 사전 평가 (실패 시 아침 선별이 전체 조건으로 진행)
+            self.trading_upper.precompute_screening()
+        except Exception as e:
+            print('사전 선별 오류가 발생했습니다. error: ', e)
 
     @business_day_only()
     def select_stocks_to_buy(self):
@@ -143,20 +169,28 @@ class MainProcess:
         except Exception as e:
             print('오류가 발생했습니다. error: ', e)
 
+    @business_day_only()
+    def refresh_market_bars(self):
+        """장 마감 후 전 종목 당일 일봉 및 종목 마스터(종목명/시장)를 로컬 저장소에 일괄 저장"""
+        try:
+            count, adjusted = self.trading_upper.krx_api.refresh_market_bars()
+            self.logger.info(f"전 종목 일봉 저장: {count}종목", {"수정주가 재조회 대상": adjusted})
+            listed = self.trading_upper.stock_master.warm_listed(stock)
+            self.logger.info(f"종목 마스터 종목명/시장 갱신: {listed}종목")
+        except Exception as e:
+            print('오류가 발생했습니다. error: ', e)
+
     @business_day_only()
     def execute_buy_task(self):
         """매수 태스크 실행"""
         try:
             # trading = TradingLogic()
             # 선별 종목 매수
+            # 슬롯별 주문은 동시에 진행되고, 세션 정보는 각 주문이 끝나는 즉시 저장됨
             with self.db_lock:
                 order_list = self.trading_upper.start_trading_session()
             
-            if order_list is not None:
-                # 매수 정보 세션에 저장
-                with self.db_lock:
-                    self.trading_upper.load_and_update_trading_session(order_list)
-            else:
+            if order_list is None:
                 self.logger.info("선별 종목이 없어 매수 태스크 종료")
         except Exception as e:
             print(f"매수 태스크 실행 에러: {str(e)}")
@@ -167,8 +201,9 @@ class MainProcess:
 
     @business_day_only()
     def run_monitoring(self):
-        """새로운 이벤트 루프를 생성하여 모니터링 실행"""
-        loop = asyncio.new_event_loop()
+        """새로운 이벤트 루프를 생성하여 모니터링 실행 (EVENT_LOOP_POLICY에 따라 uvloop 사용)"""
+        loop = new_event_loop()
+        print(f"모니터링 이벤트 루프: {loop_name(loop)}")
         self.monitor_loop = loop
         # TradingUpper에서도 동일 루프를 참조할 수 있도록 공유
         self.trading_upper._monitor_loop = loop
@@ -176,7 +211,7 @@ class MainProcess:
         
         try:    
             # trading = TradingLogic()
-            kis_websocket = KISWebSocket(self.trading_upper.sell_order)
+            kis_websocket = KISWebSocket(self.trading_upper.sell_order, session_store=self.trading_upper.session_store)
             self.trading_upper.kis_websocket = kis_websocket  # KISWebSocket 인스턴스 설정
             sessions_info = self.trading_upper.get_session_info_upper()
 
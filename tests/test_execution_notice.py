@@ -0,0 +1,87 @@
+import base64
+import threading
+import time
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+from api.kis_execution_notice import (
+    ExecutionNoticeHub, decrypt_notice, parse_execution_notice,
+)
+
+KEY = "a" * 32
+IV = "b" * 16
+
+
+def _notice_text(order_no, original_order_no, filled_qty, price, fill_yn, order_qty, rejected="N"):
+    fields = [""] * 20
+    fields[2] = order_no
+    fields[3] = original_order_no
+    fields[4] = "02"
+    fields[8] = "005930"
+    fields[9] = str(filled_qty)
+    fields[10] = str(price)
+    fields[11] = "093001"
+    fields[12] = rejected
+    fields[13] = fill_yn
+    fields[16] = str(order_qty)
+    return "^".join(fields)
+
+
+def test_decrypt_and_parse_notice():
+    plain = _notice_text("0000012345", "", 3, 70000, "2", 10)
+    cipher = AES.new(KEY.encode(), AES.MODE_CBC, IV.encode())
+    encrypted = base64.b64encode(cipher.encrypt(pad(plain.encode(), AES.block_size))).decode()
+
+    notice = parse_execution_notice(decrypt_notice(encrypted, KEY, IV))
+    assert notice.order_no == "12345"
+    assert notice.side == "buy"
+    assert notice.is_fill and notice.filled_qty == 3 and notice.filled_price == 70000
+
+
+def test_hub_aggregates_revised_fills():
+    hub = ExecutionNoticeHub()
+    hub.set_streaming(True)
+    hub.publish(parse_execution_notice(_notice_text("100", "", 0, 0, "1", 10)))
+    hub.publish(parse_execution_notice(_notice_text("100", "", 4, 1000, "2", 10)))
+    hub.register_revision("100", "0000000101")
+    hub.publish(parse_execution_notice(_notice_text("101", "100", 6, 1010, "2", 6)))
+
+    summary = hub.get_fills("100")
+    assert summary.filled_qty == 10
+    assert summary.filled_amount == 4 * 1000 + 6 * 1010
+    assert summary.order_qty == 10
+
+
+def test_wait_for_fill_wakes_on_notice_and_falls_back_without_stream():
+    hub = ExecutionNoticeHub()
+    assert hub.wait_for_fill("200", 5, timeout=0.01) is None
+
+    hub.set_streaming(True)
+    timer = threading.Timer(0.05, lambda: hub.publish(
+        parse_execution_notice(_notice_text("200", "", 5, 500, "2", 5))))
+    timer.start()
+    started = time.monotonic()
+    summary = hub.wait_for_fill("200", 5, timeout=5)
+    assert summary.filled_qty == 5
+    assert time.monotonic() - started < 1
+
+
+def test_notice_ack_enables_streaming_only_on_notice_connection():
+    import json
+    from api.kis_execution_notice import execution_hub
+    from api.kis_websocket import KISWebSocket
+
+    ws = KISWebSocket(db_manager=object(), kis_api=object())
+    ws.notice_shard = notice_shard = object()
+    ack = json.dumps({"header": {"tr_id": ws.notice_tr_id},
+                      "body": {"msg1": "SUBSCRIBE SUCCESS", "output": {"key": KEY, "iv": IV}}})
+    try:
+        execution_hub.set_streaming(False)
+        ws._handle_subscribe_response(ack, shard=ws.pool.primary)
+        assert not execution_hub.is_streaming and ws.notice_key == KEY
+
+        ws._handle_subscribe_response(ack, shard=notice_shard)
+        assert execution_hub.is_streaming
+    finally:
+        execution_hub.set_streaming(False)
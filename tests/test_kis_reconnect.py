@@ -0,0 +1,37 @@
+import time
+
+from api.kis_reconnect import ReconnectBackoff, GapTracker
+
+
+def test_backoff_is_immediate_then_grows_with_jitter_up_to_max():
+    backoff = ReconnectBackoff(base_delay=1.0, max_delay=4.0, jitter=0.5)
+
+    delays = [backoff.next_delay() for _ in range(6)]
+    assert delays[0] == 0.0
+    for delay, base in zip(delays[1:], [1.0, 2.0, 4.0, 4.0, 4.0]):
+        assert base * 0.5 <= delay <= base * 1.5
+    assert backoff.attempts == 6
+
+    backoff.reset()
+    assert backoff.next_delay() == 0.0 and backoff.next_delay() > 0
+
+
+def test_gap_tracker_measures_gap_until_first_quote():
+    tracker = GapTracker()
+    tracker.begin(["005930", "000660"])
+    time.sleep(0.02)
+    # 이미 진행 중인 공백은 시작 시각 유지
+    tracker.begin(["005930"])
+    assert tracker.is_open("005930")
+
+    duration = tracker.end("005930")
+    assert duration >= 0.02 and not tracker.is_open("005930")
+    assert tracker.end("005930") is None
+
+    tracker.discard("000660")
+    snapshot = tracker.snapshot()
+    assert list(snapshot) == ["005930"] and snapshot["005930"]["count"] == 1
+    assert "ongoing" not in snapshot["005930"]
+
+    tracker.begin(["035720"])
+    assert "ongoing" in tracker.snapshot()["035720"]
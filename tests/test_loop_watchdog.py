@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+from utils.loop_watchdog import LoopWatchdog
+
+
+class _Logger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message, context=None):
+        self.warnings.append((message, context))
+
+    def info(self, message, context=None):
+        pass
+
+
+def _blocking_callback():
+    time.sleep(0.3)
+
+
+def test_blocking_callback_is_reported_with_its_lag():
+    async def main():
+        logger = _Logger()
+        watchdog = LoopWatchdog(logger, interval=0.02, stall_threshold=0.15)
+        watchdog.start()
+        await asyncio.sleep(0.05)
+
+        asyncio.get_running_loop().call_soon(_blocking_callback)
+        await asyncio.sleep(0.1)
+        watchdog.stop()
+        return watchdog, logger
+
+    watchdog, logger = asyncio.run(main())
+
+    assert watchdog.stall_count == 1 and len(logger.warnings) == 1
+    stall = watchdog.slowest[0]
+    assert 0.2 <= stall.duration < 0.5
+    # 감시 스레드가 정지 중 루프 스레드 스택을 캡처
+    assert stall.task == "(태스크 외 콜백)" and "_blocking_callback" in stall.stack
+    assert watchdog.snapshot()["lag_max_ms"] >= 200
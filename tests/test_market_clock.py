@@ -0,0 +1,37 @@
+import asyncio
+from datetime import date, datetime
+
+from utils.clock import SimulatedClock
+from utils.market_clock import MarketClock, PRE_OPEN, OPEN, EXPIRY_WINDOW, CLOSED
+
+HOLIDAY = date(2025, 6, 3)  # 화요일 휴장
+
+
+def _market(start):
+    return MarketClock(SimulatedClock(start), is_business_day=lambda d: d.weekday() < 5 and d != HOLIDAY)
+
+
+def test_phases_and_next_transition_skip_holidays():
+    market = _market(datetime(2025, 6, 2, 8, 0))
+    assert market.phase == PRE_OPEN
+    assert market.phase_at(datetime(2025, 6, 2, 9, 0)) == OPEN
+    assert market.phase_at(datetime(2025, 6, 2, 15, 10)) == EXPIRY_WINDOW
+    assert market.phase_at(datetime(2025, 6, 2, 15, 20)) == EXPIRY_WINDOW
+    assert market.phase_at(datetime(2025, 6, 2, 15, 20, 1)) == CLOSED
+    assert market.phase_at(datetime(2025, 6, 3, 10, 0)) == CLOSED
+    assert market.next_transition(datetime(2025, 6, 2, 16, 0)) == datetime(2025, 6, 4, 9, 0)
+
+
+def test_all_waiters_share_one_open_event():
+    async def main():
+        market = _market(datetime(2025, 6, 3, 10, 0))
+        runner = asyncio.create_task(market.run())
+        waiters = [asyncio.create_task(market.wait_open()) for _ in range(50)]
+        await asyncio.sleep(0)
+        assert market.clock.waiting == 1  # 종목 수와 무관하게 타이머 1개
+        market.clock.set(datetime(2025, 6, 4, 9, 0))
+        await asyncio.wait_for(asyncio.gather(*waiters), 1)
+        assert market.is_open
+        runner.cancel()
+
+    asyncio.run(main())
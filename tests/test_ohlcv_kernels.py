@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from trading.ohlcv_kernels import high_history_ok, screen_ohlcv, strong_momentum
+
+
+def _legacy_high_history(df):
+    filtered_df = df.iloc[:-2]
+    diffs = [
+        (filtered_df.iloc[i + 1]['고가'] - filtered_df.iloc[i]['종가']) / filtered_df.iloc[i]['종가'] * 100
+        for i in range(len(filtered_df) - 1)
+    ]
+    return not any(d >= 20 for d in diffs)
+
+
+def _frame(rng, days):
+    close = rng.integers(1000, 2000, size=days).astype(float)
+    high = close * rng.uniform(1.0, 1.5, size=days)
+    return pd.DataFrame({'종가': close, '고가': high})
+
+
+def test_stacked_universe_matches_per_ticker_loop():
+    rng = np.random.default_rng(7)
+    frames = {f"{i:06d}": _frame(rng, days) for i, days in enumerate([12, 12, 9, 5, 3, 2])}
+    screened = screen_ohlcv(frames)
+
+    for ticker, df in frames.items():
+        assert screened[ticker]["high_history"] == _legacy_high_history(df)
+        assert screened[ticker]["high_history"] == bool(high_history_ok(df['종가'], df['고가']))
+        if len(df) >= 3:
+            close = df['종가']
+            legacy = (close.iloc[-2] - close.iloc[-3]) / close.iloc[-3] >= 0.10
+            assert screened[ticker]["strong_momentum"] == legacy == bool(strong_momentum(close))
+        else:
+            assert screened[ticker]["strong_momentum"] is False
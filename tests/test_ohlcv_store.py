@@ -0,0 +1,74 @@
+from datetime import date
+
+import pandas as pd
+
+import api.krx_api as krx_module
+from api.krx_api import KRXApi
+from database.ohlcv_store import OhlcvStore
+
+
+class _FakeStock:
+    def __init__(self):
+        self.calls = []
+
+    def get_market_ohlcv(self, start, end=None, ticker=None, market=None):
+        self.calls.append((start, end, ticker, market))
+        if market == "ALL":
+            return pd.DataFrame({"시가": [50], "고가": [52], "저가": [49], "종가": [51], "거래량": [9], "등락률": [2.0]},
+                                index=pd.Index(["000001"], name="티커"))
+        days = pd.bdate_range(start, end)
+        base = 100 if ticker == "000001" else 200
+        return pd.DataFrame({"시가": base, "고가": base + 2, "저가": base - 1, "종가": base + 1, "거래량": 10},
+                            index=pd.DatetimeIndex(days, name="날짜"))
+
+
+def test_fetches_only_missing_dates_then_serves_from_store(tmp_path, monkeypatch):
+    fake = _FakeStock()
+    monkeypatch.setattr(krx_module, "stock", fake)
+    monkeypatch.setattr(krx_module.time, "sleep", lambda _: None)
+    api = KRXApi(OhlcvStore(str(tmp_path / "ohlcv.db")))
+
+    first = api.get_daily_bars("000001", date(2025, 6, 9), date(2025, 6, 13))
+    assert len(first) == 5 and first['종가'].tolist() == [101] * 5
+    assert fake.calls == [("20250609", "20250613", "000001", None)]
+
+    # 저장된 구간은 네트워크 없이, 뒤로 늘어난 구간은 빠진 날짜만 조회
+    assert api.get_daily_bars("000001", date(2025, 6, 10), date(2025, 6, 12)).equals(first.iloc[1:4])
+    api.get_daily_bars("000001", date(2025, 6, 9), date(2025, 6, 17))
+    assert fake.calls[1:] == [("20250616", "20250617", "000001", None)]
+
+    # 장 마감 후 일괄 저장한 날은 종목별 조회 없이 반환. 종가가 등락률과 맞지 않으면(분할) 이전 이력 삭제
+    assert api.refresh_market_bars(date(2025, 6, 18)) == (1, ["000001"])
+    bars = api.get_daily_bars("000001", date(2025, 6, 18), date(2025, 6, 18))
+    assert bars['종가'].tolist() == [51] and len(fake.calls) == 3
+    api.get_daily_bars("000001", date(2025, 6, 9), date(2025, 6, 18))
+    assert fake.calls[3] == ("20250609", "20250617", "000001", None)
+
+
+def test_empty_response_is_not_recorded_as_fetched(tmp_path, monkeypatch):
+    responses = [pd.DataFrame(), None]
+
+    class _FlakyStock(_FakeStock):
+        def get_market_ohlcv(self, start, end=None, ticker=None, market=None):
+            self.calls.append((start, end, ticker, market))
+            if responses:
+                return responses.pop(0)
+            # 첫날은 거래정지로 일봉 없음
+            days = pd.bdate_range("20250610", end)
+            return pd.DataFrame({"시가": 100, "고가": 102, "저가": 99, "종가": 101, "거래량": 10},
+                                index=pd.DatetimeIndex(days, name="날짜"))
+
+    fake = _FlakyStock()
+    monkeypatch.setattr(krx_module, "stock", fake)
+    monkeypatch.setattr(krx_module.time, "sleep", lambda _: None)
+    api = KRXApi(OhlcvStore(str(tmp_path / "ohlcv.db")))
+
+    # 빈 응답/None은 조회 완료로 기록하지 않아 다음 조회에서 다시 받음
+    assert api.get_daily_bars("000001", date(2025, 6, 9), date(2025, 6, 13)).empty
+    assert api.get_daily_bars("000001", date(2025, 6, 9), date(2025, 6, 13)).empty
+    bars = api.get_daily_bars("000001", date(2025, 6, 9), date(2025, 6, 13))
+    assert len(bars) == 4 and len(fake.calls) == 3
+
+    # 응답 범위 밖(첫 일봉 이전)의 날짜만 다시 조회
+    api.get_daily_bars("000001", date(2025, 6, 9), date(2025, 6, 13))
+    assert fake.calls[3] == ("20250609", "20250609", "000001", None)
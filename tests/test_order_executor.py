@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+
+from utils.order_executor import OrderExecutor
+
+
+def test_different_tickers_sell_concurrently():
+    executor = OrderExecutor(max_workers=2)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def sell(ticker):
+        barrier.wait()  # 두 주문이 동시에 실행되지 않으면 타임아웃
+        return {"rt_cd": "0", "ticker": ticker}
+
+    async def main():
+        return await asyncio.gather(
+            executor.submit("005930", sell, "005930", timeout=5),
+            executor.submit("000660", sell, "000660", timeout=5),
+        )
+
+    results = asyncio.run(main())
+    assert [r["ticker"] for r in results] == ["005930", "000660"]
+    snapshot = executor.snapshot()
+    assert snapshot["completed"] == 2 and snapshot["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_same_ticker_is_exclusive_until_worker_finishes():
+    executor = OrderExecutor(max_workers=2)
+    release = threading.Event()
+
+    def slow_sell():
+        release.wait(2)
+        return {"rt_cd": "0"}
+
+    async def main():
+        first = asyncio.create_task(executor.submit("005930", slow_sell, timeout=5))
+        await asyncio.sleep(0.05)
+        assert executor.is_busy("005930")
+        assert await executor.submit("005930", slow_sell) is None
+        release.set()
+        return await first
+
+    assert asyncio.run(main()) == {"rt_cd": "0"}
+    time.sleep(0.05)
+    assert not executor.is_busy("005930")
+    executor.shutdown()
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from api.kis_execution_notice import ExecutionNoticeHub, ExecutionNotice
+from trading.order_manager import OrderManager, FILLED, PARTIAL, REVISED
+
+
+class _FakeKIS:
+    def __init__(self, fills=None):
+        self.fills = fills or {}  # 주문번호 -> 조회마다 반환할 누적 체결 수량 목록
+        self.next_no = 100
+
+    def place_order(self, ticker, quantity, order_type=None, price=None):
+        self.next_no += 1
+        return {"rt_cd": "0", "msg1": "주문 전송 완료", "output": {"ODNO": f"{self.next_no:010d}"}}
+
+    def revise_order(self, order_num, quantity, order_price):
+        self.next_no += 1
+        return {"rt_cd": "0", "msg1": "정정 완료", "output": {"ODNO": f"{self.next_no:010d}"}}
+
+    def daily_order_execution_inquiry(self, order_num):
+        seq = self.fills.get(order_num, [0])
+        qty = seq.pop(0) if len(seq) > 1 else seq[0]
+        return {"output1": [{"ord_qty": "10", "tot_ccld_qty": str(qty), "avg_prvs": "1000"}]}
+
+
+def _notice(order_no, original, qty, price):
+    return ExecutionNotice(order_no, original, "005930", "buy", qty, price, 10, True, False, "093001")
+
+
+def test_fill_events_wake_waiter_across_revision():
+    hub = ExecutionNoticeHub()
+    hub.set_streaming(True)
+    kis = _FakeKIS()
+    manager = OrderManager(hub=hub, api_factory=lambda: kis)
+
+    order = manager.submit("005930", 10, price=1000)
+    hub.publish(_notice("101", "", 4, 1000))
+    assert order.state == PARTIAL and order.unfilled == 6
+
+    assert manager.revise(order, 1010) and order.state == REVISED
+    threading.Timer(0.05, lambda: hub.publish(_notice("102", "101", 6, 1010))).start()
+    started = time.monotonic()
+    manager.wait(order, timeout=5)
+    assert order.state == FILLED and time.monotonic() - started < 1
+    assert order.avg_price == (4 * 1000 + 6 * 1010) // 10
+    manager.finish(order)
+    assert manager.snapshot()["in_flight"] == 0
+
+
+def test_polls_with_growing_interval_when_stream_is_down():
+    kis = _FakeKIS({"0000000101": [0, 3, 10]})
+    manager = OrderManager(hub=ExecutionNoticeHub(), api_factory=lambda: kis, poll_min=0.01, poll_max=0.02)
+
+    order = manager.submit("005930", 10, price=1000)
+    manager.wait(order, timeout=2)
+    assert order.state == FILLED and order.filled_qty == 10
+    assert [state for state, _ in order.history] == ["submitted", "partial", "filled"]
+
+
+def test_rest_poll_catches_fills_missed_by_stream():
+    hub = ExecutionNoticeHub()
+    hub.set_streaming(True)
+
+    # 통보 없이 타임아웃되어도 반환 전 1회 REST 조회
+    kis = _FakeKIS({"0000000101": [10]})
+    manager = OrderManager(hub=hub, api_factory=lambda: kis, stream_poll=60)
+    order = manager.submit("005930", 10, price=1000)
+    manager.wait(order, timeout=0.05)
+    assert order.state == FILLED
+
+    # 스트림이 살아 있는 동안에도 stream_poll 간격으로 REST 조회
+    kis = _FakeKIS({"0000000101": [0, 0, 10]})
+    manager = OrderManager(hub=hub, api_factory=lambda: kis, stream_poll=0.02)
+    order = manager.submit("005930", 10, price=1000)
+    started = time.monotonic()
+    manager.wait(order, timeout=5)
+    assert order.state == FILLED and time.monotonic() - started < 1
@@ -0,0 +1,26 @@
+import threading
+import time
+
+from utils.rate_limiter import RateLimiter
+
+
+def test_threads_share_one_budget():
+    limiter = RateLimiter(rate=50)
+    stamps = []
+    lock = threading.Lock()
+
+    def call():
+        limiter.acquire()
+        with lock:
+            stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(10)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 첫 호출은 즉시, 나머지 9건은 1/50초 간격으로 허용
+    assert time.monotonic() - started >= 9 / 50 * 0.9
+    assert limiter.waited > 0
@@ -0,0 +1,95 @@
+import asyncio
+
+from api.kis_realtime_feed import TR_ORDERBOOK, TR_TRADE, parse_frame, tr_ids_for
+from api.kis_websocket import KISWebSocket
+from api.kis_websocket_pool import KISWebSocketPool
+
+
+def _trade_record(ticker, price, volume):
+    fields = ["0"] * 46
+    fields[0] = ticker
+    fields[1] = "093000"
+    fields[2] = str(price)
+    fields[10] = str(price + 10)
+    fields[11] = str(price)
+    fields[12] = str(volume)
+    fields[13] = "1000"
+    return fields
+
+
+def test_parse_trade_frame_with_multiple_records():
+    records = _trade_record("005930", 70000, 3) + _trade_record("005930", 70100, 5)
+    quotes = parse_frame(f"0|{TR_TRADE}|002|" + "^".join(records))
+
+    assert [q.last_price for q in quotes] == [70000, 70100]
+    assert quotes[1].volume == 5 and quotes[1].ask == 70110
+
+
+def test_parse_orderbook_frame_uses_best_bid():
+    fields = ["0"] * 59
+    fields[0] = "000660"
+    fields[3] = "120500"
+    fields[13] = "120000"
+    quote = parse_frame(f"0|{TR_ORDERBOOK}|001|" + "^".join(fields))[0]
+
+    assert quote.ticker == "000660"
+    assert quote.last_price == quote.bid == 120000
+    assert quote.ask == 120500
+
+
+def test_unknown_tr_is_ignored():
+    assert parse_frame("0|H0STXXX0|001|005930^1") == []
+
+
+def test_pool_counts_registrations_per_feed():
+    async def provider():
+        return "key"
+
+    pool = KISWebSocketPool("ws://localhost", [provider], max_per_connection=3, max_connections=1)
+    first = pool._pick_shard(len(tr_ids_for("both")))
+    first.tickers["005930"] = 2
+
+    assert first.load == 2
+    assert pool._pick_shard(2) is None
+    assert pool._pick_shard(1) is first
+
+
+def test_pool_opens_one_connection_per_approval_key():
+    async def provider():
+        return "key"
+
+    pool = KISWebSocketPool("ws://localhost", [provider], max_per_connection=2, max_connections=3)
+    assert pool.max_connections == 1 and pool.capacity == 2
+    pool._pick_shard().tickers["005930"] = 2
+    assert pool._pick_shard() is None and len(pool.shards) == 1
+
+    pool = KISWebSocketPool("ws://localhost", [provider, provider], max_per_connection=2, max_connections=3)
+    assert pool.max_connections == 2
+
+
+class _Frame(bytes):
+    def decode(self, *args):
+        _Frame.decoded += 1
+        return bytes.decode(self, *args)
+
+
+_Frame.decoded = 0
+
+
+def test_bytes_frames_are_routed_without_decoding_unsubscribed_tickers():
+    async def main():
+        ws = KISWebSocket(db_manager=object(), kis_api=object())
+        ws.subscribed_tickers.add("005930")
+        ws.ticker_queues["005930"] = asyncio.Queue()
+        ws._refresh_routes()
+
+        await ws._dispatch_frame(None, _Frame(f"0|{TR_TRADE}|001|".encode() + "^".join(_trade_record("000660", 1, 1)).encode()))
+        assert _Frame.decoded == 0
+
+        await ws._dispatch_frame(None, _Frame(f"0|{TR_TRADE}|001|".encode() + "^".join(_trade_record("005930", 70000, 1)).encode()))
+        await ws._dispatch_frame(None, f"0|{TR_TRADE}|001|" + "^".join(_trade_record("005930", 70100, 1)))
+        queue = ws.ticker_queues["005930"]
+        assert _Frame.decoded == 1 and queue.qsize() == 2
+        assert [queue.get_nowait().last_price for _ in range(2)] == [70000, 70100]
+
+    asyncio.run(main())
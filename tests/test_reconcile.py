@@ -0,0 +1,91 @@
+import asyncio
+
+from api.kis_websocket import KISWebSocket
+
+
+class _Shard:
+    index = 0
+    is_open = True
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_request(self, tr_id, tr_key, tr_type):
+        self.sent.append((tr_id, tr_key, tr_type))
+
+    def mark_disconnected(self):
+        self.is_open = False
+
+
+class _Pool:
+    capacity = 41
+
+    def __init__(self):
+        self.shard = _Shard()
+        self.assignments = {}
+
+    async def assign(self, ticker, registrations=1):
+        self.assignments[ticker] = registrations
+        return self.shard
+
+    def release(self, ticker):
+        return self.shard if self.assignments.pop(ticker, None) else None
+
+
+class _Sessions:
+    def __init__(self, *sessions):
+        self.sessions = list(sessions)
+
+    def all(self, ticker=None):
+        return [dict(s) for s in self.sessions if ticker is None or s["ticker"] == ticker]
+
+
+def _ws(session_store=None):
+    ws = KISWebSocket(db_manager=object(), kis_api=object(), session_store=session_store or _Sessions())
+    ws.pool = _Pool()
+    ws._ensure_receiver = lambda shard: None
+    return ws
+
+
+def test_reconcile_sends_only_the_diff_and_is_idempotent():
+    async def main():
+        ws = _ws()
+        sent = ws.pool.shard.sent
+
+        first = await ws.reconcile({"005930", "000660"}, {"005930": "orderbook", "000660": "trade"})
+        assert sorted(first["added"]) == ["000660", "005930"]
+        assert sorted(sent) == [("H0STASP0", "005930", "1"), ("H0STCNT0", "000660", "1")]
+
+        sent.clear()
+        assert await ws.reconcile({"005930", "000660"}) == {"added": [], "removed": [], "failed": []}
+        assert sent == []
+
+        result = await ws.reconcile({"005930", "035420"})
+        assert result["removed"] == ["000660"] and result["added"] == ["035420"]
+        assert sorted(sent) == [("H0STASP0", "035420", "1"), ("H0STCNT0", "000660", "2")]
+        assert ws.subscribed_tickers == {"005930", "035420"}
+        assert set(ws.pool.assignments) == {"005930", "035420"}
+
+    asyncio.run(main())
+
+
+def test_session_set_drives_subscriptions_and_removals():
+    async def main():
+        sessions = _Sessions({"id": 1, "ticker": "005930", "trade_condition": "normal"},
+                             {"id": 2, "ticker": "000660", "trade_condition": "normal"})
+        ws = _ws(sessions)
+
+        result = await ws.reconcile()
+        assert sorted(result["added"]) == ["000660", "005930"]
+
+        # 종료된 세션은 다음 조정에서 해제
+        sessions.sessions.pop()
+        assert (await ws.reconcile())["removed"] == ["000660"]
+
+        # 세션이 남아 있어도 모니터링을 끝낸 종목은 다시 구독하지 않음
+        await ws.unsubscribe_ticker("005930")
+        assert ws.subscribed_tickers == set()
+        assert await ws.reconcile() == {"added": [], "removed": [], "failed": []}
+        assert await ws.subscribe_ticker("005930") and ws.subscribed_tickers == {"005930"}
+
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+from trading.screening_pipeline import ScreeningPipeline, Source, Stage, COST_CACHED, COST_HISTORY, COST_LIVE
+
+
+def _pipeline(calls):
+    def loader(name):
+        def load(stock):
+            calls.append((stock["ticker"], name))
+            return stock[name]
+        return load
+
+    sources = [
+        Source("quote", COST_LIVE, loader("quote")),
+        Source("ohlcv", COST_HISTORY, loader("ohlcv")),
+        Source("listing", COST_CACHED, loader("listing")),
+    ]
+    stages = [
+        Stage("price", lambda ctx: ctx["quote"] > 0, needs=("quote",)),
+        Stage("decline", lambda ctx: ctx["quote"] > ctx["ohlcv"], needs=("ohlcv", "quote")),
+        Stage("history", lambda ctx: ctx["ohlcv"] > 0, needs=("ohlcv",)),
+        Stage("listing", lambda ctx: ctx["listing"], needs=("listing",)),
+    ]
+    return ScreeningPipeline(sources, stages)
+
+
+def test_runs_cheapest_first_and_stops_at_first_failure():
+    calls = []
+    pipeline = _pipeline(calls)
+    assert [stage.name for stage in pipeline.order] == ["listing", "history", "price", "decline"]
+
+    passed, results, _ = pipeline.run({"ticker": "A", "listing": False, "ohlcv": 1, "quote": 2})
+    assert not passed
+    assert results == {"price": None, "decline": None, "history": None, "listing": False}
+    assert calls == [("A", "listing")]
+
+    passed, _, _ = pipeline.run({"ticker": "B", "listing": True, "ohlcv": 1, "quote": 2})
+    assert passed
+    assert calls[1:] == [("B", "listing"), ("B", "ohlcv"), ("B", "quote")]  # 소스는 후보당 1회
+
+    stats = pipeline.snapshot()
+    assert stats["stages"]["listing"]["evaluated"] == 2 and stats["stages"]["listing"]["pass_rate"] == 0.5
+    assert stats["stages"]["decline"]["evaluated"] == 1
+    assert stats["source_loads"] == {"quote": 1, "ohlcv": 1, "listing": 2}
+
+
+def test_live_mode_uses_prequalified_reference_high_without_ohlcv():
+    from trading.trading_upper import TradingUpper
+
+    class _KRX:
+        def get_OHLCV(self, *args):
+            raise AssertionError("사전 선별 종목은 OHLCV 조회 없음")
+
+    tu = TradingUpper.__new__(TradingUpper)
+    tu.krx_api = _KRX()
+    tu._screening_api = lambda: type("K", (), {"get_stock_price": lambda self, t: {"output": {"stck_prpr": "9300"}}})()
+    pipeline = tu._build_screening_pipeline("live")
+    assert [stage.name for stage in pipeline.order] == ["decline", "tradable"]
+
+    assert pipeline.run({"ticker": "A", "last_high": 10000})[0]      # 9300 > 10000 × 0.925
+    assert not pipeline.run({"ticker": "B", "last_high": 10100})[0]  # 9300 < 9342.5
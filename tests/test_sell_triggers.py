@@ -0,0 +1,66 @@
+import random
+
+from config.condition import SELLING_POINT_UPPER, RISK_MGMT_UPPER, RISK_MGMT_STRONG_MOMENTUM, TRAILING_STOP_PERCENTAGE
+from trading.sell_triggers import SellTriggers, tick_band
+
+
+def _ratio_decision(prices, avg_price, trade_condition):
+    """기존 sell_condition의 비율 비교 판단 (첫 매도 틱 인덱스, 매도가)"""
+    high_ratio = None
+    risk = RISK_MGMT_STRONG_MOMENTUM if trade_condition == "strong_momentum" else RISK_MGMT_UPPER
+    for i, price in enumerate(prices):
+        tick = tick_band(price)[2]
+        target = max(price - tick * 2, tick)
+        if target < avg_price * risk:
+            return i, target
+        ratio = target / avg_price
+        if high_ratio is None or ratio > high_ratio:
+            high_ratio = ratio
+        if SELLING_POINT_UPPER < high_ratio < SELLING_POINT_UPPER + TRAILING_STOP_PERCENTAGE:
+            if ratio < SELLING_POINT_UPPER:
+                return i, target
+        elif high_ratio >= SELLING_POINT_UPPER + TRAILING_STOP_PERCENTAGE:
+            if ratio <= high_ratio * (1 - TRAILING_STOP_PERCENTAGE):
+                return i, target
+    return None
+
+
+def _trigger_decision(prices, avg_price, trade_condition):
+    triggers = SellTriggers(1, avg_price, None, trade_condition)
+    for i, price in enumerate(prices):
+        target, reason = triggers.check(price)
+        if reason is not None:
+            return i, target
+    return None
+
+
+def test_tick_band_boundaries():
+    assert tick_band(999)[2] == 1
+    assert tick_band(1000)[2] == 5
+    assert tick_band(499999)[2] == 500
+    assert tick_band(500000)[2] == 1000
+
+
+def test_integer_triggers_match_ratio_rules_on_random_walks():
+    rng = random.Random(7)
+    for _ in range(300):
+        avg_price = rng.choice([950, 4870.5, 9990, 23450, 61200.25, 150500])
+        trade_condition = rng.choice(["upper", "strong_momentum"])
+        price = int(avg_price)
+        prices = []
+        for _ in range(200):
+            price = max(1, int(price * (1 + rng.gauss(0.001, 0.01))))
+            prices.append(price)
+        assert _trigger_decision(prices, avg_price, trade_condition) == _ratio_decision(
+            prices, avg_price, trade_condition
+        )
+
+
+def test_trailing_floor_moves_only_on_new_high():
+    triggers = SellTriggers(1, 10000, None, "upper")
+    assert triggers.trail_floor == 0
+    triggers.check(int(10000 * SELLING_POINT_UPPER) + 300)
+    floor = triggers.trail_floor
+    assert floor > 0
+    triggers.check(int(10000 * SELLING_POINT_UPPER) + 200)
+    assert triggers.trail_floor == floor
@@ -0,0 +1,73 @@
+from trading.session_reconciler import SessionReconciler
+
+
+def _balance(ticker, qty, price):
+    return {"pdno": ticker, "hldg_qty": str(qty), "pchs_amt": str(qty * price), "pchs_avg_pric": str(price)}
+
+
+def test_jobs_due_together_share_one_balance_call():
+    calls = []
+    applied = []
+
+    def fetch_balance():
+        calls.append(1)
+        return [_balance("005930", 10, 1000), _balance("000660", 5, 2000)]
+
+    reconciler = SessionReconciler(fetch_balance, applied.extend, min_delay=0.05, max_delay=0.1, max_attempts=3)
+    reconciler.submit({"id": 1, "ticker": "005930"}, {"rt_cd": "0"})
+    reconciler.submit({"id": 2, "ticker": "000660"}, {"rt_cd": "0"}, provisional=(5, 10000, 2000))
+    assert reconciler.drain(timeout=2)
+
+    assert len(calls) == 1
+    assert [job.session["id"] for job, _ in applied] == [1, 2]
+    assert applied[1][0].provisional == (5, 10000, 2000)
+    reconciler.stop()
+
+
+def test_retries_with_backoff_then_gives_up():
+    attempts = []
+    given_up = []
+
+    def fetch_balance():
+        attempts.append(1)
+        return []
+
+    reconciler = SessionReconciler(fetch_balance, lambda resolved: None, on_give_up=given_up.append,
+                                   min_delay=0.01, max_delay=0.02, max_attempts=3)
+    job = reconciler.submit({"id": 1, "ticker": "005930"}, {"rt_cd": "0"})
+    assert reconciler.drain(timeout=2)
+
+    assert len(attempts) == 3 and given_up == [job]
+    assert reconciler.stats["given_up"] == 1 and reconciler.pending == 0
+    reconciler.stop()
+
+
+class _Logger:
+    def __init__(self):
+        self.messages = []
+
+    def info(self, message, context=None):
+        self.messages.append(message)
+
+    warning = error = info
+
+
+def test_apply_failure_is_retried_with_its_own_reason():
+    logger = _Logger()
+    applied = []
+
+    def apply_batch(resolved):
+        if not applied:
+            applied.append(None)
+            raise RuntimeError("DB 오류")
+        applied.extend(resolved)
+
+    reconciler = SessionReconciler(lambda: [_balance("005930", 10, 1000)], apply_batch, logger=logger,
+                                   min_delay=0.01, max_delay=0.02, max_attempts=3)
+    reconciler.submit({"id": 1, "ticker": "005930"}, {"rt_cd": "0"})
+    assert reconciler.drain(timeout=2)
+
+    assert len(applied) == 2
+    assert any(message.startswith("세션 대조 처리 실패: 005930") for message in logger.messages)
+    assert not any("잔고 정보 없음" in message for message in logger.messages)
+    reconciler.stop()
@@ -0,0 +1,101 @@
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+
+from database.session_store import SessionStore
+
+
+class _FakeDB:
+    rows = {}
+    writes = []
+    fail = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def load_trading_session_upper(self):
+        return [dict(row) for row in self.rows.values()]
+
+    def save_trading_session_upper(self, session_id, start_date, current_date, ticker, name, high_price,
+                                   fund, spent_fund, quantity, avr_price, count, trade_condition=None):
+        if _FakeDB.fail:
+            raise RuntimeError("DB 오류")
+        _FakeDB.writes.append(("save", session_id))
+        _FakeDB.rows[session_id] = {"id": session_id, "start_date": start_date, "ticker": ticker, "name": name,
+                                    "fund": fund, "quantity": quantity, "avr_price": avr_price, "count": count}
+
+    def delete_session_one_row(self, session_id):
+        _FakeDB.writes.append(("delete", session_id))
+        _FakeDB.rows.pop(session_id, None)
+
+
+def _store(tmp_path):
+    return SessionStore(db_factory=_FakeDB, path=str(tmp_path / "journal.db"), flush_interval=60)
+
+
+def test_changes_are_read_from_memory_and_flushed_coalesced(tmp_path):
+    _FakeDB.rows = {1: {"id": 1, "ticker": "005930", "name": "삼성전자", "quantity": 0, "fund": Decimal("100000")}}
+    _FakeDB.writes = []
+    store = _store(tmp_path)
+
+    store.save(2, date(2026, 10, 19), datetime(2026, 10, 19, 9, 0), "000660", "SK하이닉스", 0, 50000, 0, 0, 0, 0, "normal")
+    store.update(2, quantity=3, avr_price=15000)
+    store.update(1, quantity=5)
+    store.delete(1)
+
+    assert [row["id"] for row in store.all()] == [2]
+    assert store.get(2)["quantity"] == 3 and store.get(2)["trade_condition"] == "normal"
+    assert _FakeDB.writes == [] and store.pending == 4
+
+    assert store.flush() == 2
+    assert sorted(_FakeDB.writes) == [("delete", 1), ("save", 2)]
+    assert _FakeDB.rows[2]["quantity"] == 3 and store.pending == 0
+    store.close()
+
+
+def test_unflushed_journal_survives_restart_and_db_failure(tmp_path):
+    _FakeDB.rows = {}
+    _FakeDB.writes = []
+    store = _store(tmp_path)
+    store.save(7, date(2026, 10, 19), datetime(2026, 10, 19, 9, 0), "035720", "카카오", 0, Decimal("30000.50"), 0, 2, 40000, 1)
+
+    _FakeDB.fail = True
+    try:
+        assert store.flush() == 0 and store.pending == 1
+    finally:
+        _FakeDB.fail = False
+
+    # 반영 전 재시작: 새 인스턴스가 저널을 메모리에 덧씌우고 이어서 저장
+    restarted = _store(tmp_path)
+    row = restarted.get(7)
+    assert row["start_date"] == date(2026, 10, 19) and row["fund"] == Decimal("30000.50")
+    assert restarted.flush() == 1 and _FakeDB.rows[7]["quantity"] == 2
+    store.close()
+    restarted.close()
+
+
+def test_changes_do_not_wait_for_journal_io(tmp_path):
+    _FakeDB.rows = {}
+    _FakeDB.writes = []
+    store = _store(tmp_path)
+    store.get(1)
+
+    connect = store._connect
+    callers = []
+
+    def tracking_connect():
+        callers.append(threading.current_thread().name)
+        return connect()
+
+    store._connect = tracking_connect
+    store.save(3, date(2026, 10, 19), datetime(2026, 10, 19, 9, 0), "005930", "삼성전자", 0, 50000, 0, 0, 0, 0)
+    store.update(3, quantity=1)
+    assert store.get(3)["quantity"] == 1
+    # 저널 기록은 저장 스레드에서만 수행
+    assert threading.current_thread().name not in callers
+
+    assert store.flush() == 1 and _FakeDB.rows[3]["quantity"] == 1
+    store.close()
@@ -0,0 +1,9 @@
+from utils.stats import percentile
+
+
+def test_percentile_nearest_rank():
+    values = [5, 1, 4, 2, 3, 10, 9, 8, 7, 6]
+    assert percentile(values, 50) == 6
+    assert percentile(values, 99) == 10
+    assert percentile(values, 0) == 1
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+from database.stock_master import StockMaster
+
+
+class _FakeKIS:
+    def __init__(self):
+        self.calls = []
+
+    def get_basic_stock_info(self, ticker):
+        self.calls.append(ticker)
+        return {"output": {"prdt_abrv_name": "테스트", "mket_id_cd": "KSQ", "scts_mket_lstg_dt": "",
+                           "kosdaq_mket_lstg_dt": "20200102", "std_idst_clsf_cd_name": "반도체", "papr": "500.00"}}
+
+
+class _FakeStock:
+    def get_market_ticker_list(self, market):
+        return ["000001"] if market == "KOSPI" else ["000002"]
+
+    def get_market_ticker_name(self, ticker):
+        return f"종목{ticker}"
+
+
+def test_listing_date_is_fetched_once_and_survives_restart(tmp_path):
+    path = str(tmp_path / "master.db")
+    kis = _FakeKIS()
+    master = StockMaster(path)
+    assert master.warm_listed(_FakeStock()) == 2 and master.get("000002")["market"] == "KOSDAQ"
+
+    assert master.listing_date("000002", kis) == "20200102"
+    assert master.listing_date("000002", kis) == "20200102"
+    assert kis.calls == ["000002"]
+
+    restarted = StockMaster(path)
+    assert restarted.get("000002")["par_value"] == 500 and restarted.get("000002")["sector"] == "반도체"
+    assert restarted.warm_details(["000001", "000002"], kis) == ["000001"]
+
+    # 갱신 주기가 지난 행만 다시 조회
+    stale = dict(restarted.get("000001"), updated_at=(date.today() - timedelta(days=31)).strftime('%Y%m%d'))
+    restarted._save([stale])
+    restarted.listing_date("000001", kis)
+    assert kis.calls == ["000002", "000001", "000001"]
@@ -0,0 +1,29 @@
+from utils.tick_recorder import TickRecorder, read_ticks, tick_files
+
+
+def test_recorder_round_trip_and_ticker_index(tmp_path):
+    recorder = TickRecorder(tmp_path, fsync_interval=0.05)
+    frames = [
+        "0|H0STCNT0|001|005930^093000^70000",
+        b"0|H0STCNT0|001|000660^093001^120000",
+        '{"header":{"tr_id":"PINGPONG"}}',
+        "1|H0STCNI0|001|encrypted",
+        "0|H0STASP0|001|005930^093002^70100",
+    ]
+    for frame in frames:
+        recorder.record(frame)
+    assert recorder.flush()
+    recorder.close()
+
+    files = tick_files(tmp_path)
+    assert len(files) == 1
+
+    all_frames = [frame for _, frame in read_ticks(files[0])]
+    assert len(all_frames) == 4  # PINGPONG 제외
+    assert all_frames[1].startswith("0|H0STCNT0|001|000660")
+
+    samsung = [frame for _, frame in read_ticks(files[0], tickers=["005930"])]
+    assert samsung == [frames[0], frames[4]]
+
+    timestamps = [ts for ts, _ in read_ticks(files[0])]
+    assert timestamps == sorted(timestamps)
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from trading.tick_replay import TickReplay
+
+DAY = date(2025, 6, 2)  # 월요일
+
+
+def _frames(ticker, points):
+    """(HH:MM:SS, 가격) 목록을 체결가 프레임으로 변환"""
+    for hhmmss, price in points:
+        ts = datetime.combine(DAY, datetime.strptime(hhmmss, "%H:%M:%S").time())
+        fields = ["0"] * 46
+        fields[0] = ticker
+        fields[1] = ts.strftime("%H%M%S")
+        fields[2] = fields[11] = str(price)
+        fields[10] = str(price + 10)
+        yield int(ts.timestamp() * 1e9), "0|H0STCNT0|001|" + "^".join(fields)
+
+
+def _session(avr_price, target_date=DAY, trade_condition="normal"):
+    start = datetime.combine(DAY - timedelta(days=1), datetime.min.time())
+    return (1, "005930", "삼성전자", 10, avr_price, start, target_date, trade_condition)
+
+
+def _replay(points, session):
+    return asyncio.run(TickReplay(_frames("005930", points), [session]).run())
+
+
+def test_stop_loss_fires_below_risk_threshold():
+    result = _replay(
+        [("09:00:01", 10000), ("09:00:02", 9700), ("09:00:03", 9500), ("09:00:04", 9400)],
+        _session(10000),
+    )
+    assert len(result.sells) == 1
+    sell = result.sells[0]
+    assert sell.time.strftime("%H:%M:%S") == "09:00:03"
+    assert sell.price == 9480  # 현재가 - 2틱
+
+
+def test_trailing_stop_after_activation():
+    result = _replay(
+        [("09:00:01", 10300), ("09:00:02", 10700), ("09:00:03", 10600), ("09:00:04", 10500)],
+        _session(10000),
+    )
+    assert [s.time.strftime("%H:%M:%S") for s in result.sells] == ["09:00:04"]
+
+
+def test_holding_period_expiry_uses_simulated_clock():
+    result = _replay(
+        [("08:59:00", 10000), ("15:09:59", 10000), ("15:10:00", 10000)],
+        _session(10000, target_date=DAY - timedelta(days=1)),
+    )
+    assert result.skipped == 1  # 장 시작 전 프레임
+    assert [s.time.strftime("%H:%M:%S") for s in result.sells] == ["15:10:00"]
+
+
+def test_sell_is_traced_from_receive_to_order_ack():
+    from utils.latency_tracer import latency_tracer
+
+    before = latency_tracer.count
+    _replay([("09:00:01", 10000), ("09:00:02", 9500)], _session(10000))
+    assert latency_tracer.count == before + 1
+    stages = latency_tracer.recent[-1]
+    assert {"queue", "evaluate", "handoff", "pre_order", "order_http", "post_order"} <= set(stages)
@@ -0,0 +1,43 @@
+import asyncio
+from datetime import date, datetime
+
+from database.trailing_state_store import TrailingStateStore
+from trading.sell_triggers import SellTriggers
+
+
+class _FakeDB:
+    writes = []
+    fail = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def save_trailing_states(self, rows):
+        if _FakeDB.fail:
+            raise RuntimeError("db down")
+        _FakeDB.writes.append(list(rows))
+
+
+def test_new_highs_are_batched_and_retried_after_failure():
+    _FakeDB.writes = []
+    store = TrailingStateStore(db_factory=_FakeDB)
+    triggers = SellTriggers(7, 10000, date(2025, 1, 10), "upper")
+    for price in (10500, 10800, 11000):
+        triggers.check(price)
+        store.mark("005930", triggers, datetime(2025, 1, 9, 10, 0))
+    assert store.pending == 1
+
+    _FakeDB.fail = True
+    assert asyncio.run(store.flush()) == 0
+    assert store.pending == 1
+
+    _FakeDB.fail = False
+    assert asyncio.run(store.flush()) == 1
+    (row,) = _FakeDB.writes[0]
+    assert row[0] == 7 and row[2] == triggers.high_price and row[6] == triggers.trail_floor
+
+    restored = SellTriggers(7, 10000, date(2025, 1, 10), "upper", high_price=row[2])
+    assert restored.trail_floor == triggers.trail_floor
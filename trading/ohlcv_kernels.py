@@ -0,0 +1,107 @@
+"""
+OHLCV 매수 조건 벡터 연산 모듈
+
+매수 조건 중 과거 시세만 쓰는 조건을 행 단위 iloc 반복 대신 NumPy 배열 연산으로 계산합니다.
+모든 함수는 마지막 축을 날짜(오래된 → 최근)로 보고, 1차원(한 종목) 또는 2차원(종목 × 날짜) 배열을 같은 코드로 처리합니다.
+
+여러 종목을 한 번에 계산할 때는 stack_ohlcv()로 종목별 OHLCV를 최근 날짜 기준 오른쪽 정렬해 쌓습니다.
+조건들이 뒤에서부터(-2: 상승 다음날, -3: 상승일) 인덱싱하므로 거래일 수가 다른 종목은 앞쪽을 NaN으로 채우고,
+NaN이 포함된 비교는 False가 되어 종목별로 따로 계산한 결과와 같습니다.
+"""
+
+import numpy as np
+
+
+HIGH_GAIN_LIMIT = 20.0      # 조건1: 종가 대비 다음날 고가 상승률(%) 한도
+STRONG_MOMENTUM_RETURN = 0.10  # 조건6: D+1 수익률 기준
+
+
+def _as_array(values):
+    return np.asarray(values, dtype=float)
+
+
+def next_day_high_gains(close, high):
+    """
+    종가 대비 다음날 고가 상승률(%)
+
+    마지막 2거래일(상승일 다음날, 매수일 전날)을 제외한 구간에서 i일 종가 → i+1일 고가
+    """
+    close = _as_array(close)[..., :-3]
+    high = _as_array(high)[..., 1:-2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (high - close) / close * 100
+
+
+def high_history_ok(close, high, limit=HIGH_GAIN_LIMIT):
+    """조건1: 기간 내 종가 대비 다음날 고가가 limit% 이상 오른 적이 없으면 True"""
+    return ~(next_day_high_gains(close, high) >= limit).any(axis=-1)
+
+
+def last_high(high):
+    """조건2 기준 고가 (상승 다음날 고가, 뒤에서 두 번째)"""
+    high = _as_array(high)
+    if high.shape[-1] < 2:
+        return np.full(high.shape[:-1], np.nan)
+    return high[..., -2]
+
+
+def d1_return(close):
+    """상승일(D+0) 종가 대비 다음날(D+1) 종가 수익률. 데이터 부족/종가 0 이하는 NaN"""
+    close = _as_array(close)
+    if close.shape[-1] < 3:
+        return np.full(close.shape[:-1], np.nan)
+    day_0, day_1 = close[..., -3], close[..., -2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(day_0 > 0, (day_1 - day_0) / day_0, np.nan)
+
+
+def strong_momentum(close, threshold=STRONG_MOMENTUM_RETURN):
+    """조건6: D+1 수익률이 threshold 이상이면 True (NaN은 False)"""
+    return d1_return(close) >= threshold
+
+
+def stack_ohlcv(frames, columns=("종가", "고가")):
+    """
+    종목별 OHLCV DataFrame을 (종목 × 날짜) 배열로 쌓기 (최근 날짜 기준 오른쪽 정렬, 빈 칸 NaN)
+
+    Args:
+        frames (dict): {종목코드: OHLCV DataFrame}
+        columns (tuple): 쌓을 컬럼
+
+    Returns:
+        tuple: (종목코드 목록, {컬럼: 2차원 배열})
+    """
+    tickers = list(frames)
+    width = max((len(frames[ticker]) for ticker in tickers), default=0)
+    stacked = {column: np.full((len(tickers), width), np.nan) for column in columns}
+    for row, ticker in enumerate(tickers):
+        df = frames[ticker]
+        if len(df) == 0:
+            continue
+        for column in columns:
+            stacked[column][row, width - len(df):] = df[column].to_numpy(dtype=float)
+    return tickers, stacked
+
+
+def screen_ohlcv(frames):
+    """
+    여러 종목의 OHLCV 조건을 한 번의 배열 연산으로 계산
+
+    Returns:
+        dict: {종목코드: {"high_history": bool, "last_high": float, "d1_return": float, "strong_momentum": bool}}
+    """
+    tickers, stacked = stack_ohlcv(frames)
+    close, high = stacked["종가"], stacked["고가"]
+    high_ok = high_history_ok(close, high)
+    highs = last_high(high)
+    returns = d1_return(close)
+    momentum = returns >= STRONG_MOMENTUM_RETURN
+    return {
+        ticker: {
+            "high_history": bool(high_ok[row]),
+            "last_high": float(highs[row]),
+            "d1_return": float(returns[row]),
+            "strong_momentum": bool(momentum[row]),
+        }
+        for row, ticker in enumerate(tickers)
+    }
@@ -0,0 +1,315 @@
+"""
+주문 관리자 모듈
+
+주문 1건을 상태 기계(접수 → 부분체결 → 체결 / 정정 / 취소 / 거부)로 추적하고,
+체결은 실시간 체결통보(execution_hub) 이벤트로 갱신하거나, 스트림이 없으면 짧은 간격부터 늘려 가는 REST 폴링으로 확인합니다.
+스트림이 살아 있어도 통보 누락에 대비해 긴 간격(stream_poll)으로 REST를 함께 조회하고, 미체결로 반환하기 전 최소 1회 확인합니다.
+호출 측은 wait(order, timeout)으로 체결/종료를 기다리며, 락을 잡고 고정 시간 sleep하지 않으므로
+여러 주문을 서로 다른 스레드에서 동시에 진행할 수 있습니다 (초당 호출 한도는 utils.rate_limiter가 담당).
+
+KISApi는 요청마다 headers/hashkey를 덮어쓰므로 스레드별 인스턴스를 사용합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from api.kis_api import KISApi
+from api.kis_execution_notice import execution_hub, normalize_order_no
+
+
+# 주문 상태
+SUBMITTED = "submitted"
+PARTIAL = "partial"
+FILLED = "filled"
+REVISED = "revised"
+CANCELLED = "cancelled"
+REJECTED = "rejected"
+FAILED = "failed"
+
+STATE_NAMES = {
+    SUBMITTED: "접수",
+    PARTIAL: "부분체결",
+    FILLED: "체결",
+    REVISED: "정정",
+    CANCELLED: "취소",
+    REJECTED: "거부",
+    FAILED: "실패",
+}
+
+TERMINAL_STATES = frozenset({FILLED, CANCELLED, REJECTED, FAILED})
+
+RATE_LIMIT_MESSAGE = '초당 거래건수를 초과하였습니다.'
+# 추적 종료 후에도 get()으로 조회할 수 있게 보관하는 최근 주문 수
+FINISHED_ORDER_LIMIT = 256
+
+
+class ManagedOrder:
+    """추적 중인 주문 1건 (정정 주문 포함, 원주문번호 기준)"""
+
+    def __init__(self, ticker, side, quantity, price=None, name=None):
+        self.ticker = ticker
+        self.side = side
+        self.name = name
+        self.quantity = quantity
+        self.price = price
+        self.order_no = None          # 원주문번호 (REST 응답 ODNO 그대로)
+        self.order_nos = []           # 원주문 + 정정 주문번호 (REST 조회용)
+        self.state = SUBMITTED
+        self.filled_qty = 0
+        self.filled_amount = 0
+        self.revisions = 0
+        self.result = None            # 마지막으로 성공한 주문/정정 REST 응답
+        self.history = []             # (상태, time.time())
+
+    @property
+    def unfilled(self):
+        return max(0, self.quantity - self.filled_qty)
+
+    @property
+    def avg_price(self):
+        return int(self.filled_amount / self.filled_qty) if self.filled_qty else 0
+
+    @property
+    def is_done(self):
+        return self.state in TERMINAL_STATES
+
+    def __repr__(self):
+        return (f"ManagedOrder({self.side} {self.ticker} {self.filled_qty}/{self.quantity} "
+                f"{STATE_NAMES[self.state]}, 주문번호={self.order_no}, 정정={self.revisions})")
+
+
+class OrderManager:
+    """주문 상태 추적 및 체결 대기 (스레드 안전)"""
+
+    def __init__(self, hub=execution_hub, api_factory=KISApi, logger=None,
+                 poll_min=0.5, poll_max=4.0, stream_poll=5.0, submit_retries=5):
+        """
+        Args:
+            hub: 체결통보 허브
+            api_factory: 스레드별 KISApi 생성 함수
+            logger: TradingLogger (없으면 print)
+            poll_min (float): 체결통보가 없을 때 첫 REST 체결 조회 간격(초). 조회마다 2배로 늘림
+            poll_max (float): REST 체결 조회 최대 간격(초)
+            stream_poll (float): 체결통보 스트림이 살아 있을 때의 보조 REST 체결 조회 간격(초)
+            submit_retries (int): 초당 거래건수 초과 응답 시 재시도 횟수
+        """
+        self.hub = hub
+        self.api_factory = api_factory
+        self.logger = logger
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.stream_poll = stream_poll
+        self.submit_retries = submit_retries
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        # 정규화한 주문번호(원주문/정정, 체결통보 기준) -> ManagedOrder
+        self._orders = {}
+        # 추적을 마친 최근 주문 (세션 잠정 반영용)
+        self._finished = OrderedDict()
+        self.hub.subscribe(self._on_notice)
+
+    def _log(self, level, message, context=None):
+        if self.logger:
+            getattr(self.logger, level)(message, context)
+        else:
+            print(message, context or "")
+
+    def api(self):
+        """현재 스레드의 KISApi"""
+        kis_api = getattr(self._local, "kis_api", None)
+        if kis_api is None:
+            kis_api = self._local.kis_api = self.api_factory()
+        return kis_api
+
+    def _set_state(self, order, state):
+        if order.state != state:
+            order.state = state
+            order.history.append((state, time.time()))
+
+    def _apply_fills(self, order, filled_qty, filled_amount, order_qty=0, rejected=False):
+        """누적 체결 반영 및 상태 전이 (self._condition 보유 상태에서 호출)"""
+        if order.is_done:
+            return
+        if rejected and filled_qty <= 0:
+            self._set_state(order, REJECTED)
+            return
+        if order_qty and not order.revisions:
+            # 주문가능금액에 맞춰 수량이 조정되는 경우 접수 수량 기준
+            order.quantity = order_qty
+        if filled_qty > order.filled_qty:
+            order.filled_qty = filled_qty
+            order.filled_amount = filled_amount
+            self._set_state(order, FILLED if order.unfilled == 0 else PARTIAL)
+
+    def _on_notice(self, notice):
+        """체결통보 콜백 (모니터링 루프에서 호출되므로 블로킹 금지)"""
+        with self._condition:
+            order = self._orders.get(notice.order_no) or self._orders.get(notice.original_order_no)
+            if order is None:
+                return
+            summary = self.hub.get_fills(order.order_no)
+            if summary:
+                self._apply_fills(order, summary.filled_qty, summary.filled_amount, summary.order_qty, summary.rejected)
+            self._condition.notify_all()
+
+    def _track(self, order, order_no):
+        with self._condition:
+            order.order_nos.append(order_no)
+            self._orders[normalize_order_no(order_no)] = order
+            # 주문 응답보다 체결통보가 먼저 도착했을 수 있으므로 허브 누적값으로 한 번 갱신
+            summary = self.hub.get_fills(order.order_no)
+            if summary:
+                self._apply_fills(order, summary.filled_qty, summary.filled_amount, summary.order_qty, summary.rejected)
+            self._condition.notify_all()
+
+    def submit(self, ticker, quantity, side='buy', price=None, name=None):
+        """
+        주문 접수 (체결을 기다리지 않음)
+
+        Returns:
+            ManagedOrder: 접수 실패 시 state가 REJECTED/FAILED이고 result에 응답 보관
+        """
+        order = ManagedOrder(ticker, side, quantity, price, name)
+        order.history.append((SUBMITTED, time.time()))
+        result = None
+        for _ in range(self.submit_retries):
+            result = self.api().place_order(ticker, quantity, order_type=side, price=price)
+            ## 초당 거래 건수 초과 시 재시도
+            if (result or {}).get('msg1') == RATE_LIMIT_MESSAGE:
+                self._log("warning", "초당 거래건수 초과로 재시도", {"name": name, "ticker": ticker})
+                time.sleep(self.poll_min)
+                continue
+            break
+
+        order.result = result
+        order_no = (result or {}).get('output', {}).get('ODNO')
+        if (result or {}).get('rt_cd') != '0' or not order_no:
+            self._set_state(order, REJECTED if (result or {}).get('rt_cd') == '1' else FAILED)
+            return order
+
+        order.order_no = order_no
+        self._track(order, order_no)
+        return order
+
+    def revise(self, order, price):
+        """
+        미체결 수량 정정 (원주문번호 기준)
+
+        Returns:
+            bool: 정정 접수 성공 여부
+        """
+        if order.is_done or order.unfilled <= 0:
+            return False
+        result = self.api().revise_order(order.order_no, order.unfilled, price)
+        revised_no = (result or {}).get('output', {}).get('ODNO')
+        if (result or {}).get('rt_cd') != '0' or not revised_no:
+            self._log("warning", "주문 수정 실패", {"rt_cd": (result or {}).get('rt_cd'),
+                                                "msg1": (result or {}).get('msg1', ''), "order": repr(order)})
+            return False
+        self.hub.register_revision(order.order_no, revised_no)
+        with self._condition:
+            order.revisions += 1
+            order.price = price
+            order.result = result
+            self._set_state(order, REVISED)
+        self._track(order, revised_no)
+        return True
+
+    def cancel(self, order):
+        """미체결 수량 취소. 성공 시 CANCELLED (이미 체결된 수량은 유지)"""
+        if order.is_done:
+            return False
+        result = self.api().cancel_order(order.order_no)
+        if (result or {}).get('rt_cd') != '0':
+            self._log("warning", "주문 취소 실패", {"msg1": (result or {}).get('msg1', ''), "order": repr(order)})
+            return False
+        with self._condition:
+            self._set_state(order, CANCELLED)
+            self._condition.notify_all()
+        return True
+
+    def _poll(self, order):
+        """REST 체결 조회로 누적 체결 갱신 (원주문 + 정정 주문 합산)"""
+        filled_qty = filled_amount = order_qty = 0
+        for index, order_no in enumerate(list(order.order_nos)):
+            output = (self.api().daily_order_execution_inquiry(order_no) or {}).get('output1') or [{}]
+            qty = int(output[0].get('tot_ccld_qty', 0) or 0)
+            filled_qty += qty
+            filled_amount += qty * int(float(output[0].get('avg_prvs', 0) or 0))
+            if index == 0:
+                order_qty = int(output[0].get('ord_qty', 0) or 0)
+        with self._condition:
+            self._apply_fills(order, filled_qty, filled_amount, order_qty)
+            self._condition.notify_all()
+
+    def _try_poll(self, order):
+        try:
+            self._poll(order)
+        except Exception as e:
+            self._log("error", f"주문 체결 확인 실패: {e}", {"order": repr(order)})
+
+    def wait(self, order, timeout):
+        """
+        주문이 전량 체결되거나 종료될 때까지 대기
+
+        체결통보 스트림이 살아 있으면 이벤트로 깨어나면서 stream_poll 간격으로 REST도 조회하고,
+        없으면 poll_min부터 2배씩 늘린 간격으로 REST 조회합니다.
+        체결통보가 누락돼도 미체결로 잘못 반환하지 않도록, 한 번도 조회하지 않았으면 반환 전 1회 조회합니다.
+
+        Returns:
+            ManagedOrder: 타임아웃 시점의 상태 (부분 체결 가능)
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.poll_min
+        next_stream_poll = time.monotonic() + self.stream_poll
+        polled = False
+        while not order.is_done:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                break
+            if self.hub.is_streaming:
+                if now >= next_stream_poll:
+                    self._try_poll(order)
+                    polled = True
+                    next_stream_poll = now + self.stream_poll
+                    continue
+                with self._condition:
+                    # 스트림이 끊겨도 폴링으로 넘어갈 수 있도록 최대 1초 단위로 다시 확인
+                    self._condition.wait_for(lambda: order.is_done,
+                                             timeout=min(remaining, 1.0, next_stream_poll - now))
+                continue
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.poll_max)
+            self._try_poll(order)
+            polled = True
+        if not order.is_done and not polled:
+            self._try_poll(order)
+        return order
+
+    def finish(self, order):
+        """추적 종료 (이후 체결통보는 허브에만 누적)"""
+        with self._condition:
+            for order_no in order.order_nos:
+                key = normalize_order_no(order_no)
+                self._orders.pop(key, None)
+                self._finished[key] = order
+                self._finished.move_to_end(key)
+            while len(self._finished) > FINISHED_ORDER_LIMIT:
+                self._finished.popitem(last=False)
+
+    def get(self, order_no):
+        """주문번호(원주문/정정)로 추적 중이거나 최근 종료된 주문 조회 (없으면 None)"""
+        key = normalize_order_no(order_no)
+        with self._condition:
+            return self._orders.get(key) or self._finished.get(key)
+
+    def snapshot(self):
+        """추적 중인 주문 상태별 건수"""
+        with self._condition:
+            orders = {id(order): order for order in self._orders.values()}.values()
+            counts = {}
+            for order in orders:
+                counts[order.state] = counts.get(order.state, 0) + 1
+            return {"in_flight": len(orders), "states": counts}
@@ -0,0 +1,149 @@
+"""
+매수 후보 선별 파이프라인 모듈
+
+매수 조건을 이름 있는 필터 단계(Stage)로 나누고, 각 단계가 필요로 하는 데이터 소스(needs)의 비용 순으로 실행합니다.
+- 데이터 소스는 후보마다 처음 필요할 때 한 번만 불러오고(지연 로딩), 같은 소스를 쓰는 단계끼리 공유합니다.
+- 단계 비용은 필요한 소스 비용 중 최댓값이며, 비용이 같으면 등록 순서를 유지합니다.
+- 처음 실패한 단계에서 평가를 멈추므로, 뒤쪽의 비싼 조회(실시간 시세 등)는 앞 단계를 통과한 후보만 호출합니다.
+- 단계별 평가/통과 건수와 소요 시간을 기록합니다 (선별 스레드에서 동시에 실행되므로 락으로 보호).
+"""
+
+import threading
+import time
+
+
+# 데이터 소스 비용 등급 (작을수록 먼저 실행)
+COST_LOCAL = 0      # 후보 행/DB 데이터만 사용
+COST_CACHED = 1     # 정적 정보 (프로세스 캐시, 최초 1회만 조회)
+COST_HISTORY = 2    # 과거 시세 (KRX OHLCV)
+COST_LIVE = 3       # 실시간 시세 (KIS 현재가)
+
+
+class Source:
+    """후보 1건에 대해 불러오는 데이터 (loader(stock) -> 값)"""
+
+    __slots__ = ("name", "cost", "loader")
+
+    def __init__(self, name, cost, loader):
+        self.name = name
+        self.cost = cost
+        self.loader = loader
+
+
+class Stage:
+    """매수 조건 1개 (check(ctx) -> bool)"""
+
+    __slots__ = ("name", "label", "needs", "check", "cost")
+
+    def __init__(self, name, check, needs=(), label=None):
+        """
+        Args:
+            name (str): 단계 이름 (통계/로그 키)
+            check (callable): ctx를 받아 통과 여부를 반환
+            needs (tuple): 필요한 데이터 소스 이름
+            label (str): 조건 출력용 설명
+        """
+        self.name = name
+        self.label = label or name
+        self.needs = tuple(needs)
+        self.check = check
+        self.cost = COST_LOCAL
+
+
+class ScreeningContext:
+    """후보 1건의 평가 상태 (소스 값은 처음 접근할 때 로드)"""
+
+    def __init__(self, stock, sources):
+        self.stock = stock
+        self._sources = sources
+        self._data = {}
+        self.load_times = {}
+
+    def __getitem__(self, name):
+        if name not in self._data:
+            started = time.perf_counter()
+            self._data[name] = self._sources[name].loader(self.stock)
+            self.load_times[name] = time.perf_counter() - started
+        return self._data[name]
+
+    def loaded(self, name):
+        return name in self._data
+
+
+class ScreeningPipeline:
+    """비용 순 단락 평가 매수 조건 파이프라인"""
+
+    def __init__(self, sources, stages):
+        """
+        Args:
+            sources (list[Source]): 데이터 소스
+            stages (list[Stage]): 매수 조건 (등록 순서 = 조건 출력 순서)
+        """
+        self.sources = {source.name: source for source in sources}
+        for stage in stages:
+            missing = [name for name in stage.needs if name not in self.sources]
+            if missing:
+                raise ValueError(f"{stage.name} 단계의 데이터 소스 없음: {missing}")
+            stage.cost = max((self.sources[name].cost for name in stage.needs), default=COST_LOCAL)
+        self.stages = list(stages)
+        # sorted는 안정 정렬이라 비용이 같으면 등록 순서 유지
+        self.order = sorted(self.stages, key=lambda stage: stage.cost)
+        self._lock = threading.Lock()
+        self._stats = {stage.name: {"evaluated": 0, "passed": 0, "seconds": 0.0} for stage in self.stages}
+        self._source_loads = {name: 0 for name in self.sources}
+
+    def run(self, stock):
+        """
+        후보 1건 평가
+
+        Returns:
+            tuple: (통과 여부, 단계별 결과 {이름: True/False/None(미평가)}, ctx)
+        """
+        ctx = ScreeningContext(stock, self.sources)
+        results = {stage.name: None for stage in self.stages}
+        timings = {}
+        passed = True
+        for stage in self.order:
+            started = time.perf_counter()
+            try:
+                ok = bool(stage.check(ctx))
+            finally:
+                timings[stage.name] = time.perf_counter() - started
+            results[stage.name] = ok
+            if not ok:
+                passed = False
+                break
+
+        with self._lock:
+            for name, seconds in timings.items():
+                stat = self._stats[name]
+                stat["evaluated"] += 1
+                stat["passed"] += results[name] is True
+                stat["seconds"] += seconds
+            for name in ctx.load_times:
+                self._source_loads[name] += 1
+        return passed, results, ctx
+
+    def describe(self, results):
+        """조건 출력 줄 (등록 순서, 미평가 단계는 '건너뜀')"""
+        return [
+            f"{stage.label}: {'건너뜀' if results[stage.name] is None else results[stage.name]}"
+            for stage in self.stages
+        ]
+
+    def snapshot(self):
+        """단계별 통과율/소요 시간 및 소스 조회 횟수"""
+        with self._lock:
+            stages = {}
+            for stage in self.order:
+                stat = self._stats[stage.name]
+                evaluated = stat["evaluated"]
+                stages[stage.name] = {
+                    "cost": stage.cost,
+                    "evaluated": evaluated,
+                    "passed": stat["passed"],
+                    "pass_rate": round(stat["passed"] / evaluated, 3) if evaluated else None,
+                    "avg_ms": round(stat["seconds"] / evaluated * 1000, 2) if evaluated else 0.0,
+                    "total_s": round(stat["seconds"], 3),
+                }
+            return {"stages": stages, "source_loads": dict(self._source_loads)}
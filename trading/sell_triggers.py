@@ -0,0 +1,138 @@
+"""
+세션별 매도 트리거 가격 모듈
+
+매 틱마다 평균단가 × 비율을 다시 계산하지 않도록, 모니터링 중인 세션마다 정수 트리거 가격을 미리 계산해 둡니다.
+- stop_price: 매도가가 이 값 미만이면 손절 (avg_price × RISK_MGMT)
+- activation_price: 고점 매도가가 이 값 이상이면 트레일링스탑 활성 (avg_price × SELLING_POINT 초과)
+- trail_floor: 매도가가 이 값 미만이면 트레일링스탑 발동 (새 고점이 나올 때만 갱신, 비활성이면 0)
+
+틱 평가는 호가단위 계산(직전 가격대 캐시) + 정수 비교 몇 번이며, 매도 사유 dict는 트리거가 발동할 때만 만듭니다.
+판단 기준은 기존 비율 비교(매도가 / 평균단가)와 같도록 올림/내림을 맞췄습니다.
+"""
+
+import math
+
+from config.condition import (
+    SELLING_POINT_UPPER,
+    RISK_MGMT_UPPER,
+    RISK_MGMT_STRONG_MOMENTUM,
+    TRAILING_STOP_PERCENTAGE,
+)
+
+
+# (가격대 상한, 호가단위) - 상한 미만 가격에 해당 호가단위 적용
+TICK_BANDS = (
+    (1000, 1),
+    (5000, 5),
+    (10000, 10),
+    (50000, 50),
+    (100000, 100),
+    (500000, 500),
+    (math.inf, 1000),
+)
+
+STOP_REASONS = {
+    "strong_momentum": "주가 하락: 강력 모멘텀 리스크 관리",
+}
+DEFAULT_STOP_REASON = "주가 하락: 리스크 관리차 매도"
+
+
+def tick_band(price):
+    """가격이 속한 호가 가격대 (하한, 상한, 호가단위)"""
+    lower = 0
+    for upper, tick in TICK_BANDS:
+        if price < upper:
+            return lower, upper, tick
+        lower = upper
+    return lower, math.inf, TICK_BANDS[-1][1]
+
+
+def risk_threshold_for(trade_condition):
+    return RISK_MGMT_STRONG_MOMENTUM if trade_condition == "strong_momentum" else RISK_MGMT_UPPER
+
+
+class SellTriggers:
+    """세션 1건의 정수 트리거 가격과 트레일링 고점"""
+
+    __slots__ = (
+        "session_id", "avg_price", "target_date", "trade_condition",
+        "stop_price", "stop_condition_price", "activation_price", "band_top", "trail_floor",
+        "sell_below", "high_price", "_band_lo", "_band_hi", "_tick",
+    )
+
+    def __init__(self, session_id, avg_price, target_date, trade_condition, high_price=0):
+        """
+        Args:
+            session_id: 세션 ID
+            avg_price: 평균 매수 단가
+            target_date (date): 보유 목표일
+            trade_condition (str): 매매 조건 (strong_momentum 이면 손절 기준 다름)
+            high_price (int): 이전에 기록된 고점 매도가 (재시작 시 복원용)
+        """
+        self.session_id = session_id
+        self.avg_price = avg_price
+        self.target_date = target_date
+        self.trade_condition = trade_condition
+
+        risk_threshold = risk_threshold_for(trade_condition)
+        # 매도가 < avg × risk  ⇔  매도가 < ceil(avg × risk)
+        self.stop_price = math.ceil(avg_price * risk_threshold)
+        self.stop_condition_price = int(avg_price * risk_threshold)
+        # 고점 비율 > SELLING_POINT  ⇔  고점 매도가 >= floor(avg × SELLING_POINT) + 1
+        self.activation_price = math.floor(avg_price * SELLING_POINT_UPPER) + 1
+        # 고점 비율 < SELLING_POINT + TRAILING  ⇔  고점 매도가 < ceil(avg × (SELLING_POINT + TRAILING))
+        self.band_top = math.ceil(avg_price * (SELLING_POINT_UPPER + TRAILING_STOP_PERCENTAGE))
+        self.trail_floor = 0
+        self.high_price = 0
+        self._band_lo = self._band_hi = 0
+        self._tick = 1
+        self.sell_below = self.stop_price
+        if high_price:
+            self.update_high(high_price)
+
+    def target_price(self, price):
+        """매도 주문가 (현재가에서 2호가 아래, 최소 1호가)"""
+        if not self._band_lo <= price < self._band_hi:
+            self._band_lo, self._band_hi, self._tick = tick_band(price)
+        tick = self._tick
+        return max(price - tick * 2, tick)
+
+    def update_high(self, target_price):
+        """새 고점 매도가 기록 및 트레일링 하한 재계산"""
+        self.high_price = target_price
+        if target_price < self.activation_price:
+            self.trail_floor = 0
+        elif target_price < self.band_top:
+            # 수익률이 SELLING_POINT 아래로 내려오면 매도: 매도가 < ceil(avg × SELLING_POINT)
+            self.trail_floor = math.ceil(self.avg_price * SELLING_POINT_UPPER)
+        else:
+            # 고점 대비 TRAILING 만큼 하락하면 매도: 매도가 <= floor(고점 × (1 - TRAILING))
+            self.trail_floor = max(0, math.floor(target_price * (1 - TRAILING_STOP_PERCENTAGE)) + 1)
+        self.sell_below = max(self.stop_price, self.trail_floor)
+
+    def check(self, price):
+        """
+        현재가로 손절/트레일링스탑 판단
+
+        Returns:
+            (매도가, None) - 트리거 미발동
+            (매도가, 매도 사유 dict) - 트리거 발동
+        """
+        target = self.target_price(price)
+        if target >= self.sell_below:
+            if target > self.high_price:
+                self.update_high(target)
+            return target, None
+
+        if target < self.stop_price:
+            return target, {
+                "매도가": target,
+                "매도조건가": self.stop_condition_price,
+                "매도사유": STOP_REASONS.get(self.trade_condition, DEFAULT_STOP_REASON),
+            }
+
+        if self.high_price < self.band_top:
+            text = "트레일링스탑: 수익률 8% 미만으로 하락"
+        else:
+            text = "트레일링스탑: 고점 대비 4% 하락"
+        return target, {"매도가": target, "매도사유": text}
@@ -0,0 +1,187 @@
+"""
+체결 후 세션 대조(reconciliation) 큐 모듈
+
+매수 주문이 끝나면 세션은 주문 응답/추적 체결로 잠정 반영하고, 잔고 기준 확정은 이 큐가 백그라운드에서 처리합니다.
+- 대기 중인 작업을 예정 시각 순으로 모아, 한 번의 잔고 조회로 여러 세션을 함께 대조 (일괄 반영)
+- 잔고에 종목이 아직 없으면 min_delay부터 2배씩 max_delay까지 늘려 재시도, max_attempts회 후 포기
+- 잔고 조회와 대기 중에는 세션 락/DB 연결을 잡지 않음 (반영 콜백만 짧게 DB를 사용)
+
+잔고 조회/DB 반영 방식은 호출 측(TradingUpper)이 콜백으로 넘깁니다.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from config.condition import SESSION_RECONCILE_MIN_DELAY, SESSION_RECONCILE_MAX_DELAY, SESSION_RECONCILE_MAX_ATTEMPTS
+
+
+class ReconcileJob:
+    """대조 대기 중인 세션 1건"""
+
+    def __init__(self, session, order_result, provisional=None, increment_count=True):
+        self.session = session
+        self.order_result = order_result
+        self.provisional = provisional    # 잠정 반영한 (보유수량, 매입금액, 평균단가), 없으면 None
+        self.increment_count = increment_count
+        self.attempts = 0
+        self.created = time.monotonic()
+
+    @property
+    def ticker(self):
+        return self.session.get('ticker')
+
+    def __repr__(self):
+        return f"ReconcileJob(세션={self.session.get('id')}, 종목={self.ticker}, 시도={self.attempts}, 잠정={self.provisional})"
+
+
+class SessionReconciler:
+    """잔고 대조 백그라운드 큐 (스레드 안전, 작업 스레드 1개)"""
+
+    def __init__(self, fetch_balance, apply_batch, on_give_up=None, logger=None,
+                 min_delay=SESSION_RECONCILE_MIN_DELAY, max_delay=SESSION_RECONCILE_MAX_DELAY,
+                 max_attempts=SESSION_RECONCILE_MAX_ATTEMPTS):
+        """
+        Args:
+            fetch_balance: 잔고 목록 조회 함수 (작업 스레드에서 호출, pdno/hldg_qty/pchs_amt/pchs_avg_pric 항목 리스트)
+            apply_batch: [(ReconcileJob, 잔고 항목)]을 한 번에 반영하는 함수
+            on_give_up: 최대 시도 후에도 잔고에 없는 작업 처리 함수
+            logger: TradingLogger (없으면 print)
+            min_delay (float): 첫 조회 대기(초). 같은 시간대에 들어온 작업을 한 번에 조회하는 묶음 창 역할도 함
+            max_delay (float): 재시도 최대 대기(초)
+            max_attempts (int): 최대 조회 횟수
+        """
+        self.fetch_balance = fetch_balance
+        self.apply_batch = apply_batch
+        self.on_give_up = on_give_up
+        self.logger = logger
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self._condition = threading.Condition()
+        self._queue = []                  # (예정 시각, 순번, ReconcileJob)
+        self._sequence = itertools.count()
+        self._busy = 0                    # 작업 스레드가 처리 중인 작업 수
+        self._thread = None
+        self._stopped = False
+        self.stats = {"submitted": 0, "reconciled": 0, "given_up": 0, "balance_calls": 0}
+
+    def _log(self, level, message, context=None):
+        if self.logger:
+            getattr(self.logger, level)(message, context)
+        else:
+            print(message, context or "")
+
+    def _delay(self, attempts):
+        return min(self.min_delay * (2 ** attempts), self.max_delay)
+
+    def submit(self, session, order_result, provisional=None, increment_count=True):
+        """
+        대조 작업 등록 (즉시 반환)
+
+        Returns:
+            ReconcileJob
+        """
+        job = ReconcileJob(dict(session), order_result, provisional, increment_count)
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="session-reconciler", daemon=True)
+                self._thread.start()
+            heapq.heappush(self._queue, (time.monotonic() + self.min_delay, next(self._sequence), job))
+            self.stats["submitted"] += 1
+            self._condition.notify_all()
+        return job
+
+    def _take_due(self):
+        """예정 시각이 된 작업을 모두 꺼냄 (없으면 다음 예정 시각까지 대기). 중지 시 None"""
+        with self._condition:
+            while not self._stopped:
+                if self._queue:
+                    wait = self._queue[0][0] - time.monotonic()
+                    if wait <= 0:
+                        now = time.monotonic()
+                        due = []
+                        while self._queue and self._queue[0][0] <= now:
+                            due.append(heapq.heappop(self._queue)[2])
+                        self._busy = len(due)
+                        return due
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+            return None
+
+    def _run(self):
+        while True:
+            due = self._take_due()
+            if due is None:
+                return
+            try:
+                self._process(due)
+            except Exception as e:
+                self._log("error", f"세션 대조 처리 실패: {e}", {"jobs": [repr(job) for job in due]})
+                self._reschedule(due, "세션 대조 처리 실패")
+            finally:
+                with self._condition:
+                    self._busy = 0
+                    self._condition.notify_all()
+
+    def _process(self, jobs):
+        """예정된 작업들을 한 번의 잔고 조회로 대조"""
+        for job in jobs:
+            job.attempts += 1
+        self.stats["balance_calls"] += 1
+        balance = {}
+        try:
+            for item in self.fetch_balance() or []:
+                balance[item.get('pdno')] = item
+        except Exception as e:
+            self._log("warning", f"잔고 조회 중 오류: {e}", {"jobs": len(jobs)})
+
+        resolved = [(job, balance[job.ticker]) for job in jobs if job.ticker in balance]
+        pending = [job for job in jobs if job.ticker not in balance]
+        if resolved:
+            self.apply_batch(resolved)
+            self.stats["reconciled"] += len(resolved)
+            self._log("info", f"세션 대조 반영 {len(resolved)}건",
+                      {"sessions": [job.session.get('id') for job, _ in resolved]})
+
+        given_up = [job for job in pending if job.attempts >= self.max_attempts]
+        for job in given_up:
+            self.stats["given_up"] += 1
+            self._log("warning", "잔고 대조 최대 재시도 초과", {"job": repr(job)})
+            if self.on_give_up:
+                self.on_give_up(job)
+        self._reschedule([job for job in pending if job.attempts < self.max_attempts], "종목 잔고 정보 없음")
+
+    def _reschedule(self, jobs, reason):
+        """작업 재예약 (reason: 재시도 사유)"""
+        with self._condition:
+            for job in jobs:
+                self._log("info", f"{reason}: {job.ticker} (재시도 {job.attempts}/{self.max_attempts})",
+                          {"세션ID": job.session.get('id')})
+                heapq.heappush(self._queue, (time.monotonic() + self._delay(job.attempts), next(self._sequence), job))
+            self._condition.notify_all()
+
+    @property
+    def pending(self):
+        """대기/처리 중인 작업 수"""
+        with self._condition:
+            return len(self._queue) + self._busy
+
+    def drain(self, timeout=None):
+        """
+        대기 중인 작업이 모두 끝날 때까지 대기
+
+        Returns:
+            bool: 모두 끝났으면 True
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._busy, timeout=timeout)
+
+    def stop(self):
+        """작업 스레드 중지 (대기 중인 작업은 버림)"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
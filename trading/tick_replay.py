@@ -0,0 +1,323 @@
+"""
+틱 리플레이 엔진
+
+기록된 프레임(utils.tick_recorder) 또는 합성 프레임을 네트워크 없이 KISWebSocket의 디스패치 경로에 흘려보내
+_monitor_ticker / sell_condition 매도 로직을 그대로 실행합니다.
+- 시뮬레이션 시계(utils.clock.SimulatedClock)로 장 시간/15:10 기간만료 판단을 프레임 수신 시각 기준으로 처리
+- 매도 주문은 가상 실행기(ReplayBroker)로 전달되어 기록만 됨
+- 1배속, N배속, 최대 속도(speed=None) 재생 지원
+
+사용 예 (벤치마크):
+    python -m trading.tick_replay --date 2025-06-02 --session 005930:10:70000
+    python -m trading.tick_replay --synthetic 200000 --session 005930:10:70000
+    python -m trading.tick_replay --synthetic 200000 --session 005930:10:70000 --loop asyncio,uvloop
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from api.kis_websocket import KISWebSocket
+from api.kis_realtime_feed import TR_TRADE, feed_type_for, tr_ids_for
+from config.condition import KRX_TRADING_START
+from utils.clock import SimulatedClock
+from utils.event_loop import loop_name, run as run_in_loop
+from utils.market_clock import OPEN, EXPIRY_WINDOW
+from utils.stats import percentile
+from utils.tick_recorder import frame_ticker, read_ticks, tick_files
+
+
+@dataclass
+class ReplaySell:
+    """가상 매도 체결 1건"""
+    time: datetime
+    session_id: int
+    ticker: str
+    price: int
+    quantity: int
+    avr_price: int
+
+    @property
+    def profit_ratio(self):
+        return self.price / self.avr_price if self.avr_price else 0
+
+
+@dataclass
+class ReplayResult:
+    """리플레이 결과"""
+    frames: int = 0
+    dispatched: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+    sells: List[ReplaySell] = field(default_factory=list)
+    # 프레임별 디스패치 → 매도 판단 완료까지 걸린 시간(마이크로초)
+    latencies_us: List[float] = field(default_factory=list)
+    loop: str = ""
+
+    @property
+    def ticks_per_second(self):
+        return self.dispatched / self.elapsed if self.elapsed > 0 else 0.0
+
+    def latency_percentile(self, percent):
+        return percentile(self.latencies_us, percent)
+
+
+class ReplayBroker:
+    """
+    리플레이용 가상 계좌/세션 저장소/매도 실행기
+
+    KISWebSocket에 kis_api(balance_inquiry), session_store(세션 조회/삭제/갱신), 매도 콜백으로 주입됩니다.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        # 세션ID -> 세션 dict
+        self.sessions = {}
+        self.sells: List[ReplaySell] = []
+
+    def open_session(self, session_id, ticker, name, quantity, avr_price, start_date, trade_condition=None):
+        self.sessions[session_id] = {
+            "id": session_id,
+            "ticker": ticker,
+            "name": name,
+            "quantity": int(quantity),
+            "avr_price": int(avr_price),
+            "start_date": start_date,
+            "trade_condition": trade_condition,
+        }
+
+    # ---------- KISApi 대체 ----------
+    def balance_inquiry(self):
+        return [
+            {"pdno": s["ticker"], "hldg_qty": str(s["quantity"]), "pchs_avg_pric": str(s["avr_price"])}
+            for s in list(self.sessions.values())
+        ]
+
+    # ---------- SessionStore 대체 ----------
+    def get(self, session_id):
+        return self.sessions.get(session_id)
+
+    def all(self, ticker=None):
+        return [s for s in self.sessions.values() if ticker is None or s["ticker"] == ticker]
+
+    def delete(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def update(self, session_id, **fields):
+        session = self.sessions.get(session_id)
+        if session:
+            session.update(quantity=int(fields.get("quantity", session["quantity"])),
+                           avr_price=int(fields.get("avr_price", session["avr_price"])))
+        return session
+
+    # ---------- 매도 콜백 (TradingUpper.sell_order 대체) ----------
+    def sell_order(self, session_id, ticker, price=None, trace=None):
+        if trace is not None:
+            trace.mark("order_start")
+            trace.mark("order_sent")
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return {"rt_cd": "1", "msg1": "세션 없음"}
+        self.sells.append(ReplaySell(
+            time=self.clock.now(),
+            session_id=session_id,
+            ticker=ticker,
+            price=int(price or 0),
+            quantity=session["quantity"],
+            avr_price=session["avr_price"],
+        ))
+        if trace is not None:
+            trace.mark("order_acked")
+        return {"rt_cd": "0", "output": {"ODNO": str(len(self.sells))}}
+
+
+class TickReplay:
+    """기록/합성 프레임으로 매도 모니터를 재생"""
+
+    def __init__(self, frames: Iterable[Tuple[int, str]], sessions, speed: Optional[float] = None):
+        """
+        Args:
+            frames: (수신시각 ns, 원본 프레임) 목록. 시각 순으로 정렬되어 있어야 함
+            sessions: get_session_info_upper 형식의 세션 튜플 목록
+                (id, ticker, name, quantity, avr_price, start_date, target_date, trade_condition)
+            speed: 재생 배속 (1.0 = 실시간, None = 최대 속도)
+        """
+        self.frames = frames
+        self.sessions = list(sessions)
+        self.speed = speed
+
+    async def run(self) -> ReplayResult:
+        result = ReplayResult(loop=loop_name(asyncio.get_running_loop()))
+        frames = iter(self.frames)
+        first = next(frames, None)
+        if first is None:
+            return result
+
+        clock = SimulatedClock(datetime.fromtimestamp(first[0] / 1e9))
+        broker = ReplayBroker(clock)
+        ws = KISWebSocket(callback=broker.sell_order, db_manager=broker, kis_api=broker, clock=clock, session_store=broker)
+        ws.background_tasks = set()
+
+        # 웹소켓 구독 없이 종목별 큐와 모니터 태스크만 구성
+        tasks = {}
+        for session in self.sessions:
+            session_id, ticker, name, quantity, avr_price, start_date, target_date, trade_condition = session
+            broker.open_session(session_id, ticker, name, quantity, avr_price, start_date, trade_condition)
+            ws.subscribed_tickers.add(ticker)
+            # 세션 종료 시 구독 조정이 남은 종목의 피드를 다시 등록하지 않도록 세션과 같은 피드로 표시
+            ws.ticker_feeds[ticker] = tr_ids_for(feed_type_for(trade_condition))
+            ws.ticker_queues[ticker] = asyncio.Queue()
+            ws._refresh_routes()
+            tasks[ticker] = asyncio.create_task(
+                ws._monitor_ticker(session_id, ticker, name, quantity, avr_price, target_date, trade_condition)
+            )
+
+        started = time.perf_counter()
+        base_ts = first[0]
+        for ts_ns, frame in _chain(first, frames):
+            result.frames += 1
+            if self.speed:
+                delay = started + (ts_ns - base_ts) / 1e9 / self.speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            clock.set(datetime.fromtimestamp(ts_ns / 1e9))
+            # 체결통보(암호화), 구독 해제된 종목, 장 시간 외 프레임은 매도 판단 대상이 아님
+            if (
+                not frame.startswith("0|")
+                or frame_ticker(frame) not in ws.subscribed_tickers
+                or ws.market_clock.refresh() not in (OPEN, EXPIRY_WINDOW)
+            ):
+                result.skipped += 1
+                continue
+
+            dispatch_started = time.perf_counter_ns()
+            await ws._dispatch_frame(None, frame)
+            result.dispatched += 1
+            await self._drain(ws, tasks)
+            result.latencies_us.append((time.perf_counter_ns() - dispatch_started) / 1000)
+
+            if all(task.done() for task in tasks.values()):
+                break
+
+        result.elapsed = time.perf_counter() - started
+
+        clock.release_all()
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        result.sells = broker.sells
+        return result
+
+    @staticmethod
+    async def _drain(ws, tasks):
+        """
+        모니터가 큐에 쌓인 프레임을 모두 처리(매도 실행 포함)하고 다시 큐 대기 상태가 될 때까지 양보
+        (_monitor_ticker는 wait_for로 get하므로 큐가 비는 시점과 판단이 끝나는 시점이 다름)
+        """
+        def busy(ticker, task):
+            queue = ws.ticker_queues.get(ticker)
+            if task.done() or queue is None:
+                return False
+            return not queue.empty() or not getattr(queue, "_getters", None)
+
+        while any(busy(ticker, task) for ticker, task in tasks.items()):
+            await asyncio.sleep(0)
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+######################################################################################
+###############################    프레임 소스   #####################################
+######################################################################################
+
+def recorded_frames(record_dir, day, tickers=None):
+    """기록된 일자 파일의 프레임 (tickers 지정 시 해당 종목만)"""
+    for path in tick_files(record_dir):
+        if path.stem == f"ticks_{day}":
+            return read_ticks(path, tickers)
+    raise FileNotFoundError(f"{record_dir}에 {day} 기록이 없습니다.")
+
+
+def synthetic_frames(ticker, start_price, count, day=None, interval=0.05, volatility=0.002, seed=None):
+    """
+    랜덤워크 체결가(H0STCNT0) 프레임 생성
+
+    Args:
+        ticker (str): 종목코드
+        start_price (int): 시작 가격
+        count (int): 프레임 수
+        day (date): 거래일 (기본: 오늘)
+        interval (float): 프레임 간격(초)
+        volatility (float): 틱당 가격 변동 표준편차 비율
+    """
+    rng = random.Random(seed)
+    day = day or date.today()
+    start = datetime.combine(day, KRX_TRADING_START) + timedelta(seconds=1)
+    base_ns = int(start.timestamp() * 1e9)
+    price = start_price
+    acc_volume = 0
+    for i in range(count):
+        price = max(1, int(price * (1 + rng.gauss(0, volatility))))
+        volume = rng.randint(1, 100)
+        acc_volume += volume
+        ts_ns = base_ns + int(i * interval * 1e9)
+        fields = ["0"] * 46
+        fields[0] = ticker
+        fields[1] = datetime.fromtimestamp(ts_ns / 1e9).strftime("%H%M%S")
+        fields[2] = str(price)
+        fields[10] = str(price + 1)
+        fields[11] = str(price)
+        fields[12] = str(volume)
+        fields[13] = str(acc_volume)
+        yield ts_ns, f"0|{TR_TRADE}|001|" + "^".join(fields)
+
+
+def _parse_session(index, spec, day, target_date):
+    """TICKER:QTY:AVG[:TRADE_CONDITION] 형식의 세션 지정 파싱"""
+    parts = spec.split(":")
+    ticker, quantity, avr_price = parts[0], int(parts[1]), int(parts[2])
+    trade_condition = parts[3] if len(parts) > 3 else "normal"
+    start_date = datetime.combine(day - timedelta(days=1), KRX_TRADING_START)
+    return (index, ticker, ticker, quantity, avr_price, start_date, target_date, trade_condition)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="틱 리플레이 / 매도 모니터 벤치마크")
+    parser.add_argument("--dir", default="ticks", help="틱 기록 디렉토리")
+    parser.add_argument("--date", help="재생할 기록 일자 (YYYY-MM-DD)")
+    parser.add_argument("--synthetic", type=int, help="합성 프레임 수 (기록 대신 사용)")
+    parser.add_argument("--session", action="append", required=True, help="TICKER:QTY:AVG[:TRADE_CONDITION]")
+    parser.add_argument("--target-date", help="강제 매도 기준일 (기본: 재생 일자, 기간만료 미발생)")
+    parser.add_argument("--speed", type=float, help="재생 배속 (미지정 시 최대 속도)")
+    parser.add_argument("--loop", default="asyncio", help="이벤트 루프 (asyncio, uvloop 또는 쉼표로 여러 개 비교)")
+    args = parser.parse_args()
+
+    replay_day = date.fromisoformat(args.date) if args.date else date.today()
+    target = date.fromisoformat(args.target_date) if args.target_date else replay_day
+    sessions = [_parse_session(i + 1, spec, replay_day, target) for i, spec in enumerate(args.session)]
+
+    def make_source():
+        if args.synthetic:
+            first = sessions[0]
+            return synthetic_frames(first[1], first[4], args.synthetic, day=replay_day, seed=0)
+        return recorded_frames(args.dir, replay_day.isoformat(), [s[1] for s in sessions])
+
+    # 이벤트 루프별로 같은 프레임을 재생하여 처리량/지연 비교
+    for policy in args.loop.split(","):
+        replay_result = run_in_loop(TickReplay(make_source(), sessions, speed=args.speed).run(), policy.strip())
+        print(f"[{replay_result.loop}] 프레임 {replay_result.frames}건 "
+              f"(처리 {replay_result.dispatched}, 제외 {replay_result.skipped})")
+        print(f"  소요 {replay_result.elapsed:.3f}초, 처리량 {replay_result.ticks_per_second:,.0f} ticks/s, "
+              f"지연 p50 {replay_result.latency_percentile(50):.1f}us / "
+              f"p99 {replay_result.latency_percentile(99):.1f}us")
+        for sell in replay_result.sells:
+            print(f"  매도 {sell.time:%H:%M:%S} {sell.ticker} {sell.quantity}주 @ {sell.price:,} "
+                  f"(평단 {sell.avr_price:,}, 수익률 {(sell.profit_ratio - 1) * 100:.2f}%)")
@@ -14,14 +14,30 @@ from utils.trading_logger import TradingLogger
 from api.kis_api import KISApi
 from api.krx_api import KRXApi
 from api.kis_websocket import KISWebSocket
-from config.condition import DAYS_LATER_UPPER, BUY_PERCENT_UPPER, BUY_WAIT, SELL_WAIT, COUNT_UPPER, SLOT_UPPER, UPPER_DAY_AGO_CHECK, BUY_DAY_AGO_UPPER, PRICE_BUFFER
+from api.kis_execution_notice import execution_hub
+from utils.latency_tracer import Trace
+from config.condition import DAYS_LATER_UPPER, BUY_PERCENT_UPPER, BUY_WAIT, SELL_WAIT, COUNT_UPPER, SLOT_UPPER, UPPER_DAY_AGO_CHECK, BUY_DAY_AGO_UPPER, PRICE_BUFFER, SCREENING_WORKERS, MAX_BUY_REVISIONS
+from config.environment_config import is_mock
+from utils.rate_limiter import kis_rate_limiter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from trading.ohlcv_kernels import high_history_ok, last_high, d1_return, STRONG_MOMENTUM_RETURN
+from database.stock_master import StockMaster
+from database.session_store import session_store
+from trading.order_manager import OrderManager, REJECTED, FAILED, STATE_NAMES
+from trading.session_reconciler import SessionReconciler
+from trading.screening_pipeline import ScreeningPipeline, Source, Stage, COST_CACHED, COST_HISTORY, COST_LIVE
 import threading
 from typing import List, Dict, Optional, Union
 from threading import Lock
 from collections import deque
+import numpy as np
 import pandas as pd
 
 
+# 매도 주문 거부 메시지 중 보유(주문가능)수량 부족을 나타내는 문구
+INSUFFICIENT_QTY_MESSAGE = '가능수량'
+
+
 class TradingUpper():
     """
     트레이딩과 관련된 로직들. main에는 TradinLogic 클래스만 있어야 함.
@@ -38,7 +54,18 @@ class TradingUpper():
         self.kis_websocket = None
         self.session_lock = Lock()  # 세션 업데이트용 락
         self.api_lock = Lock()  # API 호출용 락
-        # 모니터링 루프 참조 (MainProcess에서 주입)
+        self.order_manager = OrderManager(logger=self.logger)  # 주문 상태 추적/체결 대기
+        self.session_store = session_store  # 거래 세션 메모리 저장소 (KISWebSocket과 공유, DB는 지연 저장)
+        # 매수 후 잔고 대조 큐 (잔고 조회는 큐 스레드의 KISApi 사용)
+        self.session_reconciler = SessionReconciler(
+            fetch_balance=lambda: self.order_manager.api().balance_inquiry(),
+            apply_batch=self._apply_reconciled,
+            on_give_up=self._on_reconcile_give_up,
+            logger=self.logger,
+        )
+        self._screening_local = threading.local()  # 매수 후보 선별 스레드별 KISApi
+        self.stock_master = StockMaster()  # 종목 마스터 캐시 (상장일 등 정적 정보)
+        # 모니터링 루프 참조 (MainProcess에서 EVENT_LOOP_POLICY에 따라 생성한 asyncio/uvloop 루프 주입)
         self._monitor_loop: Optional[asyncio.AbstractEventLoop] = None
 
 ######################################################################################
@@ -85,6 +112,12 @@ class TradingUpper():
             self.logger.info(f"상승 종목 데이터 저장", {"date": date_str, "count": len(stocks_info)})
             db.save_upper_stocks(date_str, stocks_info)
             print(date_str, stocks_info)
+            # 선별일 아침에 상장일 조회가 캐시 조회로 끝나도록 후보 종목 상세 정보를 미리 저장
+            try:
+                refreshed = self.stock_master.warm_details([info[0] for info in stocks_info], self.kis_api)
+                self.logger.info("종목 마스터 상세 정보 갱신", {"count": len(refreshed)})
+            except Exception as e:
+                self.logger.warning(f"종목 마스터 상세 정보 갱신 실패: {e}")
         else:
             no_data_msg = "상승 종목이 없습니다."
             print(no_data_msg)
@@ -126,99 +159,207 @@ class TradingUpper():
     def select_stocks_to_buy(self):
         """
         2일 전 상한가 종목의 가격과 현재가를 비교하여 매수할 종목을 선정(선별)합니다.
+        매수 조건은 비용 순 선별 파이프라인(trading.screening_pipeline)으로 평가해 처음 실패한 조건에서 멈추고,
+        후보들은 SCREENING_WORKERS개 스레드에서 동시에 처리합니다(KIS REST 호출은 앱키별 공유 호출 한도 준수).
+        전날 밤 사전 선별(precompute_screening) 결과가 있으면 그 종목의 실시간 조건(조건2, 조건5)만 확인합니다.
         """
         db = DatabaseManager()
         
         # # 이전 selected_stocks 정보 삭제
         self.init_selected_stocks()
         
-        selected_stocks = []
-        tickers_with_prices = db.get_upper_stocks_days_ago(BUY_DAY_AGO_UPPER) or []  # N일 전 상승 종목 가져오기
+        prequalified = db.load_prequalified_stocks(datetime.now().date())
+        if prequalified is not None:
+            self.logger.info(f"[매수 후보 선별] 사전 선별 종목 {len(prequalified)}개의 실시간 조건만 확인")
+            tickers_with_prices, mode = prequalified, "live"
+        else:
+            tickers_with_prices = db.get_upper_stocks_days_ago(BUY_DAY_AGO_UPPER) or []  # N일 전 상승 종목 가져오기
+            mode = "full"
         print('tickers_with_prices:  ',tickers_with_prices)
+
+        selected_stocks, _ = self._run_screening(tickers_with_prices, mode)
+      
+        # 선택된 종목을 selected_stocks 테이블에 저장
+        if selected_stocks:
+            db.save_selected_stocks(selected_stocks)  # 선택된 종목 저장
+
+        db.close()
+        
+        return selected_stocks
+
+    def precompute_screening(self, target_date: Optional[date] = None):
+        """
+        야간 사전 선별: 다음 영업일 선별 대상 중 전일 마감 후 확정되는 조건(조건1, 조건4, 조건6)을 미리 평가해
+        통과 종목과 조건2 기준 고가를 저장합니다. (상승 종목 저장 직후 실행)
+        확인 중 오류가 난 후보가 있으면 결과를 저장하지 않아, 다음 날 아침 전체 조건(full)으로 다시 선별합니다.
+
+        Args:
+            target_date (date): 선별일 (기본: 다음 영업일)
+        """
+        target_date = target_date or self.date_utils.get_target_date(datetime.now(), 1)
+        upper_date = self.date_utils.get_previous_business_day(target_date, BUY_DAY_AGO_UPPER)
+
+        db = DatabaseManager()
+        try:
+            candidates = db.get_upper_stocks_on(upper_date) or []
+            qualified, errored = self._run_screening(candidates, "static", base_date=target_date)
+            if errored:
+                # 오류 종목을 탈락으로 저장하면 아침 선별에서 빠지므로 사전 선별 결과를 남기지 않음
+                self.logger.warning(
+                    f"[사전 선별] 선별일 {target_date} 후보 {len(errored)}개 확인 실패, 사전 선별 결과 저장 생략 (아침 전체 선별)",
+                    {"tickers": [stock.get('ticker') for stock in errored]},
+                )
+                return qualified
+            db.save_prequalified_stocks(target_date, len(candidates), qualified)
+            self.logger.info(
+                f"[사전 선별] 선별일 {target_date} 후보 {len(candidates)}개 중 {len(qualified)}개 통과",
+                {"tickers": [stock.get('ticker') for stock in qualified]},
+            )
+        finally:
+            db.close()
+        return qualified
+
+    def _run_screening(self, tickers_with_prices, mode, base_date: Optional[date] = None) -> tuple:
+        """
+        후보 목록을 선별 파이프라인으로 동시 평가 (결과는 후보 순서 유지)
+
+        Args:
+            tickers_with_prices (list[dict]): 후보 종목
+            mode (str): full(전체 조건) / static(야간 사전 선별) / live(사전 선별 종목의 실시간 조건)
+            base_date (date): OHLCV 기준일 (야간 사전 선별 시 선별일)
+
+        Returns:
+            tuple: (통과 종목 목록, 확인 중 오류가 난 종목 목록)
+        """
+        candidates = []
         for stock in tickers_with_prices:
             if stock is None:
                 self.logger.warning("종목 정보가 None 입니다. 건너뜁니다.")
                 continue
-            ticker = stock.get('ticker')
-            if not ticker:
+            if not stock.get('ticker'):
                 self.logger.warning(f"{stock} ticker 정보 누락, 건너뜁니다.")
                 continue
+            candidates.append(stock)
 
+        pipeline = self._build_screening_pipeline(mode, base_date)
+        limiter = kis_rate_limiter(is_mock())
+        waited_before = limiter.waited
+        started = time.perf_counter()
+        workers = max(1, min(SCREENING_WORKERS, len(candidates)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screening") as pool:
+            results = list(pool.map(lambda stock: self._screen_candidate(pipeline, stock, mode), candidates))
+        wall_time = time.perf_counter() - started
 
-            ### 조건1: 상승일 기준 10일 전까지 고가 20% 넘은 이력 여부 체크
-            df = self.krx_api.get_OHLCV(stock.get('ticker'), UPPER_DAY_AGO_CHECK, BUY_DAY_AGO_UPPER) # D+2일 8시55분에 실행이라 10일
-            # 데이터프레임에서 최하단 2개 행을 제외
-            filtered_df = df.iloc[:-2]
-              # 종가 대비 다음날 고가의 등락률 계산
-            percentage_diff = []
-            for i in range(len(filtered_df)-1):
-                close_price = filtered_df.iloc[i]['종가']
-                next_day_high = filtered_df.iloc[i+1]['고가']
-                percent_change = ((next_day_high - close_price) / close_price) * 100
-                percentage_diff.append(percent_change)
-              # 결과를 데이터프레임으로 만들고 포맷팅
-            result_df = pd.DataFrame({'등락률': percentage_diff}, index=filtered_df.index[:-1])
-              # 등락률이 20% 이상인 값이 있으면 False, 없으면 True를 리턴
-            result_high_price = not (result_df['등락률'] >= 20).any()
-            
-            
-            ### 조건2: 상승일 고가 - 매수일 현재가 -7.5% 체크 -> 매수하면서 체크
-            last_high_price = df['고가'].iloc[-2]
-            result_decline = False
-            current_price_opt, trht_yn = self.kis_api.get_current_price(stock.get('ticker'))
-            if current_price_opt is None:
-                # 가격 조회 실패 시 건너뛰거나 기본 처리
-                self.logger.warning(f"{stock.get('ticker')} 현재가 조회 실패")
-                continue
-
-            current_price = int(current_price_opt)
-            if current_price > last_high_price * BUY_PERCENT_UPPER:
-                result_decline = True
-            
-                
-            ### 조건3: 상승일 거래량 대비 다음날 거래량 20% 이상 체크
-            result_volume = self.get_volume_check(stock.get('ticker'))
-            
-            
-            ### 조건4: 상장일 이후 1년 체크
-            result_lstg = self.check_listing_date(stock.get('ticker'))
-            
-            ### 조건5: 과열 및 거래정지 종목 제외 체크
-            stock_info = self.kis_api.get_stock_price(stock.get('ticker'))
-            result_short_over_yn = stock_info.get('output', {}).get('short_over_yn', 'N')
-            result_trht_yn = stock_info.get('output', {}).get('trht_yn', 'N')
-            if result_short_over_yn == 'N' and result_trht_yn == 'N':
-                result_possible = True
-            else:
-                result_possible = False
-            
-            # 조건6: 강화된 모멘텀 확인 (D+1 수익률 10% 이상)
-            result_strong_momentum = self._check_strong_momentum(stock, df)
-
-            # 모든 매수 조건 충족 시 후보 목록에 추가
-            print(stock.get('name'))
-            print('조건1: 상승일 기준 10일 전까지 고가 20% 넘지 않은은 이력 여부 체크:',result_high_price)
-            print('조건2: 상승일 고가 - 매수일 현재가 = -7.5% 체크:',result_decline)
-            # print('조건3: 상승일 거래량 대비 다음날 거래량 20% 이상 체크:',result_volume)
-            print('조건4: 상장일 이후 1년 체크:',result_lstg)
-            print('조건5: 과열 종목 제외 체크:',result_possible)
-            
-            
-            # if result_high_price and result_decline and result_lstg and result_possible and result_volume:
-            if result_high_price and result_decline and result_lstg and result_possible:
-                # 거래 조건 설정
-                stock['trade_condition'] = 'strong_momentum' if result_strong_momentum else 'normal'
-                
+        selected_stocks = []
+        errored_stocks = []
+        timings = []
+        for stock, (selected, lines, elapsed) in zip(candidates, results):
+            if selected is None:
+                errored_stocks.append(stock)
+            for line in lines:
+                print(line)
+            timings.append(f"{stock.get('name')}({stock.get('ticker')}) {elapsed:.2f}s")
+            if selected:
                 self.logger.info(f"[매수 후보 선정] 종목: {stock.get('name')}({stock.get('ticker')}), 조건: {stock.get('trade_condition')}")
                 selected_stocks.append(stock)
-      
-        # 선택된 종목을 selected_stocks 테이블에 저장
-        if selected_stocks:
-            db.save_selected_stocks(selected_stocks)  # 선택된 종목 저장
 
-        db.close()
-        
-        return selected_stocks
+        self.logger.info(
+            f"[매수 후보 선별:{mode}] {len(candidates)}종목 {wall_time:.2f}s (스레드 {workers}개)",
+            {
+                "후보별 소요": timings,
+                "후보별 합계": round(sum(elapsed for _, _, elapsed in results), 2),
+                "확인 실패": [stock.get('ticker') for stock in errored_stocks],
+                "호출 한도 대기": round(limiter.waited - waited_before, 2),
+                "조건별 통계": pipeline.snapshot(),
+            },
+        )
+        return selected_stocks, errored_stocks
+
+    def _screening_api(self) -> KISApi:
+        """선별 스레드별 KISApi (headers를 요청마다 덮어쓰므로 스레드 간 공유 불가)"""
+        kis_api = getattr(self._screening_local, "kis_api", None)
+        if kis_api is None:
+            kis_api = self._screening_local.kis_api = KISApi()
+        return kis_api
+
+    def _build_screening_pipeline(self, mode: str = "full", base_date: Optional[date] = None) -> ScreeningPipeline:
+        """
+        매수 조건 파이프라인 구성
+
+        데이터 소스 비용: 상장일(종목 마스터 캐시) < OHLCV(로컬 일봉 저장소) < 현재가(KIS 실시간)
+        조건3(거래량)은 선정에 쓰지 않아 제외, 조건6(강화된 모멘텀)은 통과 종목의 매매 조건 표시에만 사용
+
+        Args:
+            mode (str): full(전체 조건) / static(전일 마감 후 확정되는 조건) / live(사전 선별 종목의 실시간 조건)
+            base_date (date): OHLCV 기준일 (기본: 오늘)
+        """
+        sources = [
+            Source("listing", COST_CACHED, lambda stock: self.stock_master.listing_date(stock['ticker'], self._screening_api())),
+            # D+2일 8시55분에 실행이라 10일
+            Source("ohlcv", COST_HISTORY, lambda stock: self.krx_api.get_OHLCV(stock['ticker'], UPPER_DAY_AGO_CHECK, BUY_DAY_AGO_UPPER, base_date)),
+            # 현재가(조건2)와 과열/거래정지 여부(조건5)는 같은 시세 응답 한 번으로 확인
+            Source("quote", COST_LIVE, lambda stock: (self._screening_api().get_stock_price(stock['ticker']) or {}).get('output') or {}),
+        ]
+        high_history = Stage("high_history", self._screen_high_history, needs=("ohlcv",),
+                             label="조건1: 상승일 기준 10일 전까지 고가 20% 넘지 않은은 이력 여부 체크")
+        # 사전 선별 종목은 기준 고가(last_high)를 저장해 두므로 실시간 시세만 필요
+        decline = Stage("decline", self._screen_decline, needs=("quote",) if mode == "live" else ("ohlcv", "quote"),
+                        label="조건2: 상승일 고가 - 매수일 현재가 = -7.5% 체크")
+        listing_date = Stage("listing_date", lambda ctx: self._listing_date_passed(ctx["listing"]), needs=("listing",),
+                             label="조건4: 상장일 이후 1년 체크")
+        tradable = Stage("tradable", self._screen_tradable, needs=("quote",),
+                         label="조건5: 과열 종목 제외 체크")
+        stages = {
+            "full": [high_history, decline, listing_date, tradable],
+            "static": [high_history, listing_date],
+            "live": [decline, tradable],
+        }[mode]
+        return ScreeningPipeline(sources, stages)
+
+    def _screen_high_history(self, ctx) -> bool:
+        """조건1: 상승일 기준 10일 전까지 고가 20% 넘은 이력 여부 체크"""
+        df = ctx["ohlcv"]
+        if df is None or df.empty:
+            # 빈 이력은 조건 통과가 아니라 확인 실패 (다음 선별에서 다시 조회)
+            raise ValueError("OHLCV 데이터 없음")
+        return bool(high_history_ok(df['종가'], df['고가']))
+
+    def _screen_decline(self, ctx) -> bool:
+        """조건2: 상승일 고가 - 매수일 현재가 -7.5% 체크"""
+        try:
+            current_price = int(ctx["quote"].get('stck_prpr'))
+        except (TypeError, ValueError):
+            current_price = 0
+        reference_high = ctx.stock.get('last_high') or last_high(ctx["ohlcv"]['고가'])
+        return bool(current_price > reference_high * BUY_PERCENT_UPPER)
+
+    def _screen_tradable(self, ctx) -> bool:
+        """조건5: 과열 및 거래정지 종목 제외 체크"""
+        quote = ctx["quote"]
+        return quote.get('short_over_yn', 'N') == 'N' and quote.get('trht_yn', 'N') == 'N'
+
+    def _screen_candidate(self, pipeline: ScreeningPipeline, stock: Dict, mode: str = "full") -> tuple:
+        """
+        후보 1종목의 매수 조건 확인 (선별 스레드에서 실행)
+
+        Returns:
+            tuple: (선정 여부 (확인 실패 시 None), 조건 출력 줄 목록, 소요 시간(초))
+        """
+        started = time.perf_counter()
+        try:
+            passed, results, ctx = pipeline.run(stock)
+            if passed and mode != "live":
+                # 조건6: 강화된 모멘텀 확인 (D+1 수익률 10% 이상) -> 거래 조건 설정 (사전 선별 종목은 저장된 값 사용)
+                result_strong_momentum = self._check_strong_momentum(stock, ctx["ohlcv"])
+                stock['trade_condition'] = 'strong_momentum' if result_strong_momentum else 'normal'
+                if mode == "static":
+                    stock['last_high'] = int(last_high(ctx["ohlcv"]['고가']))
+        except Exception as e:
+            self.logger.error(f"{stock.get('name')}({stock.get('ticker')}) 매수 조건 확인 실패: {e}")
+            return None, [], time.perf_counter() - started
+
+        lines = [stock.get('name'), *pipeline.describe(results)]
+        return passed, lines, time.perf_counter() - started
 
     def _check_strong_momentum(self, stock: Dict, df: pd.DataFrame) -> bool:
         """강화된 모멘텀 조건을 확인합니다 (D+1 수익률 10% 이상)."""
@@ -226,15 +367,12 @@ class TradingUpper():
             self.logger.warning(f"{stock.get('ticker')} OHLCV 데이터 부족 (3일 미만)으로 모멘텀 확인 불가")
             return False
 
-        day_0_close = df['종가'].iloc[-3]
-        day_1_close = df['종가'].iloc[-2]
-
-        if day_0_close <= 0:
+        day_1_return = float(d1_return(df['종가']))
+        if np.isnan(day_1_return):
             self.logger.warning(f"{stock.get('name')}, D+0 종가가 0 이하여서 수익률 계산 불가")
             return False
 
-        day_1_return = (day_1_close - day_0_close) / day_0_close
-        is_strong = day_1_return >= 0.10
+        is_strong = day_1_return >= STRONG_MOMENTUM_RETURN
 
         self.logger.info(f"[{stock.get('name')}] D+1 수익률: {day_1_return:.2%}, 강화된 모멘텀: {is_strong}")
         return is_strong
@@ -305,70 +443,108 @@ class TradingUpper():
             )
         try:
             # 거래 세션을 조회 및 검증
-            with DatabaseManager() as db:
-                sessions = db.load_trading_session_upper()
+            sessions = self.session_store.all()
             
-                if not sessions:
-                    print("start_trading_session - 진행 중인 거래 세션이 없습니다.")
-                    return
-                
-                print("세션 확인 완료:", sessions)
+            if not sessions:
+                print("start_trading_session - 진행 중인 거래 세션이 없습니다.")
+                return
+            
+            print("세션 확인 완료:", sessions)
 
-                # 주문 결과 리스트로 저장
-                sessions_que = deque(sessions)
-                order_lists = []
-                processed_sessions = []  # 처리 완료된 세션 추적
+            # 주문 결과 리스트로 저장
+            order_lists = []
+            processed_sessions = set()  # 처리 완료된 세션 추적
+            started = time.perf_counter()
+            slot_times = {}
 
-                while sessions_que:
-                    session = sessions_que.popleft()
+            # 슬롯별 주문(주문 → 체결 대기 → 세션 갱신)을 동시에 진행하고, 끝나는 순서대로 결과 처리
+            with ThreadPoolExecutor(max_workers=max(1, SLOT_UPPER), thread_name_prefix="buy-slot") as pool:
+                futures = {}
 
+                def submit(session):
                     # 이미 처리된 세션인지 확인
-                    if session["id"] in processed_sessions:
+                    if session["id"] in processed_sessions or any(s["id"] == session["id"] for s in futures.values()):
                         print(f"세션 ID {session['id']}는 이미 처리되었습니다.")
-                        continue
-                    
+                        return
                     # 2번 거래한 종목은 더이상 매수하지 않고 대기
                     if session.get("count") == COUNT_UPPER:
                         print(session.get('name'),"은 2번의 거래를 진행해 넘어갔습니다.")
-                        processed_sessions.append(session["id"])
-                        continue
-                    
+                        processed_sessions.add(session["id"])
+                        return
                     # 세션 정보로 주식 주문
                     print(f"세션 {session['id']} ({session['name']}, {session['ticker']}) 주문 시작")
-                    order_result = self.place_order_session_upper(session)
+                    futures[pool.submit(self._buy_session, session)] = session
 
-                    # 주문 불가 종목으로 재주문할 경우 501
-                    if order_result == 501:
-                        print(f"에러코드 501: 세션 {session['id']} ({session['name']}, {session['ticker']}) 삭제 후 새 종목 세션 추가")
-                        db.delete_session_one_row(session.get('id'))
-                        processed_sessions.append(session["id"])  # 처리 완료로 표시
+                for session in sessions:
+                    submit(session)
 
-                        # 새 종목 추가
-                        add_info = self.add_new_trading_session()
-                        self.logger.info(f"새 종목 추가: {add_info}")
-                        
-                        # 새로 추가된 세션만 가져오기
-                        new_sessions = db.load_trading_session_upper()
-                        if new_sessions:
-                            # 마지막 세션(가장 최근 추가된 세션) 확인
-                            new_session = new_sessions[-1]
-                            if new_session["id"] not in processed_sessions:
-                                print(f"새 세션 {new_session['id']} ({new_session['name']}, {new_session['ticker']}) 큐에 추가")
-                                sessions_que.append(new_session)
-                                # 아직 미처리 세션이므로 processed_sessions 에 추가하지 않음 (주문 후에 추가)
-                        # 다음 세션으로 진행
-                        continue
-
-                    if order_result:
-                        order_lists.append(order_result)
-                        processed_sessions.append(session["id"])
-                        continue
-                
-            # 모든 세션 처리 완료 후 결과 반환
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        session = futures.pop(future)
+                        processed_sessions.add(session["id"])
+                        try:
+                            order_result, elapsed = future.result()
+                        except Exception as e:
+                            # 한 슬롯의 실패로 나머지 슬롯 결과 처리를 중단하지 않음
+                            self.logger.error(f"세션 {session['id']} ({session['name']}, {session['ticker']}) 매수 실패: {e}")
+                            self.slack_logger.send_log(
+                                level="ERROR",
+                                message="매수 슬롯 주문 실패",
+                                context={"세션ID": session.get('id'), "종목코드": session.get('ticker'), "에러": str(e)}
+                            )
+                            continue
+                        slot_times[f"{session['name']}({session['ticker']})"] = round(elapsed, 2)
+
+                        # 주문 불가 종목으로 재주문할 경우 501
+                        if order_result == 501:
+                            print(f"에러코드 501: 세션 {session['id']} ({session['name']}, {session['ticker']}) 삭제 후 새 종목 세션 추가")
+                            self.session_store.delete(session.get('id'))
+
+                            # 새 종목 추가 (종목 할당은 이 스레드에서만 진행)
+                            add_info = self.add_new_trading_session()
+                            self.logger.info(f"새 종목 추가: {add_info}")
+                            
+                            # 새로 추가된 세션만 가져오기
+                            new_sessions = self.session_store.all()
+                            if new_sessions:
+                                # 마지막 세션(가장 최근 추가된 세션) 확인
+                                new_session = new_sessions[-1]
+                                print(f"새 세션 {new_session['id']} ({new_session['name']}, {new_session['ticker']}) 주문 추가")
+                                submit(new_session)
+                            continue
+
+                        if order_result:
+                            order_lists.append(order_result)
+
+            self.logger.info(
+                f"[매수 슬롯 주문 완료] {len(slot_times)}건 {time.perf_counter() - started:.2f}s",
+                {"슬롯별 소요": slot_times},
+            )
+            
+            # 모든 세션 처리 완료 후 결과 반환 (세션 갱신은 주문마다 완료 시점에 반영됨)
             return order_lists
         except Exception as e:
             print("Error in trading session: ", e)
 
+    def _buy_session(self, session: Dict) -> tuple:
+        """
+        슬롯 1개 매수 (매수 슬롯 스레드에서 실행): 주문 → 체결 대기 → 세션 갱신
+
+        Returns:
+            tuple: (주문 결과 또는 501, 소요 시간(초))
+        """
+        started = time.perf_counter()
+        order_result = self.place_order_session_upper(session)
+        if order_result and order_result != 501:
+            try:
+                self.update_session(session, order_result)
+                print("update_session이 종료되었습니다.")
+            except Exception as e:
+                # 주문은 이미 체결되었으므로 결과는 그대로 반환
+                self.logger.error(f"세션 {session.get('id')} 갱신 실패: {e}", {"order_result": order_result})
+        return order_result, time.perf_counter() - started
+
 
     # def check_trading_session(self):
     #     """
@@ -386,52 +562,51 @@ class TradingUpper():
 
 
     def add_new_trading_session(self):
-        with DatabaseManager() as db:
-            # 현재 거래 세션의 수를 확인
-            sessions = db.load_trading_session_upper()
-            counted_slot = SLOT_UPPER - len(sessions)
-            print({'session': len(sessions), 'slot': counted_slot})
-
-            # 추가된 세션
-            session_stocks = []
-            exclude_tickers = [s['ticker'] for s in sessions]
-
-            for slot in range(counted_slot, 0, -1):
-                calculated_fund = self.calculate_funds(slot)
-
-                # 기존 세션 ID 조회
-                current_sessions = db.load_trading_session_upper()
-                exclude_num = [session.get('id') for session in current_sessions]
-
-                random_id = self.generate_random_id(exclude=exclude_num)
-                today = datetime.now()
-                count = 0
-                fund = calculated_fund
-                spent_fund = 0
-                quantity = 0
-                avr_price = 0
-                high_price = 0
-
-                stock = self.allocate_stock(exclude_tickers)
-                if stock is None:
-                    self.logger.warning("add_new_trading_session: 매수 가능한 신규 종목을 찾지 못했습니다.")
-                    continue
-                
-                # 방금 할당된 종목을 다음 할당에서 제외하기 위해 추가
-                exclude_tickers.append(stock['ticker'])
+        # 현재 거래 세션의 수를 확인
+        sessions = self.session_store.all()
+        counted_slot = SLOT_UPPER - len(sessions)
+        print({'session': len(sessions), 'slot': counted_slot})
+
+        # 추가된 세션
+        session_stocks = []
+        exclude_tickers = [s['ticker'] for s in sessions]
+
+        for slot in range(counted_slot, 0, -1):
+            calculated_fund = self.calculate_funds(slot)
+
+            # 기존 세션 ID 조회
+            current_sessions = self.session_store.all()
+            exclude_num = [session.get('id') for session in current_sessions]
+
+            random_id = self.generate_random_id(exclude=exclude_num)
+            today = datetime.now()
+            count = 0
+            fund = calculated_fund
+            spent_fund = 0
+            quantity = 0
+            avr_price = 0
+            high_price = 0
+
+            stock = self.allocate_stock(exclude_tickers)
+            if stock is None:
+                self.logger.warning("add_new_trading_session: 매수 가능한 신규 종목을 찾지 못했습니다.")
+                continue
+            
+            # 방금 할당된 종목을 다음 할당에서 제외하기 위해 추가
+            exclude_tickers.append(stock['ticker'])
 
-                result = self.kis_api.get_stock_price(stock['ticker'])
-                time.sleep(1)
-                if result.get('output').get('trht_yn') != 'N':
-                    print(f"{stock['name']} - 매수가 불가능하여 다시 받아옵니다.")
-                    continue
+            result = self.kis_api.get_stock_price(stock['ticker'])
+            time.sleep(1)
+            if result.get('output').get('trht_yn') != 'N':
+                print(f"{stock['name']} - 매수가 불가능하여 다시 받아옵니다.")
+                continue
 
-                trade_condition = stock.get('trade_condition')
-                db.save_trading_session_upper(random_id, today, today, stock['ticker'], stock['name'], high_price, fund, spent_fund, quantity, avr_price, count, trade_condition)
-                session_stocks.append(stock["name"])
-                
-            self.logger.info(f"세션에 종목 추가: {session_stocks}")
-            return {'session': session_stocks, 'slot': counted_slot}
+            trade_condition = stock.get('trade_condition')
+            self.session_store.save(random_id, today, today, stock['ticker'], stock['name'], high_price, fund, spent_fund, quantity, avr_price, count, trade_condition)
+            session_stocks.append(stock["name"])
+            
+        self.logger.info(f"세션에 종목 추가: {session_stocks}")
+        return {'session': session_stocks, 'slot': counted_slot}
 
 
     def place_order_session_upper(self, session: Dict) -> Optional[Dict]:
@@ -455,11 +630,12 @@ class TradingUpper():
         # DB 연결
         with DatabaseManager() as db:
             try:
-                time.sleep(0.9)  # API 호출 속도 제한
+                # 여러 슬롯이 동시에 호출하므로 스레드별 KISApi 사용 (초당 호출 한도는 공유 토큰 버킷이 적용)
+                kis_api = self.order_manager.api()
 
                 # 1. 예외 처리
                 ## 현재가 조회 (None, None 반환 가능)
-                price, trht_yn = self.kis_api.get_current_price(session.get('ticker'))
+                price, trht_yn = kis_api.get_current_price(session.get('ticker'))
                 ###    -- api/kis_api.py: 실패 시 (None, None) 반환
                 if price is None:
                     print(f"현재가 조회 실패로 건너뛰기: {session.get('ticker')}")
@@ -473,7 +649,7 @@ class TradingUpper():
                     return None
 
                 ## 과열 종목 여부 확인: 업데이트 해야함 -> 정지일 경우 삭제하고 다시 종목 추가
-                stock_info = self.kis_api.get_stock_price(session.get('ticker'))
+                stock_info = kis_api.get_stock_price(session.get('ticker'))
                 if stock_info.get('output', {}).get('short_over_yn') == 'Y':
                     print(f"과열 종목으로 건너뛰기: {session.get('ticker')}")
                     db.close()  # DB 세션 정리
@@ -557,9 +733,8 @@ class TradingUpper():
 
 
     def load_and_update_trading_session(self, order_lists):
-        db = DatabaseManager()
         try:
-            sessions = db.load_trading_session_upper()
+            sessions = self.session_store.all()
             if not sessions:
                 print("load_and_update_trading_session - 진행 중인 거래 세션이 없습니다.")
                 return
@@ -571,200 +746,67 @@ class TradingUpper():
                 else:
                     print(f"ticker {session.get('ticker')}에 대한 주문 결과가 없습니다.")
 
-            db.close()
         except Exception as e:
             print("Error in update_trading_session: ", e)
-            db.close()
 
 
     def update_session(self, session, order_result, increment_count=True):
+        """
+        매수 주문 결과를 세션에 반영
+
+        - 체결통보로 체결이 확인되면 바로 확정 반영
+        - 아니면 주문 관리자가 추적한 체결로 잠정 반영하고, 잔고 기준 확정은 대조 큐(session_reconciler)가 백그라운드에서 처리
+        잔고 조회 재시도 동안 세션 락/DB 연결을 잡지 않으므로 다른 세션 갱신을 막지 않습니다.
+        """
         # count 증가 여부를 제어하는 매개변수 추가
 
         print("\n[DEBUG] ====== update_session 진입 ======")
         print(f"[DEBUG] 세션ID: {session.get('id')}, 주문 결과(order_result): {order_result}, count 증가: {increment_count}")
         print(f"[DEBUG] 세션: {session}")
         
-        MAX_RETRY = 15  # 체결 지연 대응을 위한 재시도 횟수 대폭 증가
-        RETRY_DELAY = 30  # 대기 시간도 2초로 증가 (총 최대 30초 이상 대기)
         try:
-            with self.session_lock:
-                with DatabaseManager() as db:
-                    # 최신 세션 정보 다시 조회하여 count 동기화
-                    db_session = db.get_session_by_id(session.get('id'))
-                    if db_session:
-                        # DB에서 최신 count 값을 가져옴
-                        current_count = int(db_session.get('count', 0))
-                    else:
-                        current_count = int(session.get('count', 0))
-                    
-                    # count 증가 여부에 따라 처리
-                    count = current_count + 1 if increment_count else current_count
-
-                    # 주문 결과 유효성 검사
-                    if not order_result:
-                        error_msg = f"유효하지 않은 주문 결과: {order_result}"
-                        print(error_msg)
-                        self.slack_logger.send_log(
-                            level="ERROR",
-                            message="세션 업데이트 실패",
-                            context={
-                                "세션ID": session.get('id'),
-                                "종목코드": session.get('ticker'),
-                                "에러": error_msg
-                            }
-                        )
-                        return
-                    
-                    # 주문 실패 체크
-                    if order_result.get('rt_cd') != '0':
-                        error_msg = f"주문 실패: {order_result.get('msg1', '알 수 없는 주문 오류')}"
-                        print(error_msg)
-                        self.slack_logger.send_log(
-                            level="ERROR",
-                            message="주문 실패",
-                            context={
-                                "세션ID": session.get('id'),
-                                "종목코드": session.get('ticker'),
-                                "에러": error_msg
-                            }
-                        )
-                        return
-
-                    total_spent_fund = int(session.get('spent_fund', 0))
-                    total_quantity = int(session.get('quantity', 0))
-                    current_date = datetime.now()
-
-                    # 잔고 조회 재시도
-                    balance_data = None
-                    for retry in range(1, MAX_RETRY+1):
-                        try:
-                            balance_result = self.kis_api.balance_inquiry()
-                            if not balance_result:
-                                print(f"잔고 조회 실패: 응답 없음 (재시도 {retry}/{MAX_RETRY})")
-                                if retry < MAX_RETRY:
-                                    time.sleep(RETRY_DELAY)
-                                    continue
-                                else:
-                                    break
-                            balance_data = next(
-                                (item for item in balance_result if item.get('pdno') == session.get('ticker')),
-                                None
-                            )
-                            if not balance_data:
-                                print(f"종목 잔고 정보 없음: {session.get('ticker')} (재시도 {retry}/{MAX_RETRY})")
-                                if retry < MAX_RETRY:
-                                    time.sleep(RETRY_DELAY)
-                                    continue
-                                else:
-                                    break
-                            break  # 성공 시 루프 탈출
-                        except Exception as e:
-                            print(f"잔고 조회 중 오류: {e} (재시도 {retry}/{MAX_RETRY})")
-                            if retry < MAX_RETRY:
-                                time.sleep(RETRY_DELAY)
-                                continue
-                            else:
-                                break
-                            
-                    # balance_data 조회 성공
-                    if balance_data:
-                        # 잔고 정보에서 실제 값 가져오기
-                        actual_quantity = int(balance_data.get('hldg_qty', 0))
-                        actual_spent_fund = int(float(balance_data.get('pchs_amt', 0)))
-                        actual_avg_price = int(float(balance_data.get('pchs_avg_pric', 0)))
-                        
-                        # 세션 횟수 업데이트
-                        count = int(session.get('count', 0)) + 1
-                        
-                        # DB 업데이트
-                        db.save_trading_session_upper(
-                            session.get('id'),
-                            session.get('start_date'),
-                            current_date,
-                            session.get('ticker'),
-                            session.get('name'),
-                            session.get('high_price', 0),
-                            session.get('fund'),
-                            actual_spent_fund,
-                            actual_quantity,
-                            actual_avg_price,
-                            count,
-                            session.get('is_strong_momentum', False)
-                        )
+            # 주문 결과 유효성 검사
+            if not order_result:
+                error_msg = f"유효하지 않은 주문 결과: {order_result}"
+                print(error_msg)
+                self.slack_logger.send_log(
+                    level="ERROR",
+                    message="세션 업데이트 실패",
+                    context={
+                        "세션ID": session.get('id'),
+                        "종목코드": session.get('ticker'),
+                        "에러": error_msg
+                    }
+                )
+                return
+            
+            # 주문 실패 체크
+            if order_result.get('rt_cd') != '0':
+                error_msg = f"주문 실패: {order_result.get('msg1', '알 수 없는 주문 오류')}"
+                print(error_msg)
+                self.slack_logger.send_log(
+                    level="ERROR",
+                    message="주문 실패",
+                    context={
+                        "세션ID": session.get('id'),
+                        "종목코드": session.get('ticker'),
+                        "에러": error_msg
+                    }
+                )
+                return
 
-                        # === trade_history 저장 ===
-                        try:
-                            trade_date = current_date.date()
-                            trade_time = current_date.time()
-                            db.save_trade_history(
-                                trade_date,
-                                trade_time,
-                                session.get('ticker'),
-                                session.get('name'),
-                                actual_avg_price,  # buy_avg_price
-                                0,                 # sell_price (미체결)
-                                actual_quantity,
-                                0,                 # profit_amount
-                                0.0,               # profit_rate
-                                actual_quantity    # remaining_assets
-                            )
-                        except Exception as e:
-                            self.logger.error("trade_history 저장 실패", {"세션ID": session.get('id'), "error": str(e)})
+            # 체결통보로 체결이 확인되면 잔고 조회 없이 세션 값 확정
+            fill_position = self._position_from_fills(session, order_result)
+            if fill_position is not None:
+                self._apply_session_positions([(session, fill_position, increment_count, True)])
+                return
 
-                        print(f"[DEBUG] 세션 업데이트 완료: 세션ID={session.get('id')}, 보유수량={actual_quantity}, 사용금액={actual_spent_fund}, 평균가={actual_avg_price}, 거래횟수={count}")
-                        
-                        # 모니터링 시작
-                        if actual_quantity > 0:
-                            try:
-                                loop = getattr(self, "_monitor_loop", None)
-                                if loop and not loop.is_closed():
-                                    # 딕셔너리를 튜플로 변환 (main.py와 동일한 형식)
-                                    sessions_info = self.get_session_info_upper(session.get('ticker'))
-                                    asyncio.run_coroutine_threadsafe(
-                                        self.monitor_for_selling_upper(sessions_info),
-                                        loop
-                                    )
-                                    print(f"[DEBUG] 모니터링 시작: 세션ID={session.get('id')}, 종목코드={session.get('ticker')}")
-                                else:
-                                    self.logger.warning("모니터링 루프를 찾을 수 없습니다.")
-                            except RuntimeError:
-                                # 테스트 환경에서는 이벤트 루프가 없을 수 있으므로 무시
-                                print(f"[DEBUG] 이벤트 루프가 없어 모니터링 시작 안 함: 세션ID={session.get('id')}, 종목코드={session.get('ticker')}")
-
-                    elif not balance_data:
-                        print("잔고 정보 조회 실패 (최대 재시도 후에도 실패), 세션 미업데이트")
-                        self.slack_logger.send_log(
-                            level="ERROR",
-                            message="잔고 정보 조회 실패, 세션 미업데이트",
-                            context={
-                                "세션ID": session.get('id'),
-                                "종목코드": session.get('ticker'),
-                                "종목명": session.get('name'),
-                                "투자금액": session.get('fund'),
-                                "사용금액": total_spent_fund,
-                                "평균단가": None,
-                                "보유수량": total_quantity,
-                                "거래횟수": None
-                            }
-                        )
-    
-                        # 모니터링 시작
-                        if total_quantity > 0:
-                            try:
-                                loop = getattr(self, "_monitor_loop", None)
-                                if loop and not loop.is_closed():
-                                    # 딕셔너리를 튜플로 변환 (main.py와 동일한 형식)
-                                    sessions_info = self.get_session_info_upper(session.get('ticker'))
-                                    asyncio.run_coroutine_threadsafe(
-                                        self.monitor_for_selling_upper(sessions_info),
-                                        loop
-                                    )
-                                    print(f"[DEBUG] 모니터링 시작: 세션ID={session.get('id')}, 종목코드={session.get('ticker')}")
-                                else:
-                                    self.logger.warning("모니터링 루프를 찾을 수 없습니다.")
-                            except RuntimeError:
-                                # 테스트 환경에서는 이벤트 루프가 없을 수 있으므로 무시
-                                print(f"[DEBUG] 이벤트 루프가 없어 모니터링 시작 안 함: 세션ID={session.get('id')}, 종목코드={session.get('ticker')}")
+            # 주문 관리자가 추적한 체결로 잠정 반영 후, 잔고 대조는 큐에 맡기고 바로 반환
+            provisional = self._provisional_position(session, order_result)
+            if provisional is not None:
+                self._apply_session_positions([(session, provisional, increment_count, True)])
+            job = self.session_reconciler.submit(session, order_result, provisional, increment_count)
+            print(f"[DEBUG] 잔고 대조 예약: {job}")
 
         except Exception as e:
             error_msg = f"세션 업데이트 중 심각한 오류: {str(e)}"
@@ -779,6 +821,137 @@ class TradingUpper():
                 }
             )
 
+    def _provisional_position(self, session: Dict, order_result: Dict) -> Optional[tuple]:
+        """주문 관리자가 추적한 체결(REST 조회 포함)로 잠정 (보유수량, 매입금액, 평균단가) 계산. 체결이 없으면 None"""
+        order_no = (order_result or {}).get('output', {}).get('ODNO')
+        order = self.order_manager.get(order_no) if order_no else None
+        if order is None or order.filled_qty <= 0:
+            return None
+        quantity = int(session.get('quantity', 0) or 0) + order.filled_qty
+        spent_fund = int(session.get('spent_fund', 0) or 0) + order.filled_amount
+        return quantity, spent_fund, int(spent_fund / quantity)
+
+    def _apply_session_positions(self, updates: List[tuple]):
+        """
+        세션 보유 정보 일괄 반영 (세션은 메모리 저장소에 즉시, 매수 이력은 DB 연결 1회)
+
+        넘겨받은 세션은 주문 시점 스냅샷일 수 있으므로 저장소의 현재 세션에 보유 필드만 갱신하고,
+        그 사이 삭제된(매도 완료 등) 세션은 되살리지 않고 건너뜁니다.
+
+        Args:
+            updates: [(세션, (보유수량, 매입금액, 평균단가), count 증가 여부, 매수 이력 저장/모니터링 시작 여부)]
+        """
+        current_date = datetime.now()
+        to_record = []
+        with self.session_lock:
+            for session, (actual_quantity, actual_spent_fund, actual_avg_price), increment_count, record in updates:
+                current = self.session_store.get(session.get('id'))
+                if current is None:
+                    self.logger.warning("삭제된 세션은 보유 정보 반영 생략", {"세션ID": session.get('id'), "종목코드": session.get('ticker')})
+                    continue
+
+                # 세션 횟수 업데이트
+                count = int(current.get('count', 0) or 0) + (1 if increment_count else 0)
+
+                # 세션 저장소 업데이트 (DB 반영은 저장소가 지연 처리)
+                self.session_store.update(
+                    session.get('id'),
+                    current_date=current_date,
+                    spent_fund=actual_spent_fund,
+                    quantity=actual_quantity,
+                    avr_price=actual_avg_price,
+                    count=count,
+                )
+                print(f"[DEBUG] 세션 업데이트 완료: 세션ID={session.get('id')}, 보유수량={actual_quantity}, 사용금액={actual_spent_fund}, 평균가={actual_avg_price}, 거래횟수={count}")
+                if record:
+                    to_record.append((session, actual_quantity, actual_avg_price))
+
+        # === trade_history 저장 ===
+        if to_record:
+            try:
+                with DatabaseManager() as db:
+                    for session, actual_quantity, actual_avg_price in to_record:
+                        db.save_trade_history(
+                            current_date.date(),
+                            current_date.time(),
+                            session.get('ticker'),
+                            session.get('name'),
+                            actual_avg_price,  # buy_avg_price
+                            0,                 # sell_price (미체결)
+                            actual_quantity,
+                            0,                 # profit_amount
+                            0.0,               # profit_rate
+                            actual_quantity    # remaining_assets
+                        )
+            except Exception as e:
+                self.logger.error("trade_history 저장 실패", {"세션ID": [session.get('id') for session, _, _ in to_record], "error": str(e)})
+
+        # 모니터링 시작
+        for session, actual_quantity, _ in to_record:
+            if actual_quantity > 0:
+                self._start_session_monitoring(session)
+
+    def _start_session_monitoring(self, session: Dict):
+        """매수된 세션의 매도 모니터링을 모니터링 루프에 등록"""
+        try:
+            loop = getattr(self, "_monitor_loop", None)
+            if loop and not loop.is_closed():
+                # 딕셔너리를 튜플로 변환 (main.py와 동일한 형식)
+                sessions_info = self.get_session_info_upper(session.get('ticker'))
+                asyncio.run_coroutine_threadsafe(
+                    self.monitor_for_selling_upper(sessions_info),
+                    loop
+                )
+                print(f"[DEBUG] 모니터링 시작: 세션ID={session.get('id')}, 종목코드={session.get('ticker')}")
+            else:
+                self.logger.warning("모니터링 루프를 찾을 수 없습니다.")
+        except RuntimeError:
+            # 테스트 환경에서는 이벤트 루프가 없을 수 있으므로 무시
+            print(f"[DEBUG] 이벤트 루프가 없어 모니터링 시작 안 함: 세션ID={session.get('id')}, 종목코드={session.get('ticker')}")
+
+    def _apply_reconciled(self, resolved: List[tuple]):
+        """잔고 대조 결과 일괄 반영 (대조 큐 스레드에서 호출)"""
+        updates = []
+        for job, balance_data in resolved:
+            # 잔고 정보에서 실제 값 가져오기
+            position = (
+                int(balance_data.get('hldg_qty', 0)),
+                int(float(balance_data.get('pchs_amt', 0))),
+                int(float(balance_data.get('pchs_avg_pric', 0))),
+            )
+            if job.provisional is not None:
+                if position == tuple(job.provisional):
+                    continue
+                # 잠정 반영값 보정 (count/매수 이력은 잠정 반영 때 처리됨)
+                self.logger.info("잔고 대조로 세션 보정", {"세션ID": job.session.get('id'), "잠정": job.provisional, "잔고": position})
+            # 잠정 반영 때 이미 count를 올렸으면 다시 올리지 않음
+            updates.append((job.session, position, job.increment_count and job.provisional is None, job.provisional is None))
+        if updates:
+            self._apply_session_positions(updates)
+
+    def _on_reconcile_give_up(self, job):
+        """잔고 대조 최대 재시도 후에도 잔고에 종목이 없을 때"""
+        session = job.session
+        print("잔고 정보 조회 실패 (최대 재시도 후에도 실패), 세션 미업데이트")
+        self.slack_logger.send_log(
+            level="ERROR",
+            message="잔고 정보 조회 실패, 세션 미업데이트" if job.provisional is None else "잔고 정보 조회 실패, 잠정 반영값 유지",
+            context={
+                "세션ID": session.get('id'),
+                "종목코드": session.get('ticker'),
+                "종목명": session.get('name'),
+                "투자금액": session.get('fund'),
+                "사용금액": session.get('spent_fund', 0),
+                "평균단가": None,
+                "보유수량": session.get('quantity', 0),
+                "잠정": job.provisional,
+                "거래횟수": None
+            }
+        )
+        # 잠정 반영이 없었으면 기존 보유분 모니터링 시작
+        if job.provisional is None and int(session.get('quantity', 0) or 0) > 0:
+            self._start_session_monitoring(session)
+
     def generate_random_id(self, min_value=1000, max_value=9999, exclude=None):
         """
         아이디값 랜덤 생성
@@ -829,8 +1002,7 @@ class TradingUpper():
             print('calculate_funds - 가용 가능 현금: ', balance)
 
             rest_fund = 0
-            with DatabaseManager() as db:
-                sessions = db.load_trading_session_upper()
+            sessions = self.session_store.all()
             
             for session in sessions:
                 fund = session.get('fund', 0)
@@ -887,11 +1059,12 @@ class TradingUpper():
 ################################    거래량   ##########################################
 ######################################################################################
 
-    def get_volume_check(self, ticker):
-        volumes = self.kis_api.get_stock_volume(ticker)
+    def get_volume_check(self, ticker, kis_api: Optional[KISApi] = None):
+        kis_api = kis_api or self.kis_api
+        volumes = kis_api.get_stock_volume(ticker)
 
         # 거래량 비교
-        diff_1_2, diff_2_3 = self.kis_api.compare_volumes(volumes)
+        diff_1_2, diff_2_3 = kis_api.compare_volumes(volumes)
         
         if diff_1_2 > -90:
             return True
@@ -900,16 +1073,11 @@ class TradingUpper():
         
         
         
-    def check_listing_date(self, ticker):
-        result = self.kis_api.get_basic_stock_info(ticker)
-        
-        scts_date = result.get('output').get('scts_mket_lstg_dt')
-        kosdaq_date = result.get('output').get('kosdaq_mket_lstg_dt')
-        
-        # 유효한 날짜 선택 (빈 문자열이 아닌 것)
-        listing_date = scts_date if scts_date and scts_date.strip() else kosdaq_date
-        
-        if listing_date and listing_date.strip():  # 유효한 날짜 문자열인지 확인
+    def check_listing_date(self, ticker, kis_api: Optional[KISApi] = None):
+        return self._listing_date_passed(self.stock_master.listing_date(ticker, kis_api or self.kis_api))
+
+    def _listing_date_passed(self, listing_date: str) -> bool:
+        if listing_date:  # 유효한 날짜 문자열인지 확인
             listing_date_dt = datetime.strptime(listing_date, '%Y%m%d')
             threshold_date = datetime.now() - timedelta(days=300)
             return listing_date_dt < threshold_date
@@ -919,6 +1087,34 @@ class TradingUpper():
 ################################    매수/매도   ##########################################
 ######################################################################################
     
+    def _wait_for_fill(self, order_result: Dict, quantity: int, timeout: float) -> Optional[int]:
+        """
+        실시간 체결통보로 주문 체결을 기다립니다.
+
+        Returns:
+            int: 미체결 수량 (체결통보 기준)
+            None: 체결통보 스트림이 없어 timeout만큼 대기함 (REST 체결 조회 필요)
+        """
+        order_no = (order_result or {}).get('output', {}).get('ODNO')
+        summary = execution_hub.wait_for_fill(order_no, quantity, timeout) if order_no else None
+        if summary is None:
+            time.sleep(timeout)
+            return None
+        if summary.rejected:
+            self.logger.warning("체결통보: 주문 거부", {"주문번호": order_no})
+            return 0
+        return max(0, (summary.order_qty or quantity) - summary.filled_qty)
+
+    def _position_from_fills(self, session: Dict, order_result: Dict) -> Optional[tuple]:
+        """체결통보 누적 체결로 (보유수량, 매입금액, 평균단가)를 계산. 체결 정보가 없으면 None"""
+        order_no = (order_result or {}).get('output', {}).get('ODNO')
+        summary = execution_hub.get_fills(order_no) if order_no else None
+        if not summary or summary.filled_qty <= 0:
+            return None
+        quantity = int(session.get('quantity', 0) or 0) + summary.filled_qty
+        spent_fund = int(session.get('spent_fund', 0) or 0) + summary.filled_amount
+        return quantity, spent_fund, int(spent_fund / quantity)
+
     def order_complete_check(self, order_result: Dict) -> int:
         """주문 체결 여부를 확인하고 미체결 수량을 반환합니다."""
         try:
@@ -938,7 +1134,10 @@ class TradingUpper():
 
     def buy_order(self, name: str, ticker: str, quantity: int, price: Optional[int] = None) -> Optional[Dict]:
         """
-        주식 매수 주문을 실행하고, 미체결 주문이 있으면 취소 후 재주문.
+        주식 매수 주문을 실행하고, 미체결 주문이 있으면 정정 재주문.
+
+        주문 관리자(trading.order_manager)가 체결통보 이벤트 또는 점증 간격 REST 조회로 체결을 추적하므로,
+        락을 잡지 않고 BUY_WAIT 안에서 체결되는 즉시 다음 단계로 넘어갑니다 (여러 종목 동시 주문 가능).
 
         Args:
             ticker: 종목 코드
@@ -946,127 +1145,64 @@ class TradingUpper():
             price: 지정가 (None이면 시장가)
 
         Returns:
-            List[Dict]: 모든 주문 결과 리스트
+            Dict: 마지막 주문(정정 포함) 결과
         """
         # except possibly unbound 방지용 order_result 변수 선언언
         order_result = None
+        order = None
         
         try:
-            with self.api_lock:
-                while True:
-                    # 주문 실행
-                    order_result = self.kis_api.place_order(ticker, quantity, order_type='buy', price=price)
-                    print("주문 결과:", order_result)
-                    # 로그 기록: 주문 응답 결과
-                    self.logger.debug(f"KIS API 매수 주문 응답", {
-                        "name": name,
-                        "ticker": ticker,
-                        "rt_cd": order_result.get('rt_cd'),
-                        "msg": order_result.get('msg1')
-                    })
-                    
-                    # 응답 결과에 따른 처리
-                    ## 초당 거래 건수 초과 시 재시도
-                    if order_result['msg1'] == '초당 거래건수를 초과하였습니다.':
-                        self.logger.warning("초당 거래건수 초과로 재시도", {"name": name,"ticker": ticker})
-                        time.sleep(1)
-                        continue
-                    
-                    ## 주문 실패 시 반환
-                    if order_result.get('rt_cd') == '1':
-                        self.logger.error(f"매수 주문 실패", order_result)
-                        self.logger.warning("매매불가 종목으로 세션 생성 후 재시도", {"name": name,"ticker": ticker})
-                        return order_result
-                    
-                    # 주문번호가 존재하면 매수 루프 종료
-                    if order_result.get('output', {}).get('ODNO') is not None:
-                        break
-            
-            time.sleep(BUY_WAIT)
-            
-            # 주문 완료 체크
-            unfilled_qty = self.order_complete_check(order_result)
-            self.logger.info(f"매수 주문 미체결 수량 확인", {"name": name,"ticker": ticker, "unfilled": unfilled_qty})
-
-            ## 매수 성공. 매수 로직 종료
-            if unfilled_qty == 0:
-                self.logger.info(f"매수 주문 전체 체결 완료", {"name": name,"ticker": ticker})
+            # 주문 실행
+            order = self.order_manager.submit(ticker, quantity, side='buy', price=price, name=name)
+            order_result = order.result
+            print("주문 결과:", order_result)
+            # 로그 기록: 주문 응답 결과
+            self.logger.debug(f"KIS API 매수 주문 응답", {
+                "name": name,
+                "ticker": ticker,
+                "rt_cd": (order_result or {}).get('rt_cd'),
+                "msg": (order_result or {}).get('msg1')
+            })
+
+            ## 주문 실패 시 반환
+            if order.state in (REJECTED, FAILED):
+                self.logger.error(f"매수 주문 실패", order_result)
+                self.logger.warning("매매불가 종목으로 세션 생성 후 재시도", {"name": name,"ticker": ticker})
                 return order_result
+            
+            # 체결 대기 (체결통보 수신 시 즉시 반환, 없으면 REST 조회)
+            self.order_manager.wait(order, BUY_WAIT)
+            self.logger.info(f"매수 주문 미체결 수량 확인", {"name": name,"ticker": ticker, "unfilled": order.unfilled})
+
+            ## 미체결 시 현재가 + 두 틱 위 가격으로 주문 정정 (원주문번호 기준)
+            while order.unfilled > 0 and order.state != REJECTED:
+                if order.revisions >= MAX_BUY_REVISIONS:
+                    error_msg = f"미체결 주문 반복 실패: {name}({ticker}), {order.revisions}회 재시도"
+                    self.logger.error(error_msg, {"unfilled": order.unfilled})
+                    raise Exception(error_msg)  # 명시적으로 예외 발생
 
-            # 최초 주문번호(원주문번호)를 별도로 저장
-            original_order_no = order_result.get('output', {}).get('ODNO')
-
-            TRY_COUNT = 0
-            ## 미체결 시 주문 수정
-            while unfilled_qty > 0:
                 self.logger.info(
                     "매수 미체결 주문 처리 시작",
-                    {"name": name, "ticker": ticker, "unfilled": unfilled_qty}
+                    {"name": name, "ticker": ticker, "unfilled": order.unfilled}
                 )
-
-                # 현재가 + 두 틱 위 가격으로 재주문 가격 산정
-                new_price, _ = self.kis_api.get_current_price(ticker)
+                new_price, _ = self.order_manager.api().get_current_price(ticker)
                 tick_size = self._get_tick_size(new_price)
                 revised_price = new_price + (tick_size * 2)
 
-                # (1) 주문 수정 실행 – 반드시 '원주문번호' 사용
-                revised_result = self.kis_api.revise_order(
-                    original_order_no,   # 원주문번호 고정
-                    unfilled_qty,
-                    revised_price
-                )
-                self.logger.info("revised_result", revised_result)
-
-                # (2) 수정 주문 체결 상태 확인
-                if revised_result.get('rt_cd') == '0' and 'output1' in revised_result and revised_result['output1']:
-                    # 원주문과 수정주문의 체결 내역을 모두 확인
-                    original_order = self.kis_api.daily_order_execution_inquiry(original_order_no)
-                    revised_order = self.kis_api.daily_order_execution_inquiry(revised_result['output']['ODNO'])
-                    
-                    # 체결 수량 합산
-                    total_filled = 0
-                    
-                    # 원주문 체결 수량
-                    if original_order.get('output1') and len(original_order['output1']) > 0:
-                        total_filled += int(original_order['output1'][0].get('tot_ccld_qty', 0))
-                    
-                    # 수정주문 체결 수량
-                    if revised_order.get('output1') and len(revised_order['output1']) > 0:
-                        total_filled += int(revised_order['output1'][0].get('tot_ccld_qty', 0))
-                    
-                    unfilled_qty = max(0, quantity - total_filled)
-                    
-                    self.logger.info(
-                        "수정주문 체결 현황",
-                        {
-                            "original_order_no": original_order_no,
-                            "revised_order_no": revised_result['output'].get('ODNO'),
-                            "total_filled": total_filled,
-                            "unfilled": unfilled_qty,
-                            "original_filled": original_order['output1'][0].get('tot_ccld_qty') if original_order.get('output1') else 0,
-                            "revised_filled": revised_order['output1'][0].get('tot_ccld_qty') if revised_order.get('output1') else 0
-                        }
-                    )
-                else:
-                    # 주문 수정 실패 시 로깅 후 미체결 수량 0으로 처리
-                    self.logger.warning(
-                        "주문 수정 실패",
-                        {"rt_cd": revised_result.get('rt_cd'),
-                         "msg1": revised_result.get('msg1', ''),
-                         "unfilled": 0}
-                    )
-                    unfilled_qty = 0  # 더 이상 재시도하지 않도록 0으로 설정
-
-                # 다음 루프와 최종 반환을 위해 최신 주문 결과 저장
-                order_result = revised_result
+                if not self.order_manager.revise(order, revised_price):
+                    # 주문 수정 실패 시 더 이상 재시도하지 않음
+                    break
+                self.logger.info("revised_result", order.result)
 
-                TRY_COUNT += 1
-                time.sleep(BUY_WAIT)
+                self.order_manager.wait(order, BUY_WAIT)
+                self.logger.info(
+                    "수정주문 체결 현황",
+                    {"original_order_no": order.order_no, "revised_order_no": order.order_nos[-1],
+                     "total_filled": order.filled_qty, "unfilled": order.unfilled, "state": STATE_NAMES[order.state]}
+                )
 
-                if TRY_COUNT > 5:
-                    error_msg = f"미체결 주문 반복 실패: {name}({ticker}), {TRY_COUNT}회 재시도"
-                    self.logger.error(error_msg, {"unfilled": unfilled_qty})
-                    raise Exception(error_msg)  # 명시적으로 예외 발생
+            # 다음 단계와 최종 반환을 위해 최신 주문 결과 사용
+            order_result = order.result
 
             # 최종 주문 결과
             ## 앱 로그
@@ -1103,9 +1239,38 @@ class TradingUpper():
                 context={"종목이름": name, "종목코드": ticker, "에러": str(e)}
             )
             return order_result
+        finally:
+            if order is not None:
+                self.order_manager.finish(order)
 
 
-    def sell_order(self, session_id: int, ticker: str, price: Optional[int] = None) -> Optional[Dict]:            
+    def _balance_holding(self, ticker: str) -> tuple:
+        """잔고 조회로 종목 보유수량과 잔고 항목 확인 (호출 측이 api_lock 보유, 잔고에 없으면 (0, {}))"""
+        balance_data = {}
+        for stock in self.kis_api.balance_inquiry() or []:
+            if stock.get('pdno') == ticker:
+                balance_data = stock
+        try:
+            hold_qty = int(balance_data.get('hldg_qty', 0))
+        except (ValueError, TypeError):
+            hold_qty = 0
+        return hold_qty, balance_data
+
+    def _delete_empty_session(self, session_id: int, ticker: str, balance_data: Dict) -> Dict:
+        """잔고가 없는 세션 삭제 후 sell_completed 상태 반환"""
+        self.delete_finished_session(session_id)
+
+        # 로그 기록: 잔고 없음으로 세션 삭제
+        self.logger.info("잔고 없음 - 세션 삭제 완료", {
+            "세션ID": session_id,
+            "종목이름": balance_data.get('prdt_name'),
+            "종목코드": ticker
+        })
+
+        # sell_condition에서 모니터링을 중단할 수 있도록 성공 상태(dict) 반환
+        return {"rt_cd": "0", "msg1": "잔고 없음 세션 삭제"}
+
+    def sell_order(self, session_id: int, ticker: str, price: Optional[int] = None, trace: Optional[Trace] = None) -> Optional[Dict]:            
             """
             주식 매도 주문을 실행하고, 미체결 주문이 있으면 주문 수정을 통해 체결 시도.
 
@@ -1113,46 +1278,34 @@ class TradingUpper():
                 session_id (int): 세션 ID
                 ticker (str): 종목 코드
                 price (Optional[int], optional): 매도 호가. 미입력 시 시장가
+                trace (Optional[Trace]): 웹소켓 매도 신호의 틱→주문 지연 추적 (주문 단계 시각 기록)
 
             Returns:
                 Optional[Dict]: 주문 결과 딕셔너리 또는 실패 시 None
             """
             order_result = None  # 예외 발생 시에도 참조 가능하도록 사전 초기화
+            if trace is not None:
+                trace.mark("order_start")
             try:
 
-                # 매도 주문 전 잔고 확인
-                balance_result = None
-                with self.api_lock:
-                    # balance_result: List
-                    balance_result = self.kis_api.balance_inquiry()
-                
-                # 보유 종목 확인
-                balance_data = {}
-                for stock in balance_result:
-                    if stock.get('pdno') == ticker:
-                        balance_data = stock
-
-                # 보유 수량 안전하게 추출
-                hold_qty = 0
-                if balance_data and isinstance(balance_data, dict):
-                    try:
-                        hold_qty = int(balance_data.get('hldg_qty', 0))
-                    except (ValueError, TypeError):
-                        hold_qty = 0
+                # 매도 수량은 세션 저장소의 보유수량 사용 (체결통보/잔고 대조로 갱신됨)
+                session_info = self.session_store.get(session_id)
+                balance_data = {"prdt_name": (session_info or {}).get('name')}
+                try:
+                    hold_qty = int((session_info or {}).get('quantity') or 0)
+                except (ValueError, TypeError):
+                    hold_qty = 0
+
+                # 세션에 보유수량이 없을 때만 매도 주문 전 잔고 확인
+                balance_checked = False
+                if hold_qty <= 0:
+                    with self.api_lock:
+                        hold_qty, balance_data = self._balance_holding(ticker)
+                    balance_checked = True
                 
                 # 잔고가 없으면 세션 삭제하고 sell_completed 상태로 반환
                 if hold_qty <= 0:
-                    self.delete_finished_session(session_id)
-
-                    # 로그 기록: 잔고 없음으로 세션 삭제               
-                    self.logger.info("잔고 없음 - 세션 삭제 완료", {
-                        "세션ID": session_id,
-                        "종목이름": balance_data.get('prdt_name'),
-                        "종목코드": ticker
-                    })
-
-                    # sell_condition에서 모니터링을 중단할 수 있도록 성공 상태(dict) 반환
-                    return {"rt_cd": "0", "msg1": "잔고 없음 세션 삭제"}
+                    return self._delete_empty_session(session_id, ticker, balance_data)
                 
                 # 실제 보유 수량 확인
                 quantity = hold_qty
@@ -1166,6 +1319,8 @@ class TradingUpper():
                 with self.api_lock:
                     while True:
                         # 주문 실행
+                        if trace is not None:
+                            trace.mark("order_sent")
                         order_result = self.kis_api.place_order(ticker, quantity, order_type='sell', price=price)
                         
                         # 로그 기록: 주문 응답 결과
@@ -1183,84 +1338,128 @@ class TradingUpper():
                             time.sleep(1)
                             continue
                         
-                        ## 주문 실패 시 반환
+                        ## 세션 저장소 수량이 실제 잔고보다 많아 거부되면 잔고로 한 번 재확인 후 재주문
+                        if (order_result.get('rt_cd') == '1' and not balance_checked
+                                and INSUFFICIENT_QTY_MESSAGE in (order_result.get('msg1') or '')):
+                            balance_checked = True
+                            hold_qty, balance_data = self._balance_holding(ticker)
+                            self.logger.warning("매도 수량 부족 - 잔고 기준으로 세션 동기화", {
+                                "세션ID": session_id,
+                                "ticker": ticker,
+                                "세션수량": quantity,
+                                "잔고수량": hold_qty
+                            })
+                            if hold_qty <= 0:
+                                return self._delete_empty_session(session_id, ticker, balance_data)
+                            self.session_store.update(session_id, quantity=hold_qty)
+                            quantity = hold_qty
+                            continue
+
+                        ## 주문 실패 시 루프 종료 (락을 놓은 뒤 알림 후 반환)
                         if order_result.get('rt_cd') == '1':
                             self.logger.error(f"매도 주문 실패", order_result)
-                            self.slack_logger.send_log(
-                                level="ERROR",
-                                message="매도 주문 실패",
-                                context={
-                                    "세션ID": session_id,
-                                    "종목코드": ticker,
-                                    "주문번호": order_result.get('output', {}).get('ODNO'),
-                                    "메시지": order_result.get('msg1')
-                                }
-                            )
-                            return None
+                            break
                         
                         # 주문번호가 존재하면 매도 루프 종료
                         if order_result.get('output', {}).get('ODNO') is not None:
+                            if trace is not None:
+                                trace.mark("order_acked")
                             break
-                
-                        # 주문 완료 후 대기
-                        time.sleep(SELL_WAIT)
 
-                        # 주문 완료 체크
-                        unfilled_qty = self.order_complete_check(order_result)
-                        self.logger.info(f"매도 주문 미체결 수량 확인", {"세션ID": session_id, "ticker": ticker, "unfilled": unfilled_qty})
+                # 슬랙 전송은 네트워크 호출이므로 api_lock을 놓은 뒤 실행
+                if order_result.get('rt_cd') == '1':
+                    self.slack_logger.send_log(
+                        level="ERROR",
+                        message="매도 주문 실패",
+                        context={
+                            "세션ID": session_id,
+                            "종목코드": ticker,
+                            "주문번호": order_result.get('output', {}).get('ODNO'),
+                            "메시지": order_result.get('msg1'),
+                            "지연": trace.breakdown() if trace is not None else None
+                        }
+                    )
+                    return None
+                if trace is not None:
+                    self.slack_logger.send_log(
+                        level="INFO",
+                        message="매도 주문 접수",
+                        context={
+                            "세션ID": session_id,
+                            "종목코드": ticker,
+                            "주문번호": order_result['output']['ODNO'],
+                            "주문가": price,
+                            "지연": trace.breakdown()
+                        }
+                    )
+
+                # 주문 완료 후 대기 (체결통보 수신 시 즉시 반환)
+                unfilled_qty = self._wait_for_fill(order_result, quantity, SELL_WAIT)
 
-                        ## 매도 성공. 매도 로직 종료
-                        if unfilled_qty == 0:
-                            self.logger.info(f"매도 주문 전체 체결 완료", {"세션ID": session_id, "ticker": ticker})
-                            # 주문이 모두 체결되었으므로 세션을 DB에서 삭제
-                            self.delete_finished_session(session_id)
-                            # 슬랙 알림 전송
-                            self.slack_logger.send_log(
-                                level="INFO",
-                                message="매도 주문 전체 체결 및 세션 삭제",
-                                context={
-                                    "세션ID": session_id,
-                                    "종목코드": ticker
-                                }
-                            )
-                            break
+                # 주문 완료 체크 (체결통보가 없으면 REST 조회)
+                if unfilled_qty is None:
+                    unfilled_qty = self.order_complete_check(order_result)
+                self.logger.info(f"매도 주문 미체결 수량 확인", {"세션ID": session_id, "ticker": ticker, "unfilled": unfilled_qty})
 
-                        # 최초 주문번호(원주문번호)를 별도로 저장
-                        original_order_no = order_result.get('output', {}).get('ODNO')
+                ## 매도 성공. 매도 로직 종료
+                if unfilled_qty == 0:
+                    self.logger.info(f"매도 주문 전체 체결 완료", {"세션ID": session_id, "ticker": ticker})
+                    # 주문이 모두 체결되었으므로 세션을 DB에서 삭제
+                    self.delete_finished_session(session_id)
+                    # 슬랙 알림 전송
+                    self.slack_logger.send_log(
+                        level="INFO",
+                        message="매도 주문 전체 체결 및 세션 삭제",
+                        context={
+                            "세션ID": session_id,
+                            "종목코드": ticker
+                        }
+                    )
 
-                        ## 미체결 시 주문 수정
-                        TRY_COUNT = 0
-                        while unfilled_qty > 0:
-                            self.logger.info(f"매도 미체결 주문 처리 시작", {"세션ID": session_id, "ticker": ticker, "unfilled": unfilled_qty})
-                            new_price, _ = self.kis_api.get_current_price(ticker)
-                            
-                            # 매도는 가격을 낮출수록 체결 확률 증가
-                            tick_size = self._get_tick_size(new_price)
-                            revised_price = new_price - (tick_size * 2)  # 두 틱 아래로 설정
-                            
-                            # 주문 수정 실행
-                            revised_result = self.kis_api.revise_order(
-                                original_order_no,
-                                unfilled_qty,
-                                revised_price
-                            )
-                            self.logger.info("revised_result", revised_result)
-                            # 수정된 주문번호로 체결 상태 확인
-                            unfilled_qty = self.order_complete_check(revised_result)
-                            self.logger.info(
-                                "after revise order_result / unfilled",
-                                {"revised_order_no": revised_result.get('output', {}).get('ODNO'),
-                                "unfilled": unfilled_qty}
-                            )
-                            # 다음 루프를 위한 최신 주문 결과 저장
-                            order_result = revised_result
-                            TRY_COUNT += 1
-                            time.sleep(SELL_WAIT)
+                # 최초 주문번호(원주문번호)를 별도로 저장
+                original_order_no = order_result.get('output', {}).get('ODNO')
 
-                            if TRY_COUNT > 5:
-                                error_msg = f"미체결 매도 주문 반복 실패: {ticker}, {TRY_COUNT}회 재시도"
-                                self.logger.error(error_msg, {"세션ID": session_id, "unfilled": unfilled_qty})
-                                raise Exception(error_msg)  # 명시적으로 예외 발생
+                ## 미체결 시 주문 수정
+                TRY_COUNT = 0
+                while unfilled_qty > 0:
+                    self.logger.info(f"매도 미체결 주문 처리 시작", {"세션ID": session_id, "ticker": ticker, "unfilled": unfilled_qty})
+                    new_price, _ = self.kis_api.get_current_price(ticker)
+                    
+                    # 매도는 가격을 낮출수록 체결 확률 증가
+                    tick_size = self._get_tick_size(new_price)
+                    revised_price = new_price - (tick_size * 2)  # 두 틱 아래로 설정
+                    
+                    # 주문 수정 실행
+                    revised_result = self.kis_api.revise_order(
+                        original_order_no,
+                        unfilled_qty,
+                        revised_price
+                    )
+                    self.logger.info("revised_result", revised_result)
+                    # 수정된 주문번호로 체결 상태 확인 (체결통보 우선)
+                    revised_order_no = revised_result.get('output', {}).get('ODNO')
+                    if revised_order_no:
+                        execution_hub.register_revision(original_order_no, revised_order_no)
+                    summary = execution_hub.wait_for_fill(original_order_no, quantity, SELL_WAIT)
+                    if summary is not None:
+                        unfilled_qty = max(0, (summary.order_qty or quantity) - summary.filled_qty)
+                    else:
+                        unfilled_qty = self.order_complete_check(revised_result)
+                    self.logger.info(
+                        "after revise order_result / unfilled",
+                        {"revised_order_no": revised_result.get('output', {}).get('ODNO'),
+                        "unfilled": unfilled_qty}
+                    )
+                    # 다음 루프를 위한 최신 주문 결과 저장
+                    order_result = revised_result
+                    TRY_COUNT += 1
+                    if summary is None:
+                        time.sleep(SELL_WAIT)
+
+                    if TRY_COUNT > 5:
+                        error_msg = f"미체결 매도 주문 반복 실패: {ticker}, {TRY_COUNT}회 재시도"
+                        self.logger.error(error_msg, {"세션ID": session_id, "unfilled": unfilled_qty})
+                        raise Exception(error_msg)  # 명시적으로 예외 발생
 
                 # === 매도 완료 후 trade_history 저장 ===
                 MAX_RETRY = 5
@@ -1303,43 +1502,36 @@ class TradingUpper():
 
                     # 최대 재시도 후에도 잔고가 남아있으면 부분 매도로 간주하고 세션 업데이트
                     try:
-                        with DatabaseManager() as db:
-                            session_info = db.get_session_by_id(session_id)
-                            if session_info:
-                                # 값 보정: 음수/이상치 방지
-                                original_qty = max(0, int(session_info.get('quantity', 0)))
-                                remaining_qty = max(0, remaining_qty)
-                                avr_price = max(0, int(float(balance_data.get('pchs_avg_pric', 0))))
-                                new_spent_fund = max(0, remaining_qty * avr_price)
-
-                                # DB와 실제 잔고 불일치 시 동기화
-                                db.save_trading_session_upper(
-                                    session_id,
-                                    session_info.get('start_date'),
-                                    datetime.now(),
-                                    session_info.get('ticker'),
-                                    session_info.get('name'),
-                                    session_info.get('high_price'),
-                                    session_info.get('fund'),
-                                    new_spent_fund,
-                                    remaining_qty,
-                                    avr_price,
-                                    session_info.get('count', 0)
-                                )
-                                self.slack_logger.send_log(
-                                    level="WARNING",
-                                    message="매도 후 세션 DB-실잔고 불일치 → 동기화",
-                                    context={
-                                        "세션ID": session_id,
-                                        "종목코드": ticker,
-                                        "DB수량": original_qty,
-                                        "실제잔고": remaining_qty,
-                                        "DB평균단가": session_info.get('avr_price', 0),
-                                        "실제평균단가": avr_price,
-                                        "DB투자금액": session_info.get('spent_fund', 0),
-                                        "실제투자금액": new_spent_fund
-                                    }
-                                )
+                        session_info = self.session_store.get(session_id)
+                        if session_info:
+                            # 값 보정: 음수/이상치 방지
+                            original_qty = max(0, int(session_info.get('quantity', 0)))
+                            remaining_qty = max(0, remaining_qty)
+                            avr_price = max(0, int(float(balance_data.get('pchs_avg_pric', 0))))
+                            new_spent_fund = max(0, remaining_qty * avr_price)
+
+                            # 세션과 실제 잔고 불일치 시 동기화
+                            self.session_store.update(
+                                session_id,
+                                current_date=datetime.now(),
+                                spent_fund=new_spent_fund,
+                                quantity=remaining_qty,
+                                avr_price=avr_price,
+                            )
+                            self.slack_logger.send_log(
+                                level="WARNING",
+                                message="매도 후 세션 DB-실잔고 불일치 → 동기화",
+                                context={
+                                    "세션ID": session_id,
+                                    "종목코드": ticker,
+                                    "DB수량": original_qty,
+                                    "실제잔고": remaining_qty,
+                                    "DB평균단가": session_info.get('avr_price', 0),
+                                    "실제평균단가": avr_price,
+                                    "DB투자금액": session_info.get('spent_fund', 0),
+                                    "실제투자금액": new_spent_fund
+                                }
+                            )
                         return order_result
                     except Exception as e:
                         print(f"[ERROR] update_session 예외: {e}")
@@ -1366,8 +1558,7 @@ class TradingUpper():
 
 
     def delete_finished_session(self, session_id):        
-        with DatabaseManager() as db:
-            db.delete_session_one_row(session_id)
+        self.session_store.delete(session_id)
         print(session_id, " 세션을 삭제했습니다.")
 
     
@@ -1379,7 +1570,7 @@ class TradingUpper():
         try:
             # KISWebSocket 인스턴스 재사용 (중복 연결 방지)
             if self.kis_websocket is None:
-                self.kis_websocket = KISWebSocket(self.sell_order)
+                self.kis_websocket = KISWebSocket(self.sell_order, session_store=self.session_store)
             complete = await self.kis_websocket.real_time_monitoring(sessions_info)
             if complete:
                 print("모니터링이 정상적으로 종료되었습니다. 종목:", sessions_info)
@@ -1397,9 +1588,7 @@ class TradingUpper():
         매도 모니터링에 필요한 세션 정보를 받아옵니다.
         ticker가 제공되면 해당 종목의 세션만, 아니면 전체 세션을 가져옵니다.
         """
-        db = DatabaseManager()
-        sessions = db.load_trading_session_upper(ticker=ticker)
-        db.close()
+        sessions = self.session_store.all(ticker=ticker)
         
         sessions_info = []
         for session in sessions:
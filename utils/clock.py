@@ -0,0 +1,68 @@
+"""
+시계 모듈
+
+실시간 모니터링 코드가 현재 시각과 장 시간 대기를 시계 객체를 통해 처리하도록 하여,
+리플레이/백테스트에서는 시뮬레이션 시계로 바꿔 끼울 수 있게 합니다.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    """실제 시스템 시계"""
+
+    def now(self):
+        return datetime.now()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+class SimulatedClock:
+    """
+    시뮬레이션 시계 (리플레이용)
+
+    시각은 set()으로만 진행되며, sleep()은 시뮬레이션 시각이 목표 시각에 도달할 때까지 대기합니다.
+    """
+
+    def __init__(self, start):
+        self._now = start
+        # (목표 시각, future) 목록
+        self._waiters = []
+
+    def now(self):
+        return self._now
+
+    def set(self, when):
+        """시뮬레이션 시각을 진행하고 목표 시각에 도달한 sleep()을 깨움"""
+        if when > self._now:
+            self._now = when
+        remaining = []
+        for deadline, future in self._waiters:
+            if deadline <= self._now:
+                if not future.done():
+                    future.set_result(None)
+            else:
+                remaining.append((deadline, future))
+        self._waiters = remaining
+
+    def release_all(self):
+        """리플레이 종료 시 대기 중인 sleep()을 모두 깨움"""
+        for _, future in self._waiters:
+            if not future.done():
+                future.set_result(None)
+        self._waiters = []
+
+    @property
+    def waiting(self):
+        return len(self._waiters)
+
+    async def sleep(self, seconds):
+        deadline = self._now + timedelta(seconds=seconds)
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((deadline, future))
+        await future
@@ -0,0 +1,50 @@
+"""
+이벤트 루프 생성 모듈
+
+EVENT_LOOP_POLICY 설정에 따라 모니터링 스레드의 이벤트 루프를 만듭니다.
+- asyncio: 표준 asyncio 루프 (기본값)
+- uvloop: uvloop 루프. 설치되어 있지 않거나 지원하지 않는 플랫폼(Windows)이면 asyncio로 대체
+"""
+
+import asyncio
+from config.condition import EVENT_LOOP_POLICY
+
+
+def new_event_loop(policy=None):
+    """
+    설정된 정책의 새 이벤트 루프를 생성합니다.
+
+    Args:
+        policy (str): asyncio 또는 uvloop. None이면 EVENT_LOOP_POLICY 설정값
+    """
+    policy = (policy or EVENT_LOOP_POLICY).lower()
+    if policy == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            print("uvloop가 설치되어 있지 않아 기본 asyncio 이벤트 루프를 사용합니다.")
+        else:
+            return uvloop.new_event_loop()
+    elif policy != "asyncio":
+        print(f"알 수 없는 EVENT_LOOP_POLICY({policy}) - 기본 asyncio 이벤트 루프를 사용합니다.")
+    return asyncio.new_event_loop()
+
+
+def loop_name(loop):
+    """로그용 이벤트 루프 구현 이름 (예: uvloop.Loop, _UnixSelectorEventLoop)"""
+    cls = type(loop)
+    return f"{cls.__module__.split('.')[0]}.{cls.__name__}"
+
+
+def run(coro, policy=None):
+    """asyncio.run과 같지만 설정된 정책의 이벤트 루프에서 실행"""
+    loop = new_event_loop(policy)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,132 @@
+"""
+틱 → 주문 지연 추적 모듈
+
+매도로 이어진 시세 프레임 하나를 수신 시점부터 주문번호(ODNO) 응답까지 단계별로 추적합니다.
+각 단계 경계에서 perf_counter_ns()로 시각을 찍고(mark), 매도가 끝나면 전역 추적기에 기록합니다.
+
+단계 (연속한 두 시각의 차이)
+- queue: 수신 → 종목 모니터가 큐에서 꺼냄
+- evaluate: 매도 조건 판단 (sell_condition)
+- handoff: 주문 실행 풀 대기 (제출 → 워커 시작)
+- pre_order: 주문 전 처리 (잔고 확인 등)
+- order_http: place_order HTTP 왕복 (주문번호 응답까지)
+- post_order: 주문 응답 후 처리 (체결 대기, 세션 정리)
+"""
+
+import threading
+from collections import deque
+from time import perf_counter_ns
+
+from utils.stats import percentile
+
+
+# (단계 이름, 시작 mark, 종료 mark)
+STAGES = (
+    ("queue", "received", "dequeued"),
+    ("evaluate", "dequeued", "evaluated"),
+    ("handoff", "evaluated", "order_start"),
+    ("pre_order", "order_start", "order_sent"),
+    ("order_http", "order_sent", "order_acked"),
+    ("post_order", "order_acked", "completed"),
+)
+
+STAGE_NAMES = {
+    "queue": "큐",
+    "evaluate": "판단",
+    "handoff": "주문풀",
+    "pre_order": "주문전",
+    "order_http": "주문HTTP",
+    "post_order": "주문후",
+}
+
+
+class Trace:
+    """매도 1건의 단계별 시각 기록"""
+
+    __slots__ = ("ticker", "session_id", "marks")
+
+    def __init__(self, ticker, session_id=None, **marks):
+        """
+        Args:
+            ticker (str): 종목코드
+            session_id: 세션 ID
+            **marks: 이미 찍어 둔 시각 (예: received=quote.received_ns)
+        """
+        self.ticker = ticker
+        self.session_id = session_id
+        self.marks = {name: ns for name, ns in marks.items() if ns}
+
+    def mark(self, name, ns=None):
+        """단계 경계 시각 기록 (같은 이름은 마지막 값으로 덮어씀)"""
+        self.marks[name] = ns or perf_counter_ns()
+
+    def spans(self):
+        """단계별 소요 시간(ms). 양 끝 시각이 모두 있는 단계만 포함"""
+        marks = self.marks
+        return {
+            stage: (marks[end] - marks[start]) / 1e6
+            for stage, start, end in STAGES
+            if start in marks and end in marks
+        }
+
+    def total_ms(self, until="order_acked"):
+        start = self.marks.get("received")
+        end = self.marks.get(until)
+        if start is None or end is None:
+            return None
+        return (end - start) / 1e6
+
+    def breakdown(self):
+        """Slack/로그용 단계별 지연 요약 문자열"""
+        parts = [f"{STAGE_NAMES[stage]} {ms:.2f}ms" for stage, ms in self.spans().items()]
+        total = self.total_ms()
+        if total is not None:
+            parts.append(f"수신→주문응답 {total:.2f}ms")
+        return " | ".join(parts)
+
+
+class LatencyTracer:
+    """완료된 Trace의 단계별 지연 분포 집계 (스레드 안전)"""
+
+    def __init__(self, max_samples=1000):
+        self._lock = threading.Lock()
+        self._samples = {stage: deque(maxlen=max_samples) for stage, _, _ in STAGES}
+        self._totals = deque(maxlen=max_samples)
+        self.recent = deque(maxlen=20)
+        self.count = 0
+
+    def record(self, trace):
+        spans = trace.spans()
+        total = trace.total_ms()
+        with self._lock:
+            for stage, ms in spans.items():
+                self._samples[stage].append(ms)
+            if total is not None:
+                self._totals.append(total)
+            self.recent.append({"ticker": trace.ticker, "session_id": trace.session_id, **spans})
+            self.count += 1
+
+    def snapshot(self):
+        """단계별 지연 분포 (ms): count/p50/p99/max"""
+        with self._lock:
+            result = {
+                stage: {
+                    "count": len(samples),
+                    "p50": round(percentile(samples, 50), 3),
+                    "p99": round(percentile(samples, 99), 3),
+                    "max": round(max(samples, default=0.0), 3),
+                }
+                for stage, samples in self._samples.items()
+            }
+            result["tick_to_ack"] = {
+                "count": len(self._totals),
+                "p50": round(percentile(self._totals, 50), 3),
+                "p99": round(percentile(self._totals, 99), 3),
+                "max": round(max(self._totals, default=0.0), 3),
+            }
+            result["recent"] = list(self.recent)
+        return result
+
+
+# 프로세스 전역 추적기 (웹소켓 모니터와 주문 코드가 공유)
+latency_tracer = LatencyTracer()
@@ -0,0 +1,200 @@
+"""
+이벤트 루프 감시 모듈
+
+모니터링 이벤트 루프에서 블로킹 호출(동기 Slack 전송, DB 조회, 대량 print 등)을 찾기 위한 감시기입니다.
+- 하트비트 코루틴: 일정 주기로 깨어나 예정 시각 대비 지연(loop lag)과 종목별 큐 적체를 샘플링
+- 감시 스레드: 하트비트가 임계값 이상 멈추면 루프 스레드의 스택과 실행 중인 태스크를 캡처
+- 수신 → 매도 판단 지연(received → evaluated)을 종목별로 기록
+- 가장 오래 멈춘 구간(stall) 상위 N건을 스택과 함께 보관하고 snapshot()으로 노출
+"""
+
+import sys
+import asyncio
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+from utils.stats import percentile
+
+
+@dataclass
+class Stall:
+    """이벤트 루프 정지 1건"""
+    duration: float
+    when: datetime
+    task: str
+    stack: str
+
+
+class LoopWatchdog:
+    """모니터링 이벤트 루프 지연/정지 감시기"""
+
+    def __init__(self, logger, interval=0.1, stall_threshold=0.5, log_interval=300, keep_slowest=10):
+        """
+        Args:
+            logger: TradingLogger
+            interval (float): 하트비트 주기(초)
+            stall_threshold (float): 정지로 판단하는 지연(초)
+            log_interval (float): 지표 요약 로그 주기(초)
+            keep_slowest (int): 보관할 최장 정지 건수
+        """
+        self.logger = logger
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.log_interval = log_interval
+        self.keep_slowest = keep_slowest
+
+        self._lags = deque(maxlen=3000)
+        # 종목코드 -> 최근 수신→판단 지연(초) 샘플
+        self._latencies = {}
+        self._queue_depth = {}
+        self._queue_depth_max = {}
+        self.stall_count = 0
+        self.slowest = []
+
+        self._loop = None
+        self._loop_thread_id = None
+        self._queue_provider = None
+        self._heartbeat_task = None
+        self._last_beat = 0.0
+        # 감시 스레드가 캡처한 진행 중 정지 정보 (task, stack)
+        self._pending_stall = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._heartbeat_task is not None and not self._heartbeat_task.done()
+
+    def start(self, queue_provider=None):
+        """
+        감시 시작. 감시할 이벤트 루프 안에서 호출해야 합니다.
+
+        Args:
+            queue_provider (callable): {종목코드: 큐 길이}를 반환하는 함수
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._queue_provider = queue_provider
+        self._last_beat = time.monotonic()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat())
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="LoopWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    def record_latency(self, ticker, seconds):
+        """종목 시세 수신부터 매도 조건 판단 완료까지 걸린 시간 기록"""
+        samples = self._latencies.get(ticker)
+        if samples is None:
+            samples = self._latencies[ticker] = deque(maxlen=1000)
+        samples.append(seconds)
+
+    # ------------------------------------------------------------------
+    # 루프 스레드
+    # ------------------------------------------------------------------
+
+    async def _heartbeat(self):
+        next_log = time.monotonic() + self.log_interval
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self._lags.append(lag)
+
+            if lag >= self.stall_threshold:
+                self._record_stall(lag)
+
+            if self._queue_provider is not None:
+                try:
+                    depths = self._queue_provider()
+                except Exception:
+                    depths = {}
+                self._queue_depth = depths
+                for ticker, depth in depths.items():
+                    if depth > self._queue_depth_max.get(ticker, 0):
+                        self._queue_depth_max[ticker] = depth
+
+            if now >= next_log:
+                next_log = now + self.log_interval
+                self.logger.info("이벤트 루프 지표", self.summary())
+
+    def _record_stall(self, duration):
+        task, stack = self._pending_stall or ("(캡처 전 종료)", "")
+        self._pending_stall = None
+        stall = Stall(duration=duration, when=datetime.now(), task=task, stack=stack)
+        self.stall_count += 1
+        self.slowest.append(stall)
+        self.slowest.sort(key=lambda s: s.duration, reverse=True)
+        del self.slowest[self.keep_slowest:]
+        self.logger.warning(
+            f"이벤트 루프 정지 {duration:.3f}초 (태스크: {task})",
+            {"stack": stack},
+        )
+
+    # ------------------------------------------------------------------
+    # 감시 스레드
+    # ------------------------------------------------------------------
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            stalled_for = time.monotonic() - self._last_beat
+            if stalled_for < self.stall_threshold + self.interval or self._pending_stall is not None:
+                continue
+            # 루프가 멈춰 있는 동안 루프 스레드에서 실행 중인 코드 캡처 (정지당 1회)
+            self._pending_stall = self._capture()
+            print(f"[LoopWatchdog] 이벤트 루프 {stalled_for:.2f}초째 응답 없음 (태스크: {self._pending_stall[0]})")
+
+    def _capture(self):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=15)) if frame is not None else ""
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        return (task.get_name() if task is not None else "(태스크 외 콜백)"), stack
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+
+    def summary(self):
+        """로그용 요약 지표"""
+        latencies = [v for samples in self._latencies.values() for v in samples]
+        return {
+            "lag_p50_ms": round(percentile(self._lags, 50) * 1000, 2),
+            "lag_p99_ms": round(percentile(self._lags, 99) * 1000, 2),
+            "lag_max_ms": round(max(self._lags, default=0.0) * 1000, 2),
+            "stalls": self.stall_count,
+            "eval_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "eval_p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "queue_depth_max": max(self._queue_depth_max.values(), default=0),
+        }
+
+    def snapshot(self):
+        """전체 지표 (종목별 큐 적체/판단 지연, 최장 정지 목록 포함)"""
+        result = self.summary()
+        result["queue_depth"] = dict(self._queue_depth)
+        result["queue_depth_max_by_ticker"] = dict(self._queue_depth_max)
+        result["eval_latency_ms"] = {
+            ticker: {
+                "p50": round(percentile(samples, 50) * 1000, 3),
+                "p99": round(percentile(samples, 99) * 1000, 3),
+            }
+            for ticker, samples in self._latencies.items()
+        }
+        result["slowest"] = [
+            {"duration": round(s.duration, 3), "when": s.when.strftime("%H:%M:%S"), "task": s.task, "stack": s.stack}
+            for s in self.slowest
+        ]
+        return result
@@ -0,0 +1,145 @@
+"""
+장 운영 시계 모듈
+
+영업일 달력(DateUtils) 기준으로 장 상태(장 시작 전/장중/만료 매도 구간/장 종료)를 하나의 서비스에서 관리합니다.
+- run(): 다음 상태 전환 시각까지 한 번만 잠들었다가 전환을 발행 (종목별 폴링 타이머 없음)
+- 모든 종목 모니터는 wait_open()으로 하나의 공유 이벤트를 기다림
+- 틱 경로에서는 is_open / in_expiry_window / today 속성만 읽음 (시계 조회 없음)
+- 리플레이처럼 시계를 직접 진행시키는 경우 refresh()로 즉시 상태 갱신
+"""
+
+import asyncio
+from datetime import datetime, time, timedelta
+
+from config.condition import KRX_TRADING_START, KRX_TRADING_END
+from utils.clock import SystemClock
+from utils.date_utils import DateUtils
+
+
+PRE_OPEN = "pre_open"
+OPEN = "open"
+EXPIRY_WINDOW = "expiry_window"
+CLOSED = "closed"
+
+PHASE_NAMES = {
+    PRE_OPEN: "장 시작 전",
+    OPEN: "장중",
+    EXPIRY_WINDOW: "보유기간 만료 매도 구간",
+    CLOSED: "장 종료/휴장",
+}
+
+# 보유기간 만료 매도 시각 (이 시각부터 장 종료까지 만료 매도 구간)
+EXPIRY_SELL_TIME = time(15, 10)
+
+# 시스템 시계 보정을 위한 최대 대기(초)
+_MAX_SLEEP = 3600
+
+
+class MarketClock:
+    """영업일 기준 장 상태 서비스 (모니터링 이벤트 루프당 1개)"""
+
+    def __init__(self, clock=None, logger=None, is_business_day=DateUtils.is_business_day,
+                 open_time=KRX_TRADING_START, close_time=KRX_TRADING_END, expiry_time=EXPIRY_SELL_TIME):
+        """
+        Args:
+            clock: SystemClock 또는 SimulatedClock
+            logger: TradingLogger
+            is_business_day: 영업일 판단 함수 (date -> bool)
+            open_time, close_time: 장 시작/종료 시각 (종료 시각 포함)
+            expiry_time: 만료 매도 구간 시작 시각
+        """
+        self.clock = clock or SystemClock()
+        self.logger = logger
+        self._is_business_day = is_business_day
+        self.open_time = open_time
+        self.close_time = close_time
+        self.expiry_time = expiry_time
+        # 영업일 판단 캐시 (key: date)
+        self._business_days = {}
+        self._open_event = asyncio.Event()
+        self._listeners = []
+        self.phase = None
+        self.today = None
+        self.is_open = False
+        self.in_expiry_window = False
+        self.refresh()
+
+    def is_business_day(self, day):
+        cached = self._business_days.get(day)
+        if cached is None:
+            cached = self._business_days[day] = self._is_business_day(day)
+        return cached
+
+    def phase_at(self, now):
+        """주어진 시각의 장 상태"""
+        if not self.is_business_day(now.date()):
+            return CLOSED
+        current = now.time()
+        if current < self.open_time:
+            return PRE_OPEN
+        if current > self.close_time:
+            return CLOSED
+        if current >= self.expiry_time:
+            return EXPIRY_WINDOW
+        return OPEN
+
+    def next_transition(self, now):
+        """now 이후 첫 상태 전환 시각 (휴장일은 건너뜀)"""
+        day = now.date()
+        for offset in range(15):
+            candidate = day + timedelta(days=offset)
+            if not self.is_business_day(candidate):
+                continue
+            for boundary in (
+                datetime.combine(candidate, self.open_time),
+                datetime.combine(candidate, self.expiry_time),
+                # 종료 시각까지 장중이므로 직후에 장 종료로 전환
+                datetime.combine(candidate, self.close_time) + timedelta(microseconds=1),
+            ):
+                if boundary > now:
+                    return boundary
+        return now + timedelta(days=1)
+
+    def subscribe(self, listener):
+        """상태 전환 알림 등록. listener(이전 상태, 새 상태)"""
+        self._listeners.append(listener)
+
+    def refresh(self):
+        """현재 시각으로 상태를 다시 계산하고, 바뀌었으면 전환 발행"""
+        now = self.clock.now()
+        phase = self.phase_at(now)
+        self.today = now.date()
+        if phase == self.phase:
+            return phase
+
+        previous, self.phase = self.phase, phase
+        self.is_open = phase in (OPEN, EXPIRY_WINDOW)
+        self.in_expiry_window = phase == EXPIRY_WINDOW
+        if self.is_open:
+            self._open_event.set()
+        else:
+            self._open_event.clear()
+
+        if previous is not None and self.logger is not None:
+            self.logger.info(
+                f"장 상태 전환: {PHASE_NAMES[previous]} → {PHASE_NAMES[phase]}",
+                {"at": now.strftime("%Y-%m-%d %H:%M:%S")},
+            )
+        for listener in list(self._listeners):
+            try:
+                listener(previous, phase)
+            except Exception as e:
+                print(f"[MarketClock] 상태 전환 알림 실패: {e}")
+        return phase
+
+    async def wait_open(self):
+        """장중(만료 매도 구간 포함)이 될 때까지 대기"""
+        await self._open_event.wait()
+
+    async def run(self):
+        """상태 전환 시각마다 깨어나 상태를 갱신하는 루프"""
+        while True:
+            self.refresh()
+            now = self.clock.now()
+            wait_seconds = (self.next_transition(now) - now).total_seconds()
+            await self.clock.sleep(min(max(wait_seconds, 0.001), _MAX_SLEEP))
@@ -0,0 +1,113 @@
+"""
+주문 실행 풀 모듈
+
+웹소켓 매도 신호로 발생하는 동기 주문 호출(sell_order)을 전용 스레드 풀에서 실행합니다.
+- 기본 실행기(run_in_executor(None, ...))와 분리된 고정 크기 풀이라 DB/Slack 등 다른 작업과 스레드를 다투지 않음
+- 키(종목코드)별 배타 실행: 같은 종목의 주문이 실행 중이면 새 요청을 받지 않음 (서로 다른 종목은 동시 실행)
+- 대기 시간(제출 → 실행 시작)과 실행 시간(실행 시작 → 종료)을 기록하고 snapshot()으로 노출
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.stats import percentile
+
+
+class OrderExecutor:
+    """키별 배타 실행을 보장하는 주문 전용 스레드 풀"""
+
+    def __init__(self, max_workers=4, logger=None):
+        """
+        Args:
+            max_workers (int): 동시에 실행할 최대 주문 수
+            logger: TradingLogger (없으면 print)
+        """
+        self.max_workers = max_workers
+        self.logger = logger
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order-exec")
+        # 실행 중(대기 포함)인 키 - 워커가 끝나야 해제되므로 타임아웃 후에도 중복 주문 방지
+        self._active = set()
+        self._queue_times = deque(maxlen=1000)
+        self._run_times = deque(maxlen=1000)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    def is_busy(self, key):
+        return key in self._active
+
+    @property
+    def in_flight(self):
+        return len(self._active)
+
+    async def submit(self, key, fn, *args, timeout=None):
+        """
+        주문 함수를 전용 풀에서 실행하고 결과를 반환합니다.
+
+        Args:
+            key: 배타 실행 단위 (종목코드)
+            fn: 실행할 동기 함수
+            timeout (float): 결과 대기 제한(초). 초과 시 asyncio.TimeoutError (주문은 워커에서 계속 진행)
+
+        Returns:
+            fn의 반환값. 같은 키가 이미 실행 중이면 None
+        """
+        if key in self._active:
+            return None
+        self._active.add(key)
+        self.submitted += 1
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        future = loop.run_in_executor(self._executor, self._timed, submitted_at, fn, args)
+        future.add_done_callback(lambda f: self._finish(key, f))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self._log_warning(f"{key} 주문 실행 대기 시간 초과 ({timeout}초) - 워커 종료 시까지 재주문 차단")
+            raise
+
+    def _timed(self, submitted_at, fn, args):
+        started = time.perf_counter()
+        self._queue_times.append(started - submitted_at)
+        try:
+            return fn(*args)
+        finally:
+            self._run_times.append(time.perf_counter() - started)
+
+    def _finish(self, key, future):
+        self._active.discard(key)
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    def _log_warning(self, message):
+        if self.logger is not None:
+            self.logger.warning(message)
+        else:
+            print(f"[OrderExecutor] {message}")
+
+    def snapshot(self):
+        """주문 실행 지표"""
+        return {
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "queue_p50_ms": round(percentile(self._queue_times, 50) * 1000, 2),
+            "queue_p99_ms": round(percentile(self._queue_times, 99) * 1000, 2),
+            "queue_max_ms": round(max(self._queue_times, default=0.0) * 1000, 2),
+            "run_p50_ms": round(percentile(self._run_times, 50) * 1000, 2),
+            "run_p99_ms": round(percentile(self._run_times, 99) * 1000, 2),
+            "run_max_ms": round(max(self._run_times, default=0.0) * 1000, 2),
+        }
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait)
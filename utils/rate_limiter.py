@@ -0,0 +1,55 @@
+"""
+REST 호출 한도 모듈
+
+KIS REST API는 앱키별 초당 호출 건수를 제한합니다(초과 시 "초당 거래건수를 초과하였습니다.").
+여러 스레드가 동시에 호출해도 한도를 넘지 않도록 앱키(실전/모의)별로 토큰 버킷 하나를 공유합니다.
+"""
+
+import threading
+import time
+
+from config.condition import KIS_RATE_LIMIT_REAL, KIS_RATE_LIMIT_MOCK
+
+
+class RateLimiter:
+    """스레드 안전 토큰 버킷"""
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate (float): 초당 허용 호출 수
+            burst (int): 한 번에 몰아서 허용할 최대 호출 수 (기본: 1)
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst or 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def acquire(self):
+        """호출 1건 허용될 때까지 대기 (대기한 시간(초) 반환)"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 토큰을 먼저 차감해 자리를 예약하고, 부족분만큼은 락 밖에서 대기
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_limiters = {
+    True: RateLimiter(KIS_RATE_LIMIT_MOCK),
+    False: RateLimiter(KIS_RATE_LIMIT_REAL),
+}
+
+
+def kis_rate_limiter(is_mock):
+    """실전/모의 앱키별 공유 호출 한도"""
+    return _limiters[bool(is_mock)]
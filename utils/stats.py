@@ -0,0 +1,22 @@
+"""
+지연 통계 공용 함수 모듈
+
+latency_tracer / loop_watchdog / order_executor / tick_replay의 지연 분포(p50/p99) 계산에 함께 사용합니다.
+"""
+
+
+def percentile(values, percent):
+    """
+    최근접 순위 방식 백분위수
+
+    Args:
+        values: 측정값 목록
+        percent (float): 백분위 (0~100)
+
+    Returns:
+        float: 백분위 값 (값이 없으면 0.0)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
@@ -0,0 +1,233 @@
+"""
+실시간 웹소켓 수신 프레임 기록 모듈
+
+수신한 원본 프레임을 수신 시각과 함께 일자별 append-only 바이너리 파일에 기록합니다.
+트레일링스탑 발동 원인 분석이나 장중 매도 규칙 백테스트(리플레이)에 사용합니다.
+
+파일 형식
+- ticks_YYYY-MM-DD.bin: FILE_MAGIC 뒤에 [수신시각 ns(int64) | 길이(uint32) | 원본 프레임(utf-8)] 반복
+- ticks_YYYY-MM-DD.idx: [종목코드(8바이트) | .bin 내 레코드 오프셋(uint64)] 반복
+
+기록은 이벤트 루프 밖의 전용 스레드에서 처리하며, fsync는 일정 주기로 모아서 수행합니다.
+이벤트 루프에서는 수신 시각을 찍고 큐에 넣는 작업만 합니다.
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+FILE_MAGIC = b"KTCK\x01"
+RECORD_HEADER = struct.Struct("<qI")   # 수신시각(ns), 프레임 길이
+INDEX_ENTRY = struct.Struct("<8sQ")    # 종목코드, 레코드 오프셋
+
+# 한 번에 모아서 쓰는 최대 프레임 수
+_BATCH_SIZE = 1000
+
+
+def _day_of(ts_ns):
+    return datetime.fromtimestamp(ts_ns / 1e9).strftime("%Y-%m-%d")
+
+
+def frame_ticker(frame):
+    """실시간 데이터 프레임("0|TR_ID|건수|종목코드^...")의 종목코드. 암호화 프레임 등은 None"""
+    if not frame.startswith("0|"):
+        return None
+    parts = frame.split("|", 3)
+    if len(parts) < 4:
+        return None
+    return parts[3].split("^", 1)[0] or None
+
+
+class TickRecorder:
+    """수신 프레임을 일자별 파일에 기록하는 백그라운드 기록기"""
+
+    def __init__(self, record_dir="ticks", fsync_interval=1.0):
+        """
+        Args:
+            record_dir (str): 기록 파일 디렉토리
+            fsync_interval (float): fsync 주기(초)
+        """
+        self.record_dir = Path(record_dir)
+        self.fsync_interval = fsync_interval
+        self._queue = queue.SimpleQueue()
+        self._day = None
+        self._data_file = None
+        self._index_file = None
+        self._offset = 0
+        self._last_fsync = 0.0
+        self._dirty = False
+        self.recorded = 0
+        self._thread = threading.Thread(target=self._run, name="TickRecorder", daemon=True)
+        self._thread.start()
+
+    def record(self, frame):
+        """
+        수신 프레임 기록 요청 (이벤트 루프에서 호출, 블로킹 없음)
+        실시간 데이터 프레임(0: 평문, 1: 암호화)만 기록하고 PINGPONG/구독 응답은 제외합니다.
+        """
+        if not frame:
+            return
+        head = frame[0]
+        if head not in ("0", "1", 48, 49):  # bytes 프레임이면 int로 비교
+            return
+        self._queue.put((time.time_ns(), frame))
+
+    def flush(self, timeout=5.0):
+        """대기 중인 프레임을 모두 기록하고 fsync될 때까지 대기"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """남은 프레임을 기록하고 기록 스레드 종료"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # 기록 스레드
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                self._sync()
+                continue
+
+            batch = [item]
+            while len(batch) < _BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for entry in batch:
+                if entry is None:
+                    stop = True
+                elif isinstance(entry, threading.Event):
+                    self._sync(force=True)
+                    entry.set()
+                else:
+                    try:
+                        self._write(*entry)
+                    except Exception as e:
+                        print(f"[TickRecorder] 기록 실패: {e}")
+
+            if stop:
+                self._sync(force=True)
+                self._close_files()
+                return
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._sync()
+
+    def _open_day(self, day):
+        self._sync(force=True)
+        self._close_files()
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        data_path = self.record_dir / f"ticks_{day}.bin"
+        is_new = not data_path.exists() or data_path.stat().st_size == 0
+        self._data_file = open(data_path, "ab")
+        self._index_file = open(self.record_dir / f"ticks_{day}.idx", "ab")
+        if is_new:
+            self._data_file.write(FILE_MAGIC)
+        self._offset = self._data_file.tell()
+        self._day = day
+
+    def _write(self, ts_ns, frame):
+        day = _day_of(ts_ns)
+        if day != self._day:
+            self._open_day(day)
+
+        if isinstance(frame, bytes):
+            payload = frame
+            frame = frame.decode("utf-8", errors="replace")
+        else:
+            payload = frame.encode("utf-8")
+
+        ticker = frame_ticker(frame)
+        if ticker:
+            self._index_file.write(INDEX_ENTRY.pack(ticker.encode("ascii", errors="ignore")[:8], self._offset))
+        self._data_file.write(RECORD_HEADER.pack(ts_ns, len(payload)))
+        self._data_file.write(payload)
+        self._offset += RECORD_HEADER.size + len(payload)
+        self._dirty = True
+        self.recorded += 1
+
+    def _sync(self, force=False):
+        if not self._dirty and not force:
+            return
+        for f in (self._data_file, self._index_file):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def _close_files(self):
+        for f in (self._data_file, self._index_file):
+            if f is not None:
+                f.close()
+        self._data_file = None
+        self._index_file = None
+        self._day = None
+
+
+######################################################################################
+##################################    읽기   ########################################
+######################################################################################
+
+def tick_files(record_dir="ticks"):
+    """기록된 일자별 데이터 파일 목록 (날짜순)"""
+    return sorted(Path(record_dir).glob("ticks_*.bin"))
+
+
+def _read_record(f):
+    header = f.read(RECORD_HEADER.size)
+    if len(header) < RECORD_HEADER.size:
+        return None
+    ts_ns, length = RECORD_HEADER.unpack(header)
+    payload = f.read(length)
+    if len(payload) < length:
+        return None  # 기록 중 종료되어 잘린 마지막 레코드
+    return ts_ns, payload.decode("utf-8")
+
+
+def read_ticks(path, tickers=None):
+    """
+    기록 파일에서 (수신시각 ns, 원본 프레임)을 기록 순서대로 읽습니다.
+
+    Args:
+        path: ticks_YYYY-MM-DD.bin 경로
+        tickers: 지정 시 인덱스 파일로 해당 종목 프레임만 읽음 (체결통보 등 종목 없는 프레임 제외)
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"틱 기록 파일 형식이 아닙니다: {path}")
+
+        if tickers is None:
+            while True:
+                record = _read_record(f)
+                if record is None:
+                    return
+                yield record
+
+        wanted = {t.encode("ascii") for t in tickers}
+        index_bytes = path.with_suffix(".idx").read_bytes()
+        usable = len(index_bytes) - len(index_bytes) % INDEX_ENTRY.size
+        for ticker, offset in INDEX_ENTRY.iter_unpack(index_bytes[:usable]):
+            if ticker.rstrip(b"\0") not in wanted:
+                continue
+            f.seek(offset)
+            record = _read_record(f)
+            if record is None:
+                return
+            yield record